@@ -9,11 +9,15 @@ from django.urls import reverse
 from django.http import HttpResponseRedirect
 from django.contrib import messages
 
-from .models import Tenant, User, UserProfile, UserActivity, TenantConfiguration, RolePermission
+from .admin_mixins import LargeTableAdminMixin
+from .models import (
+    Tenant, User, UserProfile, UserActivity, TenantConfiguration, RolePermission,
+    ScheduledJob, ActivityDailyRollup, ExportJob, TenantOffboarding, DataMigrationRun, ActivityModule
+)
 
 
 @admin.register(Tenant)
-class TenantAdmin(admin.ModelAdmin):
+class TenantAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin para gestión de tenants"""
     list_display = ['name', 'business_name', 'location_type', 'currency', 'max_users', 'is_active', 'created_at']
     list_filter = ['location_type', 'currency', 'is_active', 'created_at']
@@ -59,7 +63,7 @@ class UserProfileInline(admin.StackedInline):
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(LargeTableAdminMixin, BaseUserAdmin):
     """Admin personalizado para usuarios"""
     inlines = [UserProfileInline]
     
@@ -133,13 +137,28 @@ class UserAdmin(BaseUserAdmin):
 
 
 @admin.register(UserActivity)
-class UserActivityAdmin(admin.ModelAdmin):
+class UserActivityAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin para actividad de usuarios"""
-    list_display = ['user', 'tenant', 'action', 'module', 'description', 'created_at']
-    list_filter = ['action', 'module', 'tenant', 'created_at']
-    search_fields = ['user__username', 'user__email', 'description']
-    readonly_fields = ['user', 'tenant', 'action', 'description', 'module', 
-                      'ip_address', 'user_agent', 'created_at']
+    list_display = ['user', 'tenant', 'action', 'module_display', 'description_display', 'created_at']
+    list_filter = ['action', 'module_ref', 'tenant', 'created_at']
+    list_select_related = ['user', 'tenant', 'module_ref', 'template']
+    search_fields = ['user__username', 'user__email', 'description', 'template__value']
+    readonly_fields = ['user', 'tenant', 'action', 'description_display', 'module_display',
+                      'ip_address', 'user_agent_display', 'created_at']
+    exclude = ['description', 'module', 'user_agent', 'template', 'params', 'module_ref', 'agent']
+    date_bound_field = 'created_at'
+    
+    @admin.display(description='Módulo')
+    def module_display(self, obj):
+        return obj.module_name
+    
+    @admin.display(description='Descripción')
+    def description_display(self, obj):
+        return obj.rendered_description
+    
+    @admin.display(description='User Agent')
+    def user_agent_display(self, obj):
+        return obj.user_agent_text
     
     def get_queryset(self, request):
         """Filtrar actividad según permisos"""
@@ -164,7 +183,7 @@ class UserActivityAdmin(admin.ModelAdmin):
 
 
 @admin.register(TenantConfiguration)
-class TenantConfigurationAdmin(admin.ModelAdmin):
+class TenantConfigurationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin para configuraciones por tenant"""
     list_display = ['tenant', 'module', 'key', 'value', 'data_type', 'is_editable']
     list_filter = ['tenant', 'module', 'data_type', 'is_editable']
@@ -204,7 +223,7 @@ class TenantConfigurationAdmin(admin.ModelAdmin):
 
 
 @admin.register(RolePermission)
-class RolePermissionAdmin(admin.ModelAdmin):
+class RolePermissionAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin para permisos por rol"""
     list_display = ['tenant', 'role', 'modules_enabled', 'sensitive_actions_enabled']
     list_filter = ['tenant', 'role']
@@ -276,6 +295,184 @@ class RolePermissionAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(ScheduledJob)
+class ScheduledJobAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Admin para trabajos periódicos de mantenimiento"""
+    list_display = ['name', 'is_enabled', 'last_status', 'last_started_at', 'last_duration_ms',
+                    'run_count', 'locked_until']
+    list_filter = ['is_enabled', 'last_status']
+    list_editable = ['is_enabled']
+    readonly_fields = ['name', 'locked_by', 'locked_until', 'last_status', 'last_started_at',
+                      'last_finished_at', 'last_duration_ms', 'last_result', 'last_error', 'run_count',
+                      'state']
+    actions = ['run_now']
+    
+    def changelist_view(self, request, extra_context=None):
+        # Mostrar también los trabajos que todavía no se han ejecutado nunca
+        from .scheduler import ensure_jobs
+        ensure_jobs()
+        return super().changelist_view(request, extra_context)
+    
+    @admin.action(description='Ejecutar ahora')
+    def run_now(self, request, queryset):
+        from .scheduler import jobs, run_scheduled_job
+        names = [job.name for job in queryset if job.name in jobs]
+        for name in names:
+            run_scheduled_job.delay(name, force=True)
+        messages.success(request, f"Trabajos enviados: {', '.join(names) or 'ninguno'}")
+    
+    def has_module_permission(self, request):
+        return request.user.is_superuser or request.user.role == 'super_admin'
+    
+    def has_view_permission(self, request, obj=None):
+        return self.has_module_permission(request)
+    
+    def has_change_permission(self, request, obj=None):
+        return self.has_module_permission(request)
+    
+    def has_add_permission(self, request):
+        return False  # Se crean al registrar el trabajo
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ActivityModule)
+class ActivityModuleAdmin(admin.ModelAdmin):
+    """Admin de solo lectura de los módulos de actividad (filtro con autocompletado)"""
+    list_display = ['value']
+    search_fields = ['value']
+    
+    def has_module_permission(self, request):
+        return False  # Solo se usa desde el filtro de actividad
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ActivityDailyRollup)
+class ActivityDailyRollupAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Admin para resúmenes diarios de actividad"""
+    list_display = ['day', 'tenant', 'action', 'module', 'count', 'users_count']
+    list_filter = ['action', 'module', 'tenant', 'day']
+    list_select_related = ['tenant']
+    date_hierarchy = 'day'
+    
+    def get_queryset(self, request):
+        """Filtrar resúmenes según permisos"""
+        qs = super().get_queryset(request)
+        
+        if request.user.is_superuser or request.user.role == 'super_admin':
+            return qs
+        elif hasattr(request.user, 'tenant') and request.user.tenant:
+            return qs.filter(tenant=request.user.tenant)
+        else:
+            return qs.none()
+    
+    def has_add_permission(self, request):
+        return False  # Los genera rollup_user_activity
+    
+    def has_change_permission(self, request, obj=None):
+        return False  # Solo lectura
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Admin para trabajos de exportación"""
+    list_display = ['export_type', 'format', 'tenant', 'user', 'status', 'processed_rows', 'total_rows',
+                    'file_size', 'created_at', 'expires_at']
+    list_filter = ['export_type', 'status', 'tenant', 'created_at']
+    list_select_related = ['tenant', 'user']
+    search_fields = ['user__username', 'tenant__name']
+    date_bound_field = 'created_at'
+    readonly_fields = ['tenant', 'user', 'export_type', 'format', 'status', 'total_rows', 'processed_rows',
+                      'file', 'file_size', 'error', 'created_at', 'started_at', 'finished_at', 'expires_at']
+    
+    def get_queryset(self, request):
+        """Filtrar exportaciones según permisos"""
+        qs = super().get_queryset(request)
+        
+        if request.user.is_superuser or request.user.role == 'super_admin':
+            return qs
+        elif hasattr(request.user, 'tenant') and request.user.tenant:
+            return qs.filter(tenant=request.user.tenant)
+        else:
+            return qs.none()
+    
+    def has_add_permission(self, request):
+        return False  # Se crean desde la API
+    
+    def has_change_permission(self, request, obj=None):
+        return False  # Solo lectura
+
+
+@admin.register(TenantOffboarding)
+class TenantOffboardingAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Admin para bajas de tenants"""
+    list_display = ['tenant_name', 'status', 'step', 'deleted_rows', 'total_rows', 'archive_size',
+                    'created_at', 'finished_at']
+    list_filter = ['status', 'archive']
+    search_fields = ['tenant_name']
+    readonly_fields = ['tenant', 'tenant_ref', 'tenant_name', 'requested_by', 'status', 'archive',
+                      'archive_file', 'archive_size', 'archive_step', 'archive_after', 'archive_parts',
+                      'plan', 'step', 'total_rows', 'deleted_rows', 'tables', 'error',
+                      'created_at', 'updated_at', 'finished_at']
+    
+    def has_module_permission(self, request):
+        return request.user.is_superuser or request.user.role == 'super_admin'
+    
+    def has_view_permission(self, request, obj=None):
+        return self.has_module_permission(request)
+    
+    def has_add_permission(self, request):
+        return False  # Se crean desde la API o con offboard_tenant
+    
+    def has_change_permission(self, request, obj=None):
+        return False  # Solo lectura
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DataMigrationRun)
+class DataMigrationRunAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Admin para el progreso de las migraciones de datos por lotes"""
+    list_display = ['name', 'status', 'progress', 'rows_updated', 'batches', 'elapsed_seconds',
+                    'locked_until', 'updated_at']
+    list_filter = ['status']
+    readonly_fields = ['name', 'status', 'last_pk', 'target_pk', 'rows_updated', 'batches',
+                      'elapsed_seconds', 'error', 'locked_by', 'locked_until', 'started_at',
+                      'finished_at', 'updated_at']
+    
+    @admin.display(description='Progreso (%)')
+    def progress(self, obj):
+        return obj.progress
+    
+    def has_module_permission(self, request):
+        return request.user.is_superuser or request.user.role == 'super_admin'
+    
+    def has_view_permission(self, request, obj=None):
+        return self.has_module_permission(request)
+    
+    def has_add_permission(self, request):
+        return False  # Se crean con run_data_migration
+    
+    def has_change_permission(self, request, obj=None):
+        return False  # Solo lectura
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 # Personalización del admin site
 admin.site.site_header = "Arte Ideas - Administración"
 admin.site.site_title = "Arte Ideas Admin"
@@ -0,0 +1,177 @@
+"""
+Mixins del admin para tablas grandes - Arte Ideas
+
+LargeTableAdminMixin reúne lo necesario para que el changelist de una tabla
+con millones de filas siga respondiendo rápido:
+
+- EstimatedCountPaginator: no hace COUNT(*) exacto de toda la tabla.
+- show_full_result_count = False: sin el segundo COUNT del total sin filtrar.
+- Los filtros por FK (p. ej. 'tenant') usan AutocompleteFilter en lugar de
+  un desplegable con todas las filas relacionadas.
+- select_related automático de las FK que aparecen en list_display.
+- Con date_bound_field, el listado muestra por defecto solo los últimos
+  date_bound_days días; filtrar por esa fecha levanta el límite.
+
+    @admin.register(UserActivity)
+    class UserActivityAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+        date_bound_field = 'created_at'
+"""
+from datetime import timedelta
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import ForeignKey
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+# Filas contadas con exactitud antes de pasar a un conteo estimado
+COUNT_LIMIT = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator que cuenta como máximo COUNT_LIMIT filas. Si hay más, usa la
+    estimación del planificador (PostgreSQL) o se queda en el límite, de modo
+    que tampoco se generan páginas con OFFSET enormes.
+    """
+    count_limit = COUNT_LIMIT
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        counted = queryset.order_by().values('pk')[:self.count_limit + 1].count()
+        if counted <= self.count_limit:
+            return counted
+        if not queryset.query.where:
+            estimate = estimated_table_count(queryset.model, queryset.db)
+            if estimate is not None:
+                return max(estimate, self.count_limit)
+        return self.count_limit
+
+
+def estimated_table_count(model, using='default'):
+    """Filas estimadas de la tabla según las estadísticas de la BD (None si no hay)"""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """
+    Filtro por FK con el buscador del admin (select2) en vez de listar todas
+    las filas relacionadas. El admin del modelo relacionado necesita
+    search_fields.
+    """
+    template = 'admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.admin_site = model_admin.admin_site
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def field_choices(self, field, request, model_admin):
+        return []
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        self.base_query_string = changelist.get_query_string(remove=[self.lookup_kwarg, self.lookup_kwarg_isnull])
+        return super().choices(changelist)
+
+    def widget(self):
+        """HTML del buscador con el valor seleccionado (una query si hay valor)"""
+        remote_model = self.field.remote_field.model
+        field = forms.ModelChoiceField(
+            queryset=remote_model._default_manager.all(),
+            required=False,
+            widget=AutocompleteSelect(self.field, self.admin_site, attrs={'data-placeholder': str(self.title)}),
+        )
+        return field.widget.render(self.lookup_kwarg, self.lookup_val, attrs={'id': f'filter_{self.field_path}'})
+
+
+class AutoSelectRelatedMixin:
+    """select_related de las FK de list_display (también las que admiten null)"""
+
+    def get_list_select_related(self, request):
+        if self.list_select_related:
+            return self.list_select_related
+        names = []
+        for name in self.get_list_display(request):
+            if not isinstance(name, str):
+                continue
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if isinstance(field, ForeignKey):
+                names.append(name)
+        return names or False
+
+
+class DateBoundedChangeList(ChangeList):
+    """ChangeList que limita por defecto el listado a los últimos días"""
+    date_bounded = False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        field = self.model_admin.date_bound_field
+        if field and not any(param.split('__')[0] == field for param in self.params):
+            since = timezone.now() - timedelta(days=self.model_admin.date_bound_days)
+            if self.model._meta.get_field(field).get_internal_type() == 'DateField':
+                since = since.date()
+            queryset = queryset.filter(**{f'{field}__gte': since})
+            self.date_bounded = True
+        return queryset
+
+
+class LargeTableAdminMixin(AutoSelectRelatedMixin):
+    """Changelist sin conteos exactos, con autocompletado y límite de fechas"""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    date_bound_field = None
+    date_bound_days = 30
+
+    def autocomplete_list_filter(self, list_filter):
+        """Cambiar los filtros por FK declarados como texto por AutocompleteFilter"""
+        result = []
+        for item in list_filter:
+            if isinstance(item, str) and '__' not in item:
+                if isinstance(self.model._meta.get_field(item), ForeignKey):
+                    item = (item, AutocompleteFilter)
+            result.append(item)
+        return result
+
+    def get_list_filter(self, request):
+        return self.autocomplete_list_filter(super().get_list_filter(request))
+
+    def get_changelist(self, request, **kwargs):
+        return DateBoundedChangeList
+
+    @property
+    def media(self):
+        media = super().media
+        if any(isinstance(item, tuple) and item[1] is AutocompleteFilter
+               for item in self.autocomplete_list_filter(self.list_filter)):
+            media += AutocompleteSelect(None, self.admin_site).media
+        return media
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        changelist = getattr(response, 'context_data', {}).get('cl')
+        if getattr(changelist, 'date_bounded', False):
+            messages.info(request, (
+                f'Se muestran los últimos {self.date_bound_days} días. '
+                'Filtra por fecha para ver registros anteriores.'
+            ))
+        return response
@@ -1,4 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def create_scheduled_jobs(sender, **kwargs):
+    """Crear las filas de los trabajos periódicos registrados tras migrar"""
+    from apps.core.scheduler import ensure_jobs
+    
+    ensure_jobs()
 
 
 class CoreConfig(AppConfig):
@@ -14,4 +22,12 @@ class CoreConfig(AppConfig):
         try:
             import apps.core.signals
         except ImportError:
-            pass
\ No newline at end of file
+            pass
+        
+        # Registrar los trabajos periódicos de mantenimiento; sus filas se
+        # crean al migrar y run_job solo las crea si falta la suya
+        import apps.core.jobs
+        post_migrate.connect(create_scheduled_jobs, sender=self)
+        
+        # Registrar las migraciones de datos por lotes
+        import apps.core.backfills
@@ -0,0 +1 @@
+# Módulo API async (ASGI)
@@ -0,0 +1,27 @@
+"""
+URLs del Módulo API async - Arte Ideas
+Mismas rutas de lectura que los módulos síncronos bajo el prefijo async/
+"""
+from django.urls import path
+from .views import (
+    AsyncProfileView, AsyncProfileActivityView, AsyncProfileCompletionView,
+    AsyncBusinessConfigurationView, AsyncRolesListView, AsyncRolePermissionsView,
+    AsyncEventStreamView
+)
+
+app_name = 'async_api'
+
+urlpatterns = [
+    # Mi Perfil
+    path('profile/view/', AsyncProfileView.as_view(), name='profile_view'),                # GET - Ver perfil
+    path('profile/activity/', AsyncProfileActivityView.as_view(), name='activity'),        # GET - Actividad
+    path('profile/completion/', AsyncProfileCompletionView.as_view(), name='completion'),  # GET - Completitud
+    
+    # Configuración
+    path('config/business/view/', AsyncBusinessConfigurationView.as_view(), name='business_view'),         # GET - Ver negocio
+    path('config/roles/list/', AsyncRolesListView.as_view(), name='roles_list'),                            # GET - Lista roles
+    path('config/permissions/<str:role>/view/', AsyncRolePermissionsView.as_view(), name='permissions_view'),  # GET - Ver permisos
+    
+    # Tiempo real
+    path('events/', AsyncEventStreamView.as_view(), name='events'),     # GET - Canal SSE de actividad y notificaciones
+]
@@ -0,0 +1,174 @@
+"""
+Views async del Core App - Arte Ideas
+
+Variantes ASGI de los endpoints de lectura más usados. Devuelven lo mismo
+que las vistas DRF equivalentes, pero la autenticación, los permisos y las
+consultas se resuelven sin ocupar un hilo del worker mientras esperan a la
+base de datos. Las operaciones que solo existen en versión síncrona (cache
+compartida) se ejecutan con sync_to_async.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import exceptions, permissions, status
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from apps.core.authentication.backends import TenantJWTAuthentication
+from apps.core.cache import get_cached_role_permissions
+from apps.core.configuration.serializers import TenantSerializer
+from apps.core.events import broker, channels_for_user, event_stream
+from apps.core.fast_serializers import FastRolePermissionSerializer, FastUserActivitySerializer
+from apps.core.models import UserActivity
+from apps.core.profile.serializers import UserSerializer
+from apps.core.renderers import dumps
+from apps.core.serializers import get_sparse_params
+
+User = get_user_model()
+
+
+def json_response(data, status_code=status.HTTP_200_OK, headers=None):
+    response = HttpResponse(dumps(data), status=status_code, content_type='application/json')
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
+
+
+class AsyncAPIView(View):
+    """
+    Base de las vistas async: autentica con JWT, comprueba permisos y
+    convierte las APIException en respuestas con el mismo formato que DRF.
+    """
+    http_method_names = ['get', 'options']
+    authentication_class = TenantJWTAuthentication
+    permission_classes = [permissions.IsAuthenticated]
+
+    async def dispatch(self, request, *args, **kwargs):
+        handler = getattr(self, request.method.lower(), None)
+        if request.method.lower() not in self.http_method_names or handler is None:
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+        try:
+            await self.initial(request)
+            return await handler(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    async def initial(self, request):
+        self.authenticator = self.authentication_class()
+        if getattr(request, '_force_auth_user', None) is not None:
+            # Sub-petición de un lote (apps/core/batch.py): ya está autenticada
+            request.user, request.auth = request._force_auth_user, request._force_auth_token
+        else:
+            result = await self.authenticator.aauthenticate(request)
+            request.user, request.auth = result if result else (None, None)
+        for permission in (permission_class() for permission_class in self.permission_classes):
+            if not permission.has_permission(request, self):
+                if request.auth is None:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    def handle_exception(self, exc):
+        headers = {}
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            headers['WWW-Authenticate'] = self.authenticator.authenticate_header(self.request)
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        return json_response(data, exc.status_code, headers)
+
+
+class AsyncProfileView(AsyncAPIView):
+    """Vista async del perfil personal"""
+
+    async def get(self, request):
+        fields, exclude = get_sparse_params(request)
+        user = await sync_to_async(UserSerializer.prefetch_instance)(request.user, fields, exclude)
+        return json_response(UserSerializer(user, fields=fields, exclude=exclude).data)
+
+
+class AsyncProfileActivityView(AsyncAPIView):
+    """Vista async de la actividad reciente del usuario"""
+
+    async def get(self, request):
+        activities = UserActivity.objects.filter(user_id=request.user.pk).order_by('-created_at')[:10]
+        serializer = FastUserActivitySerializer(activities, many=True, context={'request': request})
+        # Las plantillas y módulos sin cache en el proceso se leen con el ORM síncrono
+        return json_response(await sync_to_async(lambda: serializer.data)())
+
+
+class AsyncProfileCompletionView(AsyncAPIView):
+    """Vista async del porcentaje de completitud del perfil"""
+
+    async def get(self, request):
+        user = request.user
+        fields = [
+            user.first_name, user.last_name, user.email,
+            user.phone, user.address, user.bio
+        ]
+        completed = sum(1 for field in fields if field)
+        return json_response({
+            'completion_percentage': int((completed / len(fields)) * 100),
+            'completed_fields': completed,
+            'total_fields': len(fields)
+        })
+
+
+class AsyncBusinessConfigurationView(AsyncAPIView):
+    """Vista async de la configuración del negocio"""
+
+    async def get(self, request):
+        if request.user.tenant_id is None:
+            return json_response({'error': 'Usuario no pertenece a un tenant'}, status.HTTP_400_BAD_REQUEST)
+        serializer = TenantSerializer(request.user.tenant, context={'request': request})
+        return json_response(serializer.data)
+
+
+class AsyncRolesListView(AsyncAPIView):
+    """Vista async de la lista de roles disponibles"""
+
+    async def get(self, request):
+        if request.user.tenant_id is None:
+            return json_response({'error': 'Usuario no pertenece a un tenant'}, status.HTTP_400_BAD_REQUEST)
+        if request.user.role not in ['admin', 'super_admin']:
+            return json_response({'error': 'Sin permisos para ver roles'}, status.HTTP_403_FORBIDDEN)
+        return json_response([
+            {'code': role_code, 'name': role_name}
+            for role_code, role_name in User.ROLE_CHOICES
+            if role_code != 'super_admin'
+        ])
+
+
+class AsyncRolePermissionsView(AsyncAPIView):
+    """Vista async de los permisos de un rol"""
+
+    async def get(self, request, role):
+        if request.user.tenant_id is None:
+            return json_response({'error': 'Usuario no pertenece a un tenant'}, status.HTTP_400_BAD_REQUEST)
+        if request.user.role not in ['admin', 'super_admin']:
+            return json_response({'error': 'Sin permisos para ver permisos'}, status.HTTP_403_FORBIDDEN)
+        role_permissions = await sync_to_async(get_cached_role_permissions)(request.user.tenant_id)
+        permission = role_permissions.get(role)
+        if permission is None:
+            return json_response({'error': 'Permisos no encontrados'}, status.HTTP_404_NOT_FOUND)
+        return json_response(FastRolePermissionSerializer(permission).data)
+
+
+class AsyncEventStreamView(AsyncAPIView):
+    """
+    Canal SSE de actividad y notificaciones del usuario (y de todo el tenant
+    para administradores). EventSource no permite cabeceras, así que el
+    token también se acepta como ?token=.
+    """
+    batchable = False
+
+    async def initial(self, request):
+        token = request.GET.get('token')
+        if token and jwt_settings.AUTH_HEADER_NAME not in request.META:
+            request.META[jwt_settings.AUTH_HEADER_NAME] = f'{jwt_settings.AUTH_HEADER_TYPES[0]} {token}'
+        await super().initial(request)
+
+    async def get(self, request):
+        last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        subscription = broker.subscribe(channels_for_user(request.user), last_event_id)
+        response = StreamingHttpResponse(event_stream(subscription), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -0,0 +1,58 @@
+"""
+Backends de autenticación del Módulo de Autenticación - Arte Ideas
+"""
+from asgiref.sync import sync_to_async
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.core.cache import get_cached_tenant
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+    """
+    Autenticación JWT que adjunta el tenant del usuario desde la cache,
+    evitando la query perezosa de request.user.tenant en cada petición
+    """
+    
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if user.tenant_id is not None:
+            tenant = get_cached_tenant(user.tenant_id)
+            if tenant is not None:
+                user.tenant = tenant
+        return user
+    
+    async def aauthenticate(self, request):
+        """Versión async de authenticate() para vistas ASGI"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+    
+    async def aget_user(self, validated_token):
+        """Mismas comprobaciones que get_user() usando el ORM async"""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        
+        if user.tenant_id is not None:
+            # La cache es síncrona (Redis/LocMem): se consulta en un hilo
+            tenant = await sync_to_async(get_cached_tenant)(user.tenant_id)
+            if tenant is not None:
+                user.tenant = tenant
+        return user
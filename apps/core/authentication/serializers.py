@@ -1,8 +1,15 @@
 """
 Serializers del Módulo de Autenticación - Arte Ideas
 """
+from django.contrib.auth import get_user_model
+from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
 from rest_framework import serializers
 
+User = get_user_model()
+
 
 class LogoutSerializer(serializers.Serializer):
     """Serializer para logout"""
@@ -12,4 +19,25 @@ class LogoutSerializer(serializers.Serializer):
         """Validar que el refresh token sea válido"""
         if not value:
             raise serializers.ValidationError('El refresh token es requerido.')
-        return value
\ No newline at end of file
+        return value
+
+
+class SetPasswordSerializer(serializers.Serializer):
+    """Serializer para elegir la contraseña con una invitación (uid + token)"""
+    uid = serializers.CharField()
+    token = serializers.CharField()
+    new_password = serializers.CharField()
+    confirm_password = serializers.CharField()
+    
+    def validate(self, attrs):
+        try:
+            user = User.objects.get(pk=force_str(urlsafe_base64_decode(attrs['uid'])))
+        except (TypeError, ValueError, OverflowError, User.DoesNotExist):
+            user = None
+        if user is None or not default_token_generator.check_token(user, attrs['token']):
+            raise serializers.ValidationError("La invitación no es válida o ya se usó.")
+        if attrs['new_password'] != attrs['confirm_password']:
+            raise serializers.ValidationError("Las contraseñas no coinciden.")
+        validate_password(attrs['new_password'], user)
+        attrs['user'] = user
+        return attrs
@@ -3,7 +3,7 @@ URLs del Módulo de Autenticación - Arte Ideas
 """
 from django.urls import path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from .views import LogoutView
+from .views import LogoutView, SetPasswordView
 
 app_name = 'authentication'
 
@@ -14,4 +14,7 @@ urlpatterns = [
     
     # Logout
     path('logout/', LogoutView.as_view(), name='logout'),
+    
+    # Contraseña inicial con la invitación del alta por lotes
+    path('set-password/', SetPasswordView.as_view(), name='set_password'),
 ]
\ No newline at end of file
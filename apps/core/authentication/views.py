@@ -7,9 +7,9 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
 from django.contrib.auth import get_user_model
-from apps.core.models import UserActivity
+from apps.core.tasks import log_activity
 
-from .serializers import LogoutSerializer
+from .serializers import LogoutSerializer, SetPasswordSerializer
 
 User = get_user_model()
 
@@ -32,13 +32,7 @@ class LogoutView(APIView):
                 token.blacklist()
                 
                 # Registrar actividad de logout
-                UserActivity.objects.create(
-                    user=request.user,
-                    tenant=request.user.tenant,
-                    action='logout',
-                    description='Cerró sesión en el sistema',
-                    module='auth'
-                )
+                log_activity(request.user, 'logout', 'Cerró sesión en el sistema', 'auth')
                 
                 return Response({
                     'message': 'Sesión cerrada exitosamente'
@@ -52,4 +46,17 @@ class LogoutView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-
+class SetPasswordView(APIView):
+    """Vista para elegir la contraseña con la invitación del alta por lotes"""
+    permission_classes = [permissions.AllowAny]
+    
+    def post(self, request):
+        """Fijar la contraseña; el token deja de valer al cambiarla"""
+        serializer = SetPasswordSerializer(data=request.data)
+        if serializer.is_valid():
+            user = serializer.validated_data['user']
+            user.set_password(serializer.validated_data['new_password'])
+            user.save(update_fields=['password'])
+            log_activity(user, 'update', 'Eligió su contraseña con una invitación', 'security')
+            return Response({'message': 'Contraseña establecida correctamente'})
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
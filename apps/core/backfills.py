@@ -0,0 +1,99 @@
+"""
+Migraciones de datos por lotes del Core App - Arte Ideas
+
+Se ejecutan con manage.py run_data_migration (ver apps/core/data_migrations.py).
+"""
+import re
+from string import Formatter
+
+from django.db.models import Case, Value, When
+
+from .data_migrations import data_migration
+from .models import ActivityModule, ActivityTemplate, UserAgent
+
+# Módulo que registra hoy log_activity para las acciones que no dependen de la vista
+ACTION_MODULES = {
+    'login': 'auth',
+    'logout': 'auth',
+    'export': 'exports',
+}
+
+# Descripciones que log_activity guardaba ya formateadas; las más genéricas al final
+LEGACY_TEMPLATES = [
+    'Cambió su email de {old_email} a {email}',
+    'Exportó {name} (CSV)',
+    'Solicitó exportación {export_type} (Excel)',
+    'Creó el usuario {username}',
+    'Actualizó el usuario {username}',
+    'Eliminó el usuario {username}',
+    '{verb} el usuario {username}',
+    'Actualizó permisos del rol {role}',
+    'Restableció permisos por defecto del rol {role}',
+    'Dio de alta {created} tenants por lote',
+    'Importó un snapshot de configuración en {tenant}',
+]
+
+
+def _template_pattern(template):
+    pattern = ''.join(
+        re.escape(literal) + (f'(?P<{field}>.*?)' if field else '')
+        for literal, field, _, _ in Formatter().parse(template)
+    )
+    return re.compile(pattern + r'\Z', re.S)
+
+
+LEGACY_PATTERNS = [(template, _template_pattern(template)) for template in LEGACY_TEMPLATES]
+
+
+def parse_description(text):
+    """(plantilla, parámetros) de una descripción formateada; sin plantilla conocida, (texto, None)"""
+    for template, pattern in LEGACY_PATTERNS:
+        match = pattern.match(text)
+        if match:
+            return template, match.groupdict()
+    return text, None
+
+
+@data_migration('core.UserActivity')
+def activity_module(queryset):
+    """Completar el módulo de la actividad antigua registrada sin él"""
+    modules = ActivityModule.intern_many(ACTION_MODULES.values())
+    return queryset.filter(module='', module_ref__isnull=True, action__in=ACTION_MODULES).update(
+        module_ref_id=Case(*[
+            When(action=action, then=Value(modules[module])) for action, module in ACTION_MODULES.items()
+        ])
+    )
+
+
+@data_migration('core.UserActivity')
+def activity_dimensions(queryset):
+    """Pasar descripción, módulo y user agent de las filas antiguas a plantillas y tablas de dimensión"""
+    rows = list(queryset.exclude(description='', module='', user_agent='').values_list(
+        'pk', 'description', 'module', 'user_agent', 'template_id', 'params', 'module_ref_id', 'agent_id'
+    ))
+    if not rows:
+        return 0
+    parsed = {row[1]: parse_description(row[1]) for row in rows}
+    templates = ActivityTemplate.intern_many(template for template, _ in parsed.values())
+    modules = ActivityModule.intern_many(row[2] for row in rows)
+    agents = UserAgent.intern_many(row[3] for row in rows)
+
+    activities = []
+    for pk, description, module, user_agent, template_id, params, module_ref_id, agent_id in rows:
+        if description:
+            template, params = parsed[description]
+            template_id = templates[template]
+        activities.append(queryset.model(
+            pk=pk,
+            template_id=template_id,
+            params=params,
+            module_ref_id=modules.get(module, module_ref_id),
+            agent_id=agents.get(user_agent, agent_id),
+            description='',
+            module='',
+            user_agent='',
+        ))
+    queryset.model._base_manager.bulk_update(activities, [
+        'template_id', 'params', 'module_ref_id', 'agent_id', 'description', 'module', 'user_agent',
+    ])
+    return len(activities)
@@ -0,0 +1,246 @@
+"""
+Tareas en segundo plano del Core App - Arte Ideas
+
+Un único decorador para declarar tareas:
+
+    @task(queue='activity', max_retries=3)
+    def record_activity(user_id, ...):
+        ...
+
+    record_activity.delay(user.id, ...)
+
+El backend se elige en settings.CORE_TASKS['BACKEND']:
+
+- 'celery': se registra como tarea de Celery (producción, con CELERY_BROKER_URL).
+- 'local':  pool de hilos por cola dentro del proceso (desarrollo).
+- 'eager':  se ejecuta en el momento, en el mismo hilo (tests).
+
+Con 'celery' y 'local' el envío espera a que la transacción actual se
+confirme, para que la tarea vea los datos que la originaron. Los resultados
+se guardan en la cache (o en django-celery-results con Celery) y se consultan
+con TaskResult.get().
+"""
+import functools
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BACKEND': None,          # None: 'celery' si hay CELERY_BROKER_URL, si no 'local'
+    'QUEUES': {'default': 4},  # Concurrencia por cola del backend local
+    'RESULT_CACHE': 'default',
+    'RESULT_TTL': 3600,
+}
+
+PENDING = 'PENDING'
+STARTED = 'STARTED'
+RETRY = 'RETRY'
+SUCCESS = 'SUCCESS'
+FAILURE = 'FAILURE'
+
+registry = {}
+
+
+def get_task_settings():
+    config = {**DEFAULTS, **getattr(settings, 'CORE_TASKS', {})}
+    if config['BACKEND'] is None:
+        config['BACKEND'] = 'celery' if getattr(settings, 'CELERY_BROKER_URL', None) else 'local'
+    return config
+
+
+class TaskError(Exception):
+    """La tarea terminó con error"""
+
+
+class TaskResult:
+    """Referencia al resultado de una tarea enviada"""
+
+    def __init__(self, task_id, async_result=None):
+        self.id = task_id
+        self._async_result = async_result
+
+    def _stored(self):
+        config = get_task_settings()
+        return caches[config['RESULT_CACHE']].get(f'tasks:result:{self.id}')
+
+    @property
+    def status(self):
+        if self._async_result is not None:
+            return self._async_result.status
+        stored = self._stored()
+        return stored['status'] if stored else PENDING
+
+    def get(self, timeout=None, interval=0.05):
+        """Esperar el resultado; lanza TaskError si la tarea falló"""
+        if self._async_result is not None:
+            return self._async_result.get(timeout=timeout)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            stored = self._stored()
+            if stored and stored['status'] == SUCCESS:
+                return stored['result']
+            if stored and stored['status'] == FAILURE:
+                raise TaskError(stored['error'])
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f'La tarea {self.id} no terminó en {timeout}s')
+            time.sleep(interval)
+
+
+class LocalBroker:
+    """Un ThreadPoolExecutor por cola, con la concurrencia configurada"""
+
+    def __init__(self):
+        self._executors = {}
+        self._lock = threading.Lock()
+
+    def executor(self, queue):
+        with self._lock:
+            if queue not in self._executors:
+                workers = get_task_settings()['QUEUES'].get(queue, 1)
+                self._executors[queue] = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix=f'core-task-{queue}'
+                )
+            return self._executors[queue]
+
+    def submit(self, task, task_id, args, kwargs, countdown=0):
+        return self.executor(task.queue).submit(self._run, task, task_id, args, kwargs, countdown)
+
+    def _run(self, task, task_id, args, kwargs, countdown):
+        if countdown:
+            time.sleep(countdown)
+        close_old_connections()
+        try:
+            return task.run_with_retries(task_id, args, kwargs)
+        finally:
+            close_old_connections()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=wait)
+
+
+local_broker = LocalBroker()
+
+
+class Task:
+    """Función registrada como tarea"""
+
+    def __init__(self, func, name, queue, max_retries, retry_backoff, retry_on, store_result):
+        self.func = func
+        self.name = name
+        self.queue = queue
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_on = retry_on
+        self.store_result = store_result
+        self._celery_task = None
+        functools.update_wrapper(self, func)
+
+    def __call__(self, *args, **kwargs):
+        """Llamada directa: se ejecuta en línea, sin cola"""
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        return self.apply_async(args, kwargs)
+
+    def apply_async(self, args=(), kwargs=None, countdown=0):
+        kwargs = kwargs or {}
+        backend = get_task_settings()['BACKEND']
+        task_id = str(uuid.uuid4())
+
+        if backend == 'eager':
+            self.run_with_retries(task_id, args, kwargs, sleep=False)
+            return TaskResult(task_id)
+
+        if backend == 'celery':
+            celery_task = self.celery_task
+            result = TaskResult(task_id)
+
+            def send():
+                result._async_result = celery_task.apply_async(
+                    args=args, kwargs=kwargs, countdown=countdown, task_id=task_id, queue=self.queue
+                )
+            transaction.on_commit(send)
+            return result
+
+        self._store(task_id, PENDING)
+        transaction.on_commit(lambda: local_broker.submit(self, task_id, args, kwargs, countdown))
+        return TaskResult(task_id)
+
+    def run_with_retries(self, task_id, args, kwargs, sleep=True):
+        """Ejecutar reintentando con espera exponencial; guarda el resultado"""
+        attempt = 0
+        while True:
+            self._store(task_id, STARTED, attempts=attempt + 1)
+            try:
+                result = self.func(*args, **kwargs)
+            except self.retry_on as exc:
+                if attempt >= self.max_retries:
+                    logger.exception('Tarea %s (%s) falló tras %s intentos', self.name, task_id, attempt + 1)
+                    self._store(task_id, FAILURE, error=repr(exc), attempts=attempt + 1)
+                    return None
+                self._store(task_id, RETRY, error=repr(exc), attempts=attempt + 1)
+                if sleep:
+                    time.sleep(self.retry_backoff * (2 ** attempt))
+                attempt += 1
+                continue
+            self._store(task_id, SUCCESS, result=result, attempts=attempt + 1)
+            return result
+
+    def _store(self, task_id, status, result=None, error=None, attempts=0):
+        if not self.store_result:
+            return
+        config = get_task_settings()
+        caches[config['RESULT_CACHE']].set(f'tasks:result:{task_id}', {
+            'task': self.name,
+            'status': status,
+            'result': result,
+            'error': error,
+            'attempts': attempts,
+        }, config['RESULT_TTL'])
+
+    @property
+    def celery_task(self):
+        """Tarea Celery equivalente (se crea al primer uso)"""
+        if self._celery_task is None:
+            from config.celery import app
+
+            self._celery_task = app.task(
+                name=self.name,
+                queue=self.queue,
+                autoretry_for=self.retry_on,
+                max_retries=self.max_retries,
+                retry_backoff=self.retry_backoff,
+                ignore_result=not self.store_result,
+            )(self.func)
+        return self._celery_task
+
+
+def task(func=None, *, name=None, queue='default', max_retries=0, retry_backoff=1,
+         retry_on=(Exception,), store_result=True):
+    """Declarar una tarea en segundo plano"""
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        registered = Task(func, task_name, queue, max_retries, retry_backoff, tuple(retry_on), store_result)
+        registry[task_name] = registered
+        return registered
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def register_celery_tasks():
+    """Registrar todas las tareas en Celery (lo llama config.celery al arrancar el worker)"""
+    for registered in registry.values():
+        registered.celery_task
@@ -0,0 +1,151 @@
+"""
+Peticiones en lote del Core App - Arte Ideas
+
+Pantallas como Mi Perfil piden varios endpoints de lectura al cargar
+(profile/view/, profile/statistics/, profile/completion/, profile/activity/)
+y cada petición vuelve a validar el JWT y a resolver usuario y tenant.
+POST /api/core/batch/ las recibe juntas y devuelve una sola respuesta:
+
+    {"requests": [
+        {"id": "perfil", "path": "profile/view/"},
+        {"id": "actividad", "path": "profile/activity/", "params": {"fields": "action,description"}}
+    ]}
+    -> {"responses": [{"id": "perfil", "path": "profile/view/", "status": 200, "body": {...}}, ...]}
+
+- Solo GET a rutas del Core (relativas a /api/core/), como mucho MAX_REQUESTS.
+- El lote se autentica una vez; cada sub-petición recibe el mismo usuario,
+  con su tenant ya resuelto, como autenticación forzada (sin releer el token).
+- Si la ruta tiene variante async (async/<ruta>) se usa esa, y las vistas
+  async se ejecutan a la vez en el event loop. Las síncronas se ejecutan una
+  tras otra en el hilo de la conexión a la BD (thread_sensitive), que es lo
+  seguro con el ORM síncrono.
+- Cada elemento lleva su propio status; un fallo no afecta a los demás. Las
+  vistas con batchable = False (SSE, el propio lote) y las respuestas que no
+  son JSON se rechazan por elemento.
+"""
+import asyncio
+import logging
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve, reverse
+from rest_framework import status
+
+from .renderers import loads
+
+logger = logging.getLogger(__name__)
+
+MAX_REQUESTS = 20
+
+# Cabeceras del lote que no se copian a las sub-peticiones
+SKIPPED_META = ('CONTENT_LENGTH', 'CONTENT_TYPE', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+
+
+class BatchError(ValueError):
+    """Lote mal formado (se responde 400)"""
+
+
+def core_prefix():
+    return reverse('core:batch')[:-len('batch/')]
+
+
+def parse_batch(data):
+    """(id, ruta, query) de cada petición de un cuerpo {'requests': [...]}"""
+    items = data.get('requests') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        raise BatchError('Se espera {"requests": [...]} con al menos una petición')
+    if len(items) > MAX_REQUESTS:
+        raise BatchError(f'Como máximo {MAX_REQUESTS} peticiones por lote')
+
+    parsed = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            item = {'path': item}
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            raise BatchError(f'Petición {index}: falta path')
+        if str(item.get('method', 'GET')).upper() != 'GET':
+            raise BatchError(f'Petición {index}: solo se admite GET')
+        url = urlsplit(item['path'])
+        query = QueryDict(url.query, mutable=True)
+        for name, value in (item.get('params') or {}).items():
+            query.setlist(name, [str(v) for v in value] if isinstance(value, list) else [str(value)])
+        parsed.append((item.get('id', index), url.path, query))
+    return parsed
+
+
+def resolve_path(path):
+    """(ruta completa, ResolverMatch) prefiriendo la variante async; (None, None) si no existe"""
+    prefix = core_prefix()
+    relative = path[len(prefix):] if path.startswith(prefix) else path.lstrip('/')
+    for candidate in (f'{prefix}async/{relative}', f'{prefix}{relative}'):
+        try:
+            return candidate, resolve(candidate)
+        except Resolver404:
+            continue
+    return None, None
+
+
+def build_request(request, path, query, match):
+    """Sub-petición GET que comparte el usuario ya autenticado del lote"""
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {name: value for name, value in request.META.items() if name not in SKIPPED_META}
+    sub.META.update(REQUEST_METHOD='GET', PATH_INFO=path, QUERY_STRING=query.urlencode())
+    query._mutable = False
+    sub.GET = query
+    sub.COOKIES = request.COOKIES
+    sub.resolver_match = match
+    sub.user = request.user
+    # Request de DRF (y AsyncAPIView) usan esta autenticación en lugar del JWT
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def _call_sync(match, sub):
+    response = match.func(sub, *match.args, **match.kwargs)
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    return response
+
+
+def _result(item_id, path, status_code, body):
+    return {'id': item_id, 'path': path, 'status': status_code, 'body': body}
+
+
+def _response_result(item_id, path, response):
+    if response.streaming:
+        response.close()
+        return _result(item_id, path, status.HTTP_400_BAD_REQUEST,
+                       {'error': 'Respuesta en streaming no admitida en un lote'})
+    if not response.get('Content-Type', '').startswith('application/json'):
+        return _result(item_id, path, status.HTTP_400_BAD_REQUEST,
+                       {'error': 'Solo se admiten respuestas JSON en un lote'})
+    return _result(item_id, path, response.status_code, loads(response.content) if response.content else None)
+
+
+async def run_item(request, item_id, path, query):
+    """Ejecutar una sub-petición; los errores quedan en su propio status"""
+    full_path, match = resolve_path(path)
+    if match is None:
+        return _result(item_id, path, status.HTTP_404_NOT_FOUND, {'error': 'Ruta no encontrada'})
+    if not getattr(getattr(match.func, 'view_class', None), 'batchable', True):
+        return _result(item_id, path, status.HTTP_400_BAD_REQUEST, {'error': 'Ruta no admitida en un lote'})
+
+    sub = build_request(request, full_path, query, match)
+    try:
+        if iscoroutinefunction(match.func):
+            response = await match.func(sub, *match.args, **match.kwargs)
+        else:
+            response = await sync_to_async(_call_sync)(match, sub)
+    except Exception:
+        logger.exception('Error en la petición %s del lote', path)
+        return _result(item_id, path, status.HTTP_500_INTERNAL_SERVER_ERROR, {'error': 'Error interno'})
+    return _response_result(item_id, path, response)
+
+
+async def execute_batch(request, items):
+    """Resultados de las peticiones (id, ruta, query) en el mismo orden"""
+    return await asyncio.gather(*(run_item(request, *item) for item in items))
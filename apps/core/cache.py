@@ -0,0 +1,317 @@
+"""
+Cache de dos niveles del Core App - Arte Ideas
+
+Nivel 1: LRU acotado dentro del proceso (sin red, microsegundos).
+Nivel 2: cache compartida de Django (Redis en producción, LocMem/archivos en
+desarrollo y tests).
+
+Las claves se agrupan en namespaces (uno por tenant más 'global'). Cada
+namespace tiene una generación: invalidar es incrementarla, con lo que todas
+las claves anteriores quedan huérfanas sin tener que borrarlas una a una.
+
+Para evitar estampidas se combinan recomputación de un solo vuelo (lock local
+más lock en la cache compartida) y expiración anticipada probabilística
+(XFetch): cuanto más cerca está la expiración y más caro es el cálculo, más
+probable es que una sola petición lo recalcule antes de que expire.
+"""
+import math
+import pickle
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+DEFAULTS = {
+    'ALIAS': 'default',
+    'KEY_PREFIX': 'core',
+    'LOCAL_MAX_ENTRIES': 1000,
+    'LOCAL_TTL': 30,
+    'GENERATION_TTL': 2,
+    'DEFAULT_TIMEOUT': 300,
+    'LOCK_TIMEOUT': 10,
+    'XFETCH_BETA': 1.0,
+}
+
+GLOBAL_NAMESPACE = 'global'
+
+
+def get_cache_settings():
+    return {**DEFAULTS, **getattr(settings, 'CORE_CACHE', {})}
+
+
+class LocalLRUCache:
+    """LRU acotado y thread-safe con expiración por entrada"""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Devuelve (encontrado, valor)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TwoTierCache:
+    """Cache local LRU delante de la cache compartida de Django"""
+
+    def __init__(self, **options):
+        config = {**get_cache_settings(), **options}
+        self.alias = config['ALIAS']
+        self.prefix = config['KEY_PREFIX']
+        self.local_ttl = config['LOCAL_TTL']
+        self.generation_ttl = config['GENERATION_TTL']
+        self.default_timeout = config['DEFAULT_TIMEOUT']
+        self.lock_timeout = config['LOCK_TIMEOUT']
+        self.beta = config['XFETCH_BETA']
+        self.local = LocalLRUCache(config['LOCAL_MAX_ENTRIES'])
+        self._generations = {}
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    # Generaciones -------------------------------------------------------
+
+    def _generation_key(self, namespace):
+        return f'{self.prefix}:gen:{namespace}'
+
+    def generation(self, namespace):
+        """Generación actual del namespace (memorizada unos segundos en el proceso)"""
+        memo = self._generations.get(namespace)
+        now = time.monotonic()
+        if memo and memo[0] > now:
+            return memo[1]
+        key = self._generation_key(namespace)
+        value = self.shared.get(key)
+        if value is None:
+            # Arrancar desde un valor basado en el reloj para no reutilizar
+            # generaciones anteriores si la clave fue desalojada
+            self.shared.add(key, time.time_ns(), None)
+            value = self.shared.get(key)
+        self._generations[namespace] = (now + self.generation_ttl, value)
+        return value
+
+    def invalidate(self, namespace):
+        """Invalidar todas las claves del namespace incrementando su generación"""
+        key = self._generation_key(namespace)
+        try:
+            value = self.shared.incr(key)
+        except ValueError:
+            value = time.time_ns()
+            self.shared.set(key, value, None)
+        self._generations[namespace] = (time.monotonic() + self.generation_ttl, value)
+
+    def make_key(self, namespace, name, *parts):
+        suffix = ':'.join(str(part) for part in parts)
+        return f'{self.prefix}:{namespace}:{self.generation(namespace)}:{name}:{suffix}'
+
+    # Lectura / escritura --------------------------------------------------
+
+    def _read(self, key):
+        """Buscar el sobre (valor, delta, expira) en el nivel local y luego en el compartido"""
+        found, raw = self.local.get(key)
+        if not found:
+            raw = self.shared.get(key)
+            if raw is None:
+                return None
+            self._store_local(key, raw)
+        return pickle.loads(raw)
+
+    def _store_local(self, key, raw):
+        _, _, expires_at = pickle.loads(raw)
+        ttl = min(self.local_ttl, expires_at - time.time())
+        if ttl > 0:
+            self.local.set(key, raw, ttl)
+
+    def _write(self, key, value, delta, timeout):
+        raw = pickle.dumps((value, delta, time.time() + timeout), pickle.HIGHEST_PROTOCOL)
+        self.shared.set(key, raw, timeout)
+        self._store_local(key, raw)
+
+    def _should_recompute(self, delta, expires_at):
+        """XFetch: expiración anticipada con probabilidad creciente"""
+        if self.beta <= 0:
+            return time.time() >= expires_at
+        return time.time() - delta * self.beta * math.log(random.random() or 1e-12) >= expires_at
+
+    def get(self, namespace, name, *parts, default=None):
+        envelope = self._read(self.make_key(namespace, name, *parts))
+        if envelope is None or envelope[2] <= time.time():
+            return default
+        return envelope[0]
+
+    def set(self, namespace, name, *parts, value, timeout=None):
+        self._write(self.make_key(namespace, name, *parts), value, 0.0, timeout or self.default_timeout)
+
+    def get_or_set(self, namespace, name, *parts, compute, timeout=None):
+        """
+        Obtener el valor o calcularlo con `compute()`.
+        Solo un proceso/hilo recalcula cada clave a la vez; el resto sirve el
+        valor anterior si existe o espera a que el cálculo termine.
+        """
+        timeout = timeout or self.default_timeout
+        key = self.make_key(namespace, name, *parts)
+        envelope = self._read(key)
+        if envelope is not None:
+            value, delta, expires_at = envelope
+            if not self._should_recompute(delta, expires_at):
+                return value
+
+        with self._flight_lock(key) as leader:
+            if not leader:
+                # Otro hilo del proceso acaba de recalcular
+                envelope = self._read(key)
+                if envelope is not None and envelope[2] > time.time():
+                    return envelope[0]
+            lock_key = f'{key}:lock'
+            if self.shared.add(lock_key, 1, self.lock_timeout):
+                try:
+                    started = time.perf_counter()
+                    value = compute()
+                    self._write(key, value, time.perf_counter() - started, timeout)
+                    return value
+                finally:
+                    self.shared.delete(lock_key)
+
+            # Otro proceso está recalculando: servir el valor anterior o esperar
+            if envelope is not None:
+                return envelope[0]
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                envelope = self._read(key)
+                if envelope is not None:
+                    return envelope[0]
+            return compute()
+
+    def _flight_lock(self, key):
+        with self._flights_lock:
+            lock = self._flights.setdefault(key, threading.Lock())
+        return _FlightLock(self, key, lock)
+
+    def clear_local(self):
+        self.local.clear()
+        self._generations.clear()
+
+
+class _FlightLock:
+    """Context manager que indica si el hilo obtuvo el lock sin esperar"""
+
+    def __init__(self, owner, key, lock):
+        self.owner = owner
+        self.key = key
+        self.lock = lock
+
+    def __enter__(self):
+        leader = self.lock.acquire(blocking=False)
+        if not leader:
+            self.lock.acquire()
+        return leader
+
+    def __exit__(self, *exc_info):
+        self.lock.release()
+        with self.owner._flights_lock:
+            if not self.lock.locked():
+                self.owner._flights.pop(self.key, None)
+
+
+core_cache = TwoTierCache()
+
+
+# Lookups cacheados ----------------------------------------------------------
+
+def tenant_namespace(tenant_id):
+    return f'tenant:{tenant_id}'
+
+
+def invalidate_tenant(tenant_id):
+    """Invalidar ahora y, si hay transacción en curso, también al confirmarla"""
+    namespace = tenant_namespace(tenant_id)
+    core_cache.invalidate(namespace)
+    transaction.on_commit(lambda: core_cache.invalidate(namespace))
+
+
+def get_cached_tenant(tenant_id):
+    """
+    Tenant por id (None si no existe). Es de solo lectura: puede estar
+    desfasado hasta el TTL y guardarlo pisaría cambios más recientes; para
+    editarlo se lee la fila con Tenant.objects.
+    """
+    from .models import Tenant
+
+    tenant = core_cache.get_or_set(
+        tenant_namespace(tenant_id), 'tenant',
+        compute=lambda: Tenant.objects.filter(pk=tenant_id).first()
+    )
+    if tenant is not None:
+        # Cada lectura deserializa una instancia propia: marcarla no afecta a otras
+        tenant.read_only = True
+    return tenant
+
+
+def get_cached_role_permissions(tenant_id):
+    """Diccionario rol -> RolePermission del tenant"""
+    from .models import RolePermission
+
+    return core_cache.get_or_set(
+        tenant_namespace(tenant_id), 'role_permissions',
+        compute=lambda: {
+            permission.role: permission
+            for permission in RolePermission.objects.filter(tenant_id=tenant_id)
+        }
+    )
+
+
+def get_cached_role_permission(tenant_id, role):
+    return get_cached_role_permissions(tenant_id).get(role)
+
+
+def get_cached_tenant_configuration(tenant_id):
+    """Configuración del tenant como {módulo: {clave: valor tipado}}"""
+    from .models import TenantConfiguration
+
+    def compute():
+        configuration = {}
+        for config in TenantConfiguration.objects.filter(tenant_id=tenant_id):
+            configuration.setdefault(config.module, {})[config.key] = config.get_typed_value()
+        return configuration
+
+    return core_cache.get_or_set(tenant_namespace(tenant_id), 'configuration', compute=compute)
+
+
+def get_tenant_setting(tenant_id, module, key, default=None):
+    return get_cached_tenant_configuration(tenant_id).get(module, {}).get(key, default)
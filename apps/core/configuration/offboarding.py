@@ -0,0 +1,265 @@
+"""
+Baja de tenants del Módulo Configuración - Arte Ideas
+
+Borrar un Tenant con tenant.delete() arrastra en una sola transacción todas
+sus tablas dependientes. Aquí la baja se hace por partes:
+
+1. start_offboarding desactiva el tenant y sus usuarios en el momento y
+   fija el plan: las tablas que dependen del tenant (directa o
+   indirectamente, por relaciones CASCADE) en orden de dependencias, hijos
+   antes que padres, y el propio tenant al final.
+2. Opcionalmente se archivan los datos: cada tabla se lee por bloques de
+   BATCH_SIZE filas y cada bloque se guarda como un archivo JSON Lines con su
+   punto de control (tabla y último pk), así que el archivo también avanza
+   por lotes y se reanuda. Al final los bloques se unen en un ZIP con una
+   entrada por tabla. Las columnas con credenciales no se archivan.
+3. Cada paso del plan se borra por lotes de BATCH_SIZE filas; cada lote se
+   confirma junto con el punto de control (paso y filas borradas), así que
+   tras una caída se reanuda donde quedó.
+
+Lo ejecuta el trabajo periódico run_offboardings (apps/core/jobs.py) bajo
+su lock, MAX_BATCHES lotes por ejecución. Una baja que falla queda en
+'failed' con el error y se reanuda con offboard_tenant --resume.
+"""
+import json
+import tempfile
+import zipfile
+from functools import reduce
+from operator import or_
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core.cache import invalidate_tenant
+from apps.core.models import Tenant, TenantOffboarding, User
+from apps.core.response_cache import purge_instance
+
+from .sync import tombstones_suppressed
+
+ACTIVE_STATUSES = ('pending', 'archiving', 'deleting')
+
+# Profundidad máxima al seguir relaciones (evita ciclos de FKs a sí mismo)
+MAX_DEPTH = 5
+
+# Columnas que no se guardan en el archivo
+ARCHIVE_EXCLUDED_FIELDS = {
+    'core.user': ('password',),
+}
+
+
+def build_plan(root=Tenant):
+    """
+    Pasos [(modelo, lookup hasta el tenant)] en orden de borrado. Un modelo
+    puede aparecer varias veces si llega al tenant por varios caminos (p. ej.
+    UserActivity por 'user__tenant' y por 'tenant').
+    """
+    plan = []
+    seen = set()
+
+    def visit(parent, path, depth):
+        for relation in parent._meta.related_objects:
+            if relation.many_to_many or relation.on_delete is not models.CASCADE:
+                continue
+            child = relation.related_model
+            lookup = f'{relation.field.name}__{path}' if path else relation.field.name
+            if (child, lookup) in seen or depth >= MAX_DEPTH:
+                continue
+            seen.add((child, lookup))
+            visit(child, lookup, depth + 1)
+            plan.append((child, lookup))
+
+    visit(root, '', 0)
+    plan.append((root, 'pk'))
+    return plan
+
+
+def serialize_plan(plan):
+    return [[model._meta.label_lower, lookup] for model, lookup in plan]
+
+
+def _tables(job):
+    """Modelos del plan con su queryset (unión de todos sus caminos al tenant)"""
+    lookups = {}
+    for label, lookup in job.plan:
+        lookups.setdefault(label, []).append(lookup)
+    return [
+        (label, apps.get_model(label)._base_manager.filter(
+            reduce(or_, (Q(**{lookup: job.tenant_ref}) for lookup in label_lookups))
+        ))
+        for label, label_lookups in lookups.items()
+    ]
+
+
+def start_offboarding(tenant, requested_by=None, archive=False):
+    """
+    Desactivar el tenant y sus usuarios y encolar su baja. Si ya hay una
+    baja en curso para el tenant, se devuelve esa.
+    """
+    from apps.core.scheduler import run_scheduled_job
+
+    with transaction.atomic():
+        job = TenantOffboarding.objects.filter(tenant=tenant, status__in=ACTIVE_STATUSES).first()
+        if job is not None:
+            return job
+        Tenant.objects.filter(pk=tenant.pk).update(is_active=False, updated_at=timezone.now())
+        User.all_objects.filter(tenant=tenant).update(is_active=False, updated_at=timezone.now())
+        job = TenantOffboarding.objects.create(
+            tenant=tenant,
+            tenant_ref=tenant.pk,
+            tenant_name=tenant.name,
+            requested_by=requested_by,
+            archive=archive,
+            plan=serialize_plan(build_plan()),
+        )
+        invalidate_tenant(tenant.pk)
+        purge_instance(Tenant, tenant.pk)
+
+    run_scheduled_job.delay('run_offboardings')
+    return job
+
+
+def _archive_columns(label, model):
+    excluded = ARCHIVE_EXCLUDED_FIELDS.get(label, ())
+    return [field.attname for field in model._meta.concrete_fields if field.name not in excluded]
+
+
+def archive_batches(job, batch_size, max_batches):
+    """
+    Archivar como máximo max_batches bloques desde el punto de control.
+    Devuelve (bloques escritos, terminado).
+    """
+    storage = job.archive_file.storage
+    # Padres primero: es el orden en que habría que restaurarlo
+    tables = list(reversed(_tables(job)))
+    batches = 0
+    while job.archive_step < len(tables):
+        if batches >= max_batches:
+            return batches, False
+        label, queryset = tables[job.archive_step]
+        pk_name = queryset.model._meta.pk.attname
+        if job.archive_after is not None:
+            queryset = queryset.filter(pk__gt=job.archive_after)
+        rows = list(queryset.order_by('pk').values(*_archive_columns(label, queryset.model))[:batch_size])
+        if rows:
+            content = b''.join(
+                json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False).encode('utf-8') + b'\n' for row in rows
+            )
+            name = storage.save(
+                f'offboarding/parts/tenant-{job.tenant_ref}/{job.archive_step:03d}-{len(job.archive_parts):06d}.jsonl',
+                ContentFile(content)
+            )
+            job.archive_parts.append([label, name, len(rows)])
+            job.archive_after = rows[-1][pk_name]
+            batches += 1
+        if len(rows) < batch_size:
+            job.archive_step += 1
+            job.archive_after = None
+        job.save(update_fields=['archive_step', 'archive_after', 'archive_parts', 'updated_at'])
+    return batches, True
+
+
+def write_archive(job):
+    """Unir los bloques archivados en un ZIP con una entrada JSON Lines por tabla y borrarlos"""
+    from apps.core.scheduler import extend_lock
+
+    storage = job.archive_file.storage
+    counts = {label: 0 for label, _ in reversed(_tables(job))}
+    parts = {}
+    for label, name, rows in job.archive_parts:
+        parts.setdefault(label, []).append(name)
+        counts[label] += rows
+    with tempfile.TemporaryFile() as handle:
+        with zipfile.ZipFile(handle, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for label in counts:
+                with archive.open(f'{label}.jsonl', 'w') as entry:
+                    for name in parts.get(label, ()):
+                        with storage.open(name) as part:
+                            for chunk in part.chunks():
+                                entry.write(chunk)
+                        # Copiar no consulta la BD, pero en un tenant grande puede tardar
+                        extend_lock()
+            archive.writestr('manifest.json', json.dumps({
+                'tenant_id': job.tenant_ref,
+                'tenant_name': job.tenant_name,
+                'created_at': timezone.now().isoformat(),
+                'tables': counts,
+            }, ensure_ascii=False, indent=2))
+        handle.seek(0)
+        job.archive_file.save(f'tenant-{job.tenant_ref}.zip', File(handle), save=False)
+    job.archive_size = job.archive_file.size
+    for _, name, _ in job.archive_parts:
+        storage.delete(name)
+    job.archive_parts = []
+    return counts
+
+
+def resume_offboarding(job):
+    """Volver a poner en curso una baja fallida desde su punto de control"""
+    if job.status == 'failed':
+        job.status = 'archiving' if job.archive and not job.archive_file else 'deleting'
+        job.error = ''
+        job.save(update_fields=['status', 'error', 'updated_at'])
+    return job
+
+
+def _delete_files(model, pks):
+    """Borrar del storage los archivos de las filas (el DELETE no los toca)"""
+    file_fields = [field for field in model._meta.concrete_fields if isinstance(field, models.FileField)]
+    if not file_fields:
+        return
+    for row in model._base_manager.filter(pk__in=pks).values(*[field.attname for field in file_fields]):
+        for field in file_fields:
+            if row[field.attname]:
+                field.storage.delete(row[field.attname])
+
+
+def run_offboarding(job, batch_size, max_batches):
+    """
+    Avanzar la baja como máximo max_batches lotes. Devuelve los lotes
+    usados; la baja está terminada cuando job.status == 'completed'.
+    """
+    if job.status == 'pending':
+        job.total_rows = sum(queryset.count() for _, queryset in _tables(job))
+        job.status = 'archiving' if job.archive else 'deleting'
+        job.save(update_fields=['total_rows', 'status', 'updated_at'])
+
+    batches = 0
+    if job.status == 'archiving':
+        batches, finished = archive_batches(job, batch_size, max_batches)
+        if not finished:
+            return batches
+        write_archive(job)
+        job.status = 'deleting'
+        job.save(update_fields=['archive_file', 'archive_size', 'archive_parts', 'status', 'updated_at'])
+
+    while job.step < len(job.plan):
+        label, lookup = job.plan[job.step]
+        model = apps.get_model(label)
+        queryset = model._base_manager.filter(**{lookup: job.tenant_ref})
+        while True:
+            if batches >= max_batches:
+                return batches
+            pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            _delete_files(model, pks)
+            with transaction.atomic(), tombstones_suppressed():
+                model._base_manager.filter(pk__in=pks).delete()
+                job.deleted_rows += len(pks)
+                job.tables[label] = job.tables.get(label, 0) + len(pks)
+                job.save(update_fields=['deleted_rows', 'tables', 'updated_at'])
+            batches += 1
+        job.step += 1
+        job.save(update_fields=['step', 'updated_at'])
+
+    job.status = 'completed'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at', 'updated_at'])
+    invalidate_tenant(job.tenant_ref)
+    purge_instance(Tenant, job.tenant_ref)
+    return batches
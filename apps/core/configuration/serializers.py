@@ -4,12 +4,14 @@ Serializers del Módulo Configuración - Arte Ideas
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
-from apps.core.models import Tenant, TenantConfiguration, RolePermission, UserProfile
+from apps.core.models import Tenant, TenantConfiguration, TenantOffboarding, RolePermission
+from apps.core.serializers import SparseFieldsetMixin
+from apps.core.tasks import create_user_profile
 
 User = get_user_model()
 
 
-class TenantSerializer(serializers.ModelSerializer):
+class TenantSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer para datos del tenant"""
     location_display = serializers.CharField(source='get_location_type_display', read_only=True)
     currency_display = serializers.CharField(source='get_currency_display', read_only=True)
@@ -76,7 +78,7 @@ class RolePermissionSerializer(serializers.ModelSerializer):
         return sum(actions)
 
 
-class UserManagementSerializer(serializers.ModelSerializer):
+class UserManagementSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer para gestión de usuarios en configuración"""
     role_display = serializers.CharField(source='get_role_display', read_only=True)
     status_display = serializers.SerializerMethodField()
@@ -89,6 +91,7 @@ class UserManagementSerializer(serializers.ModelSerializer):
             'phone', 'date_joined'
         ]
         read_only_fields = ['id', 'date_joined']
+        field_sources = {'status_display': ('is_active',)}
     
     def get_status_display(self, obj):
         return "Activo" if obj.is_active else "Inactivo"
@@ -127,13 +130,14 @@ class CreateUserSerializer(serializers.ModelSerializer):
         user.set_password(password)
         user.save()
         
-        # Crear perfil
-        UserProfile.objects.create(user=user)
+        # Crear perfil en la petición (un INSERT): el usuario nuevo no queda
+        # sin perfil mientras la cola de tareas va atrasada
+        create_user_profile(user.pk)
         
         return user
 
 
-class SuperAdminTenantSerializer(serializers.ModelSerializer):
+class SuperAdminTenantSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer para gestión de tenants (solo super admin)"""
     users_count = serializers.SerializerMethodField()
     
@@ -144,6 +148,67 @@ class SuperAdminTenantSerializer(serializers.ModelSerializer):
             'location_type', 'currency', 'max_users', 'users_count',
             'is_active', 'created_at'
         ]
+        # La vista anota users_count; no necesita columnas propias
+        field_sources = {'users_count': ()}
     
     def get_users_count(self, obj):
-        return obj.user_set.count()
\ No newline at end of file
+        # Usar la anotación de la vista si existe para evitar una query por tenant
+        users_count = getattr(obj, 'users_count', None)
+        if users_count is not None:
+            return users_count
+        return obj.user_set.count()
+
+class ProvisionAdminSerializer(serializers.Serializer):
+    """Primer administrador de un tenant en el alta por lotes (sin password recibe una invitación)"""
+    username = serializers.CharField(max_length=150)
+    email = serializers.EmailField(required=False, allow_blank=True)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    password = serializers.CharField(write_only=True, required=False)
+    
+    def validate_password(self, value):
+        validate_password(value)
+        return value
+
+
+class TenantProvisionSerializer(serializers.Serializer):
+    """
+    Tenant del alta por lotes. No valida que el slug sea único: si ya existe,
+    el alta solo completa lo que le falte.
+    """
+    name = serializers.CharField(max_length=100)
+    slug = serializers.SlugField(max_length=50, required=False)
+    business_name = serializers.CharField(max_length=200)
+    business_address = serializers.CharField(required=False, allow_blank=True)
+    business_phone = serializers.CharField(max_length=15, required=False, allow_blank=True)
+    business_email = serializers.EmailField(required=False, allow_blank=True)
+    business_ruc = serializers.CharField(max_length=11, required=False, allow_blank=True)
+    currency = serializers.ChoiceField(choices=Tenant._meta.get_field('currency').choices, required=False)
+    location_type = serializers.ChoiceField(choices=Tenant._meta.get_field('location_type').choices, required=False)
+    max_users = serializers.IntegerField(min_value=1, required=False)
+    max_storage_mb = serializers.IntegerField(min_value=1, required=False)
+    admin = ProvisionAdminSerializer(required=False)
+    
+    def validate(self, attrs):
+        if not attrs.get('slug'):
+            attrs['slug'] = Tenant.make_slug(attrs['name'])
+        return attrs
+
+
+class TenantOffboardingSerializer(serializers.ModelSerializer):
+    """Serializer para el progreso de la baja de un tenant"""
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    progress = serializers.IntegerField(read_only=True)
+    steps_total = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = TenantOffboarding
+        fields = [
+            'id', 'tenant_ref', 'tenant_name', 'status', 'status_display', 'archive', 'archive_size',
+            'progress', 'step', 'steps_total', 'total_rows', 'deleted_rows', 'tables', 'error',
+            'created_at', 'updated_at', 'finished_at'
+        ]
+        read_only_fields = fields
+    
+    def get_steps_total(self, obj):
+        return len(obj.plan)
@@ -0,0 +1,220 @@
+"""
+Snapshots de configuración del Módulo Configuración - Arte Ideas
+
+Un snapshot reúne en un solo documento JSON versionado todo lo que define la
+configuración de un estudio: los datos del negocio del Tenant, los permisos
+de cada rol y los parámetros de TenantConfiguration. Sirve para copiar la
+configuración de un estudio a otro o restaurarla.
+
+Las filas se guardan como listas con una lista de columnas al inicio, para
+que el documento sea compacto:
+
+    {
+        "format": "arte-ideas/tenant-config",
+        "version": 1,
+        "tenant": {"business_name": ..., ...},
+        "role_permissions": {"columns": ["role", "access_dashboard", ...], "rows": [...]},
+        "configuration": {"columns": ["module", "key", ...], "rows": [...]}
+    }
+
+La importación valida todo antes de escribir y aplica los cambios en una
+sola transacción con bulk_create(update_conflicts=True). Como las escrituras
+en bloque no disparan signals, la cache del tenant se invalida una sola vez
+al final.
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.cache import invalidate_tenant
+from apps.core.models import RolePermission, Tenant, TenantConfiguration
+from apps.core.response_cache import purge_instance
+
+SNAPSHOT_FORMAT = 'arte-ideas/tenant-config'
+SNAPSHOT_VERSION = 1
+
+TENANT_FIELDS = [
+    'business_name', 'business_address', 'business_phone', 'business_email',
+    'business_ruc', 'currency', 'location_type', 'max_users', 'max_storage_mb',
+]
+
+PERMISSION_FIELDS = [
+    field.name for field in RolePermission._meta.concrete_fields
+    if field.get_internal_type() == 'BooleanField'
+]
+PERMISSION_COLUMNS = ['role'] + PERMISSION_FIELDS
+
+ROLES = {code for code, _ in RolePermission.ROLE_CHOICES}
+
+CONFIGURATION_COLUMNS = ['module', 'key', 'value', 'data_type', 'description', 'is_editable']
+
+
+class SnapshotError(ValueError):
+    """Snapshot con formato o datos inválidos"""
+
+
+def build_snapshot(tenant):
+    """Snapshot de la configuración actual del tenant"""
+    tenant_values = Tenant.objects.filter(pk=tenant.pk).values(*TENANT_FIELDS).get()
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'exported_at': timezone.now().isoformat(),
+        'source': {'tenant_id': tenant.pk, 'slug': tenant.slug},
+        'tenant': tenant_values,
+        'role_permissions': {
+            'columns': PERMISSION_COLUMNS,
+            'rows': [
+                list(row) for row in RolePermission.objects.filter(tenant=tenant)
+                .order_by('role').values_list(*PERMISSION_COLUMNS)
+            ],
+        },
+        'configuration': {
+            'columns': CONFIGURATION_COLUMNS,
+            'rows': [
+                list(row) for row in TenantConfiguration.objects.filter(tenant=tenant)
+                .order_by('module', 'key').values_list(*CONFIGURATION_COLUMNS)
+            ],
+        },
+    }
+
+
+def _field_errors(model, values):
+    """
+    Validar valores sueltos con las reglas de los campos del modelo. Se
+    aceptan textos vacíos, que pueden existir en la BD (un snapshot recién
+    exportado siempre debe poder importarse).
+    """
+    errors = {}
+    for name, value in values.items():
+        field = model._meta.get_field(name)
+        if value is None and not field.null:
+            errors[name] = ['Este campo no puede ser nulo.']
+            continue
+        try:
+            value = field.to_python(value)
+            if value not in field.empty_values:
+                field.validate(value, None)
+                field.run_validators(value)
+        except ValidationError as exc:
+            errors[name] = exc.messages
+    return errors
+
+
+def _read_table(snapshot, section, expected_columns, required):
+    """Convertir una sección {'columns', 'rows'} en lista de diccionarios"""
+    table = snapshot.get(section) or {'columns': expected_columns, 'rows': []}
+    columns = table.get('columns')
+    rows = table.get('rows')
+    if not isinstance(columns, list) or not isinstance(rows, list):
+        raise SnapshotError(f"'{section}' debe tener 'columns' y 'rows'")
+    unknown = set(columns) - set(expected_columns)
+    missing = set(required) - set(columns)
+    if unknown or missing:
+        raise SnapshotError(
+            f"Columnas inválidas en '{section}': desconocidas {sorted(unknown)}, faltan {sorted(missing)}"
+        )
+    records = []
+    for index, row in enumerate(rows):
+        if not isinstance(row, list) or len(row) != len(columns):
+            raise SnapshotError(f"Fila {index} de '{section}' no coincide con las columnas")
+        records.append(dict(zip(columns, row)))
+    return records
+
+
+def parse_snapshot(snapshot):
+    """Validar un snapshot; devuelve (tenant, permisos, configuración) o lanza SnapshotError"""
+    if not isinstance(snapshot, dict) or snapshot.get('format') != SNAPSHOT_FORMAT:
+        raise SnapshotError('No es un snapshot de configuración de Arte Ideas')
+    version = snapshot.get('version')
+    if not isinstance(version, int) or not 1 <= version <= SNAPSHOT_VERSION:
+        raise SnapshotError(f'Versión de snapshot no soportada: {version}')
+
+    tenant_values = snapshot.get('tenant') or {}
+    if not isinstance(tenant_values, dict) or set(tenant_values) - set(TENANT_FIELDS):
+        raise SnapshotError(f"'tenant' solo admite los campos {TENANT_FIELDS}")
+
+    permissions = _read_table(snapshot, 'role_permissions', PERMISSION_COLUMNS, ['role'])
+    configuration = _read_table(snapshot, 'configuration', CONFIGURATION_COLUMNS, ['module', 'key', 'value'])
+
+    errors = {}
+    if tenant_values:
+        tenant_errors = _field_errors(Tenant, tenant_values)
+        if tenant_errors:
+            errors['tenant'] = tenant_errors
+    roles = set()
+    for index, record in enumerate(permissions):
+        if not isinstance(record['role'], str) or record['role'] not in ROLES:
+            errors[f'role_permissions[{index}]'] = {'role': ['Rol inválido']}
+        elif record['role'] in roles:
+            errors[f'role_permissions[{index}]'] = {'role': ['Rol repetido']}
+        elif any(not isinstance(record[name], bool) for name in record if name != 'role'):
+            errors[f'role_permissions[{index}]'] = {'permisos': ['Los permisos deben ser true/false']}
+        roles.add(record['role'])
+    keys = set()
+    for index, record in enumerate(configuration):
+        record_errors = _field_errors(TenantConfiguration, record)
+        if (record['module'], record['key']) in keys:
+            record_errors['key'] = ['Clave repetida en el módulo']
+        keys.add((record['module'], record['key']))
+        if record_errors:
+            errors[f'configuration[{index}]'] = record_errors
+    if errors:
+        raise SnapshotError(errors)
+    return tenant_values, permissions, configuration
+
+
+def apply_snapshot(tenant, snapshot, prune=False, dry_run=False):
+    """
+    Aplicar un snapshot al tenant en una sola transacción. Con prune se
+    borran los permisos y parámetros que no estén en el snapshot. Devuelve
+    un resumen de lo aplicado.
+    """
+    tenant_values, permissions, configuration = parse_snapshot(snapshot)
+    summary = {
+        'tenant_fields': len(tenant_values),
+        'role_permissions': len(permissions),
+        'configuration': len(configuration),
+        'pruned': 0,
+        'dry_run': dry_run,
+    }
+    if dry_run:
+        return summary
+
+    now = timezone.now()
+    permission_fields = sorted({name for record in permissions for name in record} - {'role'})
+    configuration_fields = sorted({name for record in configuration for name in record} - {'module', 'key'})
+    with transaction.atomic():
+        if tenant_values:
+            Tenant.objects.filter(pk=tenant.pk).update(updated_at=now, **tenant_values)
+        if permissions:
+            RolePermission.objects.bulk_create(
+                [RolePermission(tenant=tenant, **record) for record in permissions],
+                update_conflicts=True,
+                unique_fields=['tenant', 'role'],
+                update_fields=permission_fields + ['updated_at'],
+            )
+        if configuration:
+            TenantConfiguration.objects.bulk_create(
+                [TenantConfiguration(tenant=tenant, **record) for record in configuration],
+                update_conflicts=True,
+                unique_fields=['tenant', 'module', 'key'],
+                update_fields=configuration_fields + ['updated_at'],
+            )
+        if prune:
+            summary['pruned'] += RolePermission.objects.filter(tenant=tenant).exclude(
+                role__in=[record['role'] for record in permissions]
+            ).delete()[0]
+            stale = TenantConfiguration.objects.filter(tenant=tenant)
+            for module in {record['module'] for record in configuration}:
+                stale = stale.exclude(
+                    module=module,
+                    key__in=[record['key'] for record in configuration if record['module'] == module],
+                )
+            summary['pruned'] += stale.delete()[0]
+
+        # Una sola invalidación para todo lo escrito en bloque
+        invalidate_tenant(tenant.pk)
+        for model in (Tenant, RolePermission, TenantConfiguration):
+            purge_instance(model, tenant.pk)
+    return summary
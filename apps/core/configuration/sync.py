@@ -0,0 +1,208 @@
+"""
+Sincronización incremental del Módulo Configuración - Arte Ideas
+
+El frontend recargaba las listas completas de usuarios, permisos por rol y
+configuración del tenant en cada refresco. Con un feed de cambios solo pide
+lo que cambió desde su último cursor:
+
+    GET /api/core/config/sync/users/                 -> todo + cursor
+    GET /api/core/config/sync/users/?since=<cursor>  -> solo cambios
+
+- Altas y modificaciones salen de updated_at, recorrido con el índice
+  (tenant, updated_at) en orden (updated_at, pk).
+- Los borrados salen de Tombstone, que llena una señal post_delete, y de los
+  usuarios eliminados (deleted_at), que siguen en la tabla hasta su purga.
+- El cursor es la posición (updated_at, pk) de la última fila enviada; con
+  has_more se pide la página siguiente con ese cursor. En la última página el
+  cursor retrocede OVERLAP segundos para volver a ver las filas de
+  transacciones que confirmaron tarde con un updated_at anterior. El cliente
+  aplica primero deleted y después changed, y repetir filas no le afecta.
+- Un cursor más viejo que TOMBSTONE_RETENTION_DAYS (las lápidas ya se
+  purgaron) responde 410 y el cliente vuelve a pedir todo sin since.
+"""
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.core.fast_serializers import FastRolePermissionSerializer, FastUserManagementSerializer
+from apps.core.models import RolePermission, TenantConfiguration, Tombstone
+from apps.core.scheduler import get_scheduler_settings
+
+from .serializers import TenantConfigurationSerializer
+
+User = get_user_model()
+
+DEFAULTS = {
+    'PAGE_SIZE': 500,        # Filas por página si no se indica ?limit=
+    'MAX_PAGE_SIZE': 2000,   # Máximo de ?limit=
+    'OVERLAP': 5,            # Segundos que retrocede el cursor de la última página
+}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class SyncError(ValueError):
+    """Parámetros de sincronización inválidos; args[1] es el status HTTP"""
+
+
+def get_sync_settings():
+    return {**DEFAULTS, **getattr(settings, 'CORE_SYNC', {})}
+
+
+def encode_cursor(updated_at, pk):
+    return f'{(updated_at - EPOCH) // timedelta(microseconds=1)}.{pk}'
+
+
+def decode_cursor(cursor):
+    """(updated_at, pk) del cursor"""
+    try:
+        micros, pk = cursor.split('.')
+        return EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except (ValueError, OverflowError):
+        raise SyncError('Cursor inválido', 400)
+
+
+class SyncFeed:
+    """Recurso sincronizable: filas del tenant con updated_at y su identificador"""
+    name = None
+    model = None
+    serializer_class = None
+    key_fields = ('id',)
+    # Campo de borrado lógico: las filas marcadas se informan como borradas
+    deleted_field = None
+    roles = ('admin', 'super_admin')
+
+    @classmethod
+    def label(cls):
+        return cls.model._meta.label_lower
+
+    def get_queryset(self, request):
+        return self.model._base_manager.filter(tenant_id=request.user.tenant_id)
+
+    def key(self, instance):
+        return {field: getattr(instance, field) for field in self.key_fields}
+
+    def serialize(self, queryset, request):
+        return self.serializer_class(queryset, many=True, context={'request': request}).data
+
+
+class UsersFeed(SyncFeed):
+    name = 'users'
+    model = User
+    serializer_class = FastUserManagementSerializer
+    deleted_field = 'deleted_at'
+
+    def get_queryset(self, request):
+        # Igual que la lista de usuarios: sin el propio usuario
+        return super().get_queryset(request).exclude(pk=request.user.pk)
+
+
+class PermissionsFeed(SyncFeed):
+    name = 'permissions'
+    model = RolePermission
+    serializer_class = FastRolePermissionSerializer
+    key_fields = ('role',)
+
+
+class ConfigurationFeed(SyncFeed):
+    name = 'configuration'
+    model = TenantConfiguration
+    serializer_class = TenantConfigurationSerializer
+    key_fields = ('module', 'key')
+
+
+FEEDS = {feed.name: feed() for feed in (UsersFeed, PermissionsFeed, ConfigurationFeed)}
+FEEDS_BY_MODEL = {feed.model: feed for feed in FEEDS.values()}
+
+
+_suppressed = threading.local()
+
+
+@contextmanager
+def tombstones_suppressed():
+    """
+    No registrar lápidas en los borrados del bloque. Para los borrados por
+    lotes que ningún cliente necesita ver: la baja de un tenant (ya nadie
+    sincroniza con él) y la purga de usuarios eliminados (el feed ya informó
+    su deleted_at). Evita un INSERT en Tombstone por cada fila borrada.
+    """
+    previous = getattr(_suppressed, 'active', False)
+    _suppressed.active = True
+    try:
+        yield
+    finally:
+        _suppressed.active = previous
+
+
+def record_tombstone(instance):
+    """Guardar la lápida de una fila borrada de un recurso sincronizable"""
+    if getattr(_suppressed, 'active', False):
+        return
+    feed = FEEDS_BY_MODEL[type(instance)]
+    Tombstone.objects.create(model=feed.label(), tenant_ref=instance.tenant_id, object_key=feed.key(instance))
+
+
+def get_page_size(value):
+    config = get_sync_settings()
+    if value in (None, ''):
+        return config['PAGE_SIZE']
+    try:
+        limit = int(value)
+    except ValueError:
+        raise SyncError('limit debe ser un número', 400)
+    return max(1, min(limit, config['MAX_PAGE_SIZE']))
+
+
+def changes(feed, request, since=None, limit=None):
+    """Página de cambios del recurso desde el cursor since (todo si es None)"""
+    now = timezone.now()
+    limit = get_page_size(limit)
+    position = decode_cursor(since) if since else None
+    if position:
+        retention = get_scheduler_settings()['TOMBSTONE_RETENTION_DAYS']
+        if position[0] < now - timedelta(days=retention):
+            raise SyncError('Cursor expirado; sincronizar de nuevo sin since', 410)
+
+    queryset = feed.get_queryset(request)
+    columns = ['pk', 'updated_at']
+    if feed.deleted_field:
+        columns.append(feed.deleted_field)
+        if position is None:
+            queryset = queryset.filter(**{f'{feed.deleted_field}__isnull': True})
+    if position:
+        # Rango sobre el índice; las filas del mismo instante se desempatan por pk
+        queryset = queryset.filter(updated_at__gte=position[0]).exclude(updated_at=position[0], pk__lte=position[1])
+    rows = list(queryset.order_by('updated_at', 'pk').values_list(*columns)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changed = [row[0] for row in rows if not (feed.deleted_field and row[2])]
+    deleted = [{'id': row[0]} for row in rows if feed.deleted_field and row[2]]
+    if position:
+        tombstones = Tombstone.objects.filter(
+            model=feed.label(), tenant_ref=request.user.tenant_id, deleted_at__gt=position[0]
+        )
+        if has_more:
+            tombstones = tombstones.filter(deleted_at__lte=rows[-1][1])
+        deleted += list(tombstones.order_by('deleted_at').values_list('object_key', flat=True))
+
+    if has_more:
+        cursor = (rows[-1][1], rows[-1][0])
+    else:
+        horizon = (now - timedelta(seconds=get_sync_settings()['OVERLAP']), 0)
+        cursor = min((rows[-1][1], rows[-1][0]) if rows else position or horizon, horizon)
+
+    return {
+        'resource': feed.name,
+        'full': position is None,
+        'changed': feed.serialize(
+            feed.model._base_manager.filter(pk__in=changed).order_by('updated_at', 'pk'), request
+        ) if changed else [],
+        'deleted': deleted,
+        'cursor': encode_cursor(*cursor),
+        'has_more': has_more,
+    }
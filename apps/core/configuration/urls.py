@@ -4,7 +4,9 @@ URLs del Módulo Configuración - Arte Ideas
 from django.urls import path
 from .views import (
     BusinessConfigurationView, UsersManagementView, UserManagementDetailView,
-    RolePermissionsView, RolesListView, TenantsManagementView, TenantUsersView
+    RolePermissionsView, RolesListView, TenantsManagementView, TenantUsersView,
+    ConfigurationSnapshotView, TenantProvisioningView, TenantOffboardingView, TenantOffboardingDetailView,
+    SyncChangesView
 )
 
 app_name = 'configuration'
@@ -14,6 +16,13 @@ urlpatterns = [
     path('business/view/', BusinessConfigurationView.as_view(), name='business_view'),    # GET - Ver configuración
     path('business/edit/', BusinessConfigurationView.as_view(), name='business_edit'),    # PUT - Editar configuración
     
+    # Snapshot de configuración (negocio, permisos y parámetros)
+    path('snapshot/export/', ConfigurationSnapshotView.as_view(), name='snapshot_export'),  # GET - Descargar snapshot
+    path('snapshot/import/', ConfigurationSnapshotView.as_view(), name='snapshot_import'),  # POST - Aplicar snapshot
+    
+    # Sincronización incremental (usuarios, permisos y configuración)
+    path('sync/<str:resource>/', SyncChangesView.as_view(), name='sync_changes'),          # GET - Cambios desde ?since=
+    
     # Gestión de Usuarios
     path('users/list/', UsersManagementView.as_view(), name='users_list'),               # GET - Lista usuarios
     path('users/create/', UsersManagementView.as_view(), name='users_create'),           # POST - Crear usuario
@@ -31,5 +40,8 @@ urlpatterns = [
     # Super Admin - Gestión de Tenants
     path('tenants/list/', TenantsManagementView.as_view(), name='tenants_list'),         # GET - Lista tenants
     path('tenants/create/', TenantsManagementView.as_view(), name='tenants_create'),     # POST - Crear tenant
+    path('tenants/provision/', TenantProvisioningView.as_view(), name='tenants_provision'), # POST - Alta por lotes
     path('tenants/<int:tenant_id>/users/', TenantUsersView.as_view(), name='tenant_users'), # GET - Usuarios del tenant
+    path('tenants/<int:tenant_id>/offboard/', TenantOffboardingView.as_view(), name='tenant_offboard'), # POST - Dar de baja
+    path('offboarding/<int:job_id>/', TenantOffboardingDetailView.as_view(), name='offboarding_view'),  # GET - Progreso
 ]
\ No newline at end of file
@@ -5,11 +5,23 @@ from rest_framework import status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
-from apps.core.models import Tenant, UserActivity, RolePermission
+from django.db.models import Count, Q
+from apps.core.cache import get_cached_role_permissions, get_cached_tenant
+from apps.core.fast_serializers import FastRolePermissionSerializer, FastUserManagementSerializer
+from apps.core.models import Tenant, TenantOffboarding, RolePermission
+from apps.core.renderers import stream_queryset, wants_stream
+from apps.core.response_cache import cache_response
+from apps.core.serializers import get_sparse_params, select_fields
+from apps.core.tasks import log_activity
 
+from .offboarding import start_offboarding
+from .provisioning import MAX_BATCH_SIZE, MAX_PASSWORDS, ProvisioningError, provision_tenants, seed_tenant_defaults
+from .snapshot import SnapshotError, apply_snapshot, build_snapshot
+from .sync import FEEDS, SyncError, changes
 from .serializers import (
     TenantSerializer, RolePermissionSerializer, UserManagementSerializer,
-    CreateUserSerializer, SuperAdminTenantSerializer
+    CreateUserSerializer, SuperAdminTenantSerializer, TenantProvisionSerializer,
+    TenantOffboardingSerializer
 )
 
 User = get_user_model()
@@ -19,13 +31,14 @@ class BusinessConfigurationView(APIView):
     """Vista para configuración del negocio"""
     permission_classes = [permissions.IsAuthenticated]
     
+    @cache_response(depends_on=[Tenant])
     def get(self, request):
         """Obtener configuración del negocio"""
         if not request.user.tenant:
             return Response({'error': 'Usuario no pertenece a un tenant'}, 
                           status=status.HTTP_400_BAD_REQUEST)
         
-        serializer = TenantSerializer(request.user.tenant)
+        serializer = TenantSerializer(request.user.tenant, context={'request': request})
         return Response(serializer.data)
     
     def put(self, request):
@@ -39,17 +52,17 @@ class BusinessConfigurationView(APIView):
             return Response({'error': 'Sin permisos para modificar configuración'}, 
                           status=status.HTTP_403_FORBIDDEN)
         
-        serializer = TenantSerializer(request.user.tenant, data=request.data, partial=True)
+        # Editar la fila actual de la BD, no la copia cacheada del tenant
+        tenant = Tenant.objects.get(pk=request.user.tenant_id)
+        serializer = TenantSerializer(tenant, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             
             # Registrar actividad
-            UserActivity.objects.create(
-                user=request.user,
-                tenant=request.user.tenant,
-                action='config_change',
-                description='Actualizó la configuración del negocio',
-                module='configuration'
+            log_activity(
+                request.user, 'config_change',
+                'Actualizó la configuración del negocio',
+                'configuration'
             )
             
             return Response(serializer.data)
@@ -72,7 +85,11 @@ class UsersManagementView(APIView):
                           status=status.HTTP_403_FORBIDDEN)
         
         users = User.objects.filter(tenant=request.user.tenant).exclude(id=request.user.id)
-        serializer = UserManagementSerializer(users, many=True)
+        if wants_stream(request):
+            return stream_queryset(
+                users.order_by('id'), FastUserManagementSerializer, context={'request': request}
+            )
+        serializer = FastUserManagementSerializer(users, many=True, context={'request': request})
         return Response(serializer.data)
     
     def post(self, request):
@@ -91,13 +108,7 @@ class UsersManagementView(APIView):
             user = serializer.save()
             
             # Registrar actividad
-            UserActivity.objects.create(
-                user=request.user,
-                tenant=request.user.tenant,
-                action='create',
-                description=f'Creó el usuario {user.username}',
-                module='users'
-            )
+            log_activity(request.user, 'create', 'Creó el usuario {username}', 'users', username=user.username)
             
             return Response(UserManagementSerializer(user).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -149,13 +160,7 @@ class UserManagementDetailView(APIView):
             serializer.save()
             
             # Registrar actividad
-            UserActivity.objects.create(
-                user=request.user,
-                tenant=request.user.tenant,
-                action='update',
-                description=f'Actualizó el usuario {user.username}',
-                module='users'
-            )
+            log_activity(request.user, 'update', 'Actualizó el usuario {username}', 'users', username=user.username)
             
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -183,12 +188,9 @@ class UserManagementDetailView(APIView):
         action = 'activó' if user.is_active else 'desactivó'
         
         # Registrar actividad
-        UserActivity.objects.create(
-            user=request.user,
-            tenant=request.user.tenant,
-            action='update',
-            description=f'{action.capitalize()} el usuario {user.username}',
-            module='users'
+        log_activity(
+            request.user, 'update', '{verb} el usuario {username}', 'users',
+            verb=action.capitalize(), username=user.username
         )
         
         return Response({
@@ -219,16 +221,10 @@ class UserManagementDetailView(APIView):
                           status=status.HTTP_400_BAD_REQUEST)
         
         username = user.username
-        user.delete()
+        user.soft_delete()
         
         # Registrar actividad
-        UserActivity.objects.create(
-            user=request.user,
-            tenant=request.user.tenant,
-            action='delete',
-            description=f'Eliminó el usuario {username}',
-            module='users'
-        )
+        log_activity(request.user, 'delete', 'Eliminó el usuario {username}', 'users', username=username)
         
         return Response({'message': f'Usuario {username} eliminado correctamente'})
 
@@ -237,6 +233,7 @@ class RolesListView(APIView):
     """Vista para obtener lista de roles disponibles"""
     permission_classes = [permissions.IsAuthenticated]
     
+    @cache_response()
     def get(self, request):
         """Obtener lista de roles disponibles"""
         if not request.user.tenant:
@@ -266,6 +263,7 @@ class RolePermissionsView(APIView):
     """Vista para gestión de permisos por rol"""
     permission_classes = [permissions.IsAuthenticated]
     
+    @cache_response(depends_on=[RolePermission])
     def get(self, request, role=None):
         """Obtener permisos de un rol específico o todos los roles"""
         if not request.user.tenant:
@@ -277,17 +275,16 @@ class RolePermissionsView(APIView):
             return Response({'error': 'Sin permisos para ver permisos'}, 
                           status=status.HTTP_403_FORBIDDEN)
         
+        role_permissions = get_cached_role_permissions(request.user.tenant_id)
         if role:
-            try:
-                permission = RolePermission.objects.get(tenant=request.user.tenant, role=role)
-                serializer = RolePermissionSerializer(permission)
-                return Response(serializer.data)
-            except RolePermission.DoesNotExist:
+            permission = role_permissions.get(role)
+            if permission is None:
                 return Response({'error': 'Permisos no encontrados'}, 
                               status=status.HTTP_404_NOT_FOUND)
+            serializer = FastRolePermissionSerializer(permission)
+            return Response(serializer.data)
         else:
-            permissions = RolePermission.objects.filter(tenant=request.user.tenant)
-            serializer = RolePermissionSerializer(permissions, many=True)
+            serializer = FastRolePermissionSerializer(list(role_permissions.values()), many=True)
             return Response(serializer.data)
     
     def put(self, request, role):
@@ -312,13 +309,7 @@ class RolePermissionsView(APIView):
             serializer.save()
             
             # Registrar actividad
-            UserActivity.objects.create(
-                user=request.user,
-                tenant=request.user.tenant,
-                action='config_change',
-                description=f'Actualizó permisos del rol {role}',
-                module='permissions'
-            )
+            log_activity(request.user, 'config_change', 'Actualizó permisos del rol {role}', 'permissions', role=role)
             
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -347,12 +338,10 @@ class RolePermissionsView(APIView):
         permission.save()
         
         # Registrar actividad
-        UserActivity.objects.create(
-            user=request.user,
-            tenant=request.user.tenant,
-            action='config_change',
-            description=f'Restableció permisos por defecto del rol {role}',
-            module='permissions'
+        log_activity(
+            request.user, 'config_change',
+            'Restableció permisos por defecto del rol {role}',
+            'permissions', role=role
         )
         
         serializer = RolePermissionSerializer(permission)
@@ -364,14 +353,18 @@ class TenantsManagementView(APIView):
     """Vista para gestión de tenants (solo super admin)"""
     permission_classes = [permissions.IsAuthenticated]
     
+    @cache_response(depends_on=[Tenant])
     def get(self, request):
         """Obtener lista de todos los tenants"""
         if request.user.role != 'super_admin':
             return Response({'error': 'Solo super admin puede ver tenants'}, 
                           status=status.HTTP_403_FORBIDDEN)
         
-        tenants = Tenant.objects.all()
-        serializer = SuperAdminTenantSerializer(tenants, many=True)
+        fields, exclude = get_sparse_params(request)
+        tenants = SuperAdminTenantSerializer.optimize_queryset(Tenant.objects.all(), fields, exclude)
+        if 'users_count' in select_fields(SuperAdminTenantSerializer.Meta.fields, fields, exclude):
+            tenants = tenants.annotate(users_count=Count('user', filter=Q(user__deleted_at__isnull=True)))
+        serializer = SuperAdminTenantSerializer(tenants, many=True, fields=fields, exclude=exclude)
         return Response(serializer.data)
     
     def post(self, request):
@@ -383,10 +376,92 @@ class TenantsManagementView(APIView):
         serializer = TenantSerializer(data=request.data)
         if serializer.is_valid():
             tenant = serializer.save()
+            seed_tenant_defaults([tenant])
             return Response(SuperAdminTenantSerializer(tenant).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class TenantProvisioningView(APIView):
+    """
+    Alta por lotes de tenants con permisos, configuración y primer admin
+    (solo super admin). Idempotente por slug.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        """Dar de alta un lote de tenants"""
+        if request.user.role != 'super_admin':
+            return Response({'error': 'Solo super admin puede crear tenants'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        items = request.data.get('tenants') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not 0 < len(items) <= MAX_BATCH_SIZE:
+            return Response({'error': f'Envía una lista "tenants" de 1 a {MAX_BATCH_SIZE} elementos'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = TenantProvisionSerializer(data=items, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        passwords = sum(1 for item in serializer.validated_data if item.get('admin', {}).get('password'))
+        if passwords > MAX_PASSWORDS:
+            return Response({'error': f'Como máximo {MAX_PASSWORDS} administradores con contraseña por lote; '
+                                      'sin contraseña reciben una invitación'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        try:
+            results = provision_tenants(serializer.validated_data)
+        except ProvisioningError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        created = sum(result['created'] for result in results)
+        log_activity(request.user, 'create', 'Dio de alta {created} tenants por lote', 'tenants', created=created)
+        return Response({
+            'created': created,
+            'existing': len(results) - created,
+            'tenants': results,
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class TenantOffboardingView(APIView):
+    """
+    Baja de un tenant (solo super admin): lo desactiva en el momento y borra
+    sus datos por lotes en segundo plano. ?archive=true guarda antes un ZIP.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request, tenant_id):
+        """Iniciar (o consultar, si ya está en curso) la baja del tenant"""
+        if request.user.role != 'super_admin':
+            return Response({'error': 'Solo super admin puede dar de baja tenants'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            tenant = Tenant.objects.get(id=tenant_id)
+        except Tenant.DoesNotExist:
+            return Response({'error': 'Tenant no encontrado'}, 
+                          status=status.HTTP_404_NOT_FOUND)
+        
+        archive = str(request.data.get('archive', '')).lower() in ('1', 'true', 'yes')
+        job = start_offboarding(tenant, requested_by=request.user, archive=archive)
+        job.refresh_from_db()
+        return Response(TenantOffboardingSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class TenantOffboardingDetailView(APIView):
+    """Progreso de la baja de un tenant (solo super admin)"""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, job_id):
+        if request.user.role != 'super_admin':
+            return Response({'error': 'Solo super admin puede ver bajas de tenants'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        job = TenantOffboarding.objects.filter(pk=job_id).first()
+        if job is None:
+            return Response({'error': 'Baja no encontrada'}, 
+                          status=status.HTTP_404_NOT_FOUND)
+        return Response(TenantOffboardingSerializer(job).data)
+
+
 class TenantUsersView(APIView):
     """Vista para ver usuarios de un tenant específico (solo super admin)"""
     permission_classes = [permissions.IsAuthenticated]
@@ -404,5 +479,100 @@ class TenantUsersView(APIView):
                           status=status.HTTP_404_NOT_FOUND)
         
         users = User.objects.filter(tenant=tenant)
-        serializer = UserManagementSerializer(users, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        if wants_stream(request):
+            return stream_queryset(
+                users.order_by('id'), FastUserManagementSerializer, context={'request': request}
+            )
+        serializer = FastUserManagementSerializer(users, many=True, context={'request': request})
+        return Response(serializer.data)
+
+
+class ConfigurationSnapshotView(APIView):
+    """
+    Exportar (GET) o importar (POST) el snapshot de configuración del tenant.
+    El super admin indica el tenant con ?tenant_id=; ?prune=true borra lo que
+    no esté en el snapshot y ?dry_run=true solo valida.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_tenant(self, request):
+        if request.user.role == 'super_admin' and request.query_params.get('tenant_id'):
+            try:
+                return get_cached_tenant(int(request.query_params['tenant_id']))
+            except ValueError:
+                return None
+        return request.user.tenant
+    
+    def check_access(self, request):
+        """Devuelve (tenant, respuesta de error)"""
+        if request.user.role not in ['admin', 'super_admin']:
+            return None, Response({'error': 'Sin permisos para gestionar la configuración'}, 
+                                  status=status.HTTP_403_FORBIDDEN)
+        tenant = self.get_tenant(request)
+        if tenant is None:
+            return None, Response({'error': 'Usuario no pertenece a un tenant'}, 
+                                  status=status.HTTP_400_BAD_REQUEST)
+        return tenant, None
+    
+    def get(self, request):
+        """Descargar el snapshot"""
+        tenant, error = self.check_access(request)
+        if error:
+            return error
+        
+        response = Response(build_snapshot(tenant))
+        response['Content-Disposition'] = f'attachment; filename="config-{tenant.slug}.json"'
+        return response
+    
+    def post(self, request):
+        """Aplicar un snapshot en una sola transacción"""
+        tenant, error = self.check_access(request)
+        if error:
+            return error
+        
+        flags = {
+            name: request.query_params.get(name, '').lower() in ('1', 'true', 'yes')
+            for name in ('prune', 'dry_run')
+        }
+        try:
+            summary = apply_snapshot(tenant, request.data, **flags)
+        except SnapshotError as exc:
+            return Response({'error': exc.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not flags['dry_run']:
+            log_activity(
+                request.user, 'config_change',
+                'Importó un snapshot de configuración en {tenant}',
+                'configuration', tenant=tenant.name
+            )
+        return Response(summary)
+
+
+class SyncChangesView(APIView):
+    """
+    Cambios de un recurso (users, permissions, configuration) desde el cursor
+    ?since=; sin since devuelve todo. Ver apps/core/configuration/sync.py.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, resource):
+        feed = FEEDS.get(resource)
+        if feed is None:
+            return Response({'error': 'Recurso no sincronizable'}, 
+                          status=status.HTTP_404_NOT_FOUND)
+        
+        if not request.user.tenant_id:
+            return Response({'error': 'Usuario no pertenece a un tenant'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        if request.user.role not in feed.roles:
+            return Response({'error': 'Sin permisos para sincronizar este recurso'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            data = changes(
+                feed, request, since=request.query_params.get('since'), limit=request.query_params.get('limit')
+            )
+        except SyncError as exc:
+            return Response({'error': exc.args[0]}, status=exc.args[1])
+        return Response(data)
@@ -0,0 +1,252 @@
+"""
+Migraciones de datos por lotes del Core App - Arte Ideas
+
+Un RunPython dentro de una migración de esquema reescribe toda la tabla en
+una sola transacción: con millones de filas (User, UserActivity) bloquea la
+tabla y el despliegue durante minutos. Los cambios de datos de tablas
+grandes se registran aquí y se ejecutan aparte, con el tráfico en marcha:
+
+    @data_migration('core.UserActivity')
+    def activity_module(queryset):
+        return queryset.filter(module='', action='export').update(module='exports')
+
+La función recibe las filas de un rango de pks (pk__gt, pk__lte) y devuelve
+las filas que cambió. El rango se recorre de menor a mayor pk en lotes de
+BATCH_SIZE filas; cada lote es una transacción corta que guarda también el
+punto de control en DataMigrationRun, y entre lote y lote se duerme SLEEP
+segundos para no saturar la BD. Si el proceso se corta, la siguiente
+ejecución sigue desde el último lote confirmado.
+
+El pk final se fija al empezar: las filas nuevas ya deben escribirse con el
+formato nuevo desde el código de la aplicación. La función tiene que ser
+idempotente (un lote puede repetirse si se pierde el lock).
+
+    python manage.py run_data_migration activity_module --dry-run
+    python manage.py run_data_migration activity_module
+"""
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 1000,     # Filas por lote
+    'SLEEP': 0.1,           # Segundos de pausa entre lotes
+    'LOCK_TTL': 600,        # Segundos sin avanzar antes de considerar abandonado el lock
+    'SAMPLE_BATCHES': 3,    # Lotes de muestra (revertidos) en --dry-run
+}
+
+migrations = {}
+
+
+class DataMigrationError(RuntimeError):
+    """Migración que no puede continuar (p. ej. otro proceso tomó el lock)"""
+
+
+def get_data_migration_settings():
+    return {**DEFAULTS, **getattr(settings, 'CORE_DATA_MIGRATIONS', {})}
+
+
+class DataMigration:
+    """Migración de datos registrada con su modelo"""
+
+    def __init__(self, func, name, model, description=''):
+        self.func = func
+        self.name = name
+        self.model_label = model
+        self.description = description
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def queryset(self):
+        return self.model._base_manager.all()
+
+    def __call__(self, queryset):
+        return self.func(queryset) or 0
+
+
+def data_migration(model, *, name=None):
+    """Registrar una función como migración de datos sobre model ('app.Modelo')"""
+    def decorator(func):
+        migration_name = name or func.__name__
+        migrations[migration_name] = DataMigration(
+            func, migration_name, model, (func.__doc__ or '').strip()
+        )
+        return func
+    return decorator
+
+
+# Estado y lock ---------------------------------------------------------------
+
+def _owner():
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'[-64:]
+
+
+def get_run(name):
+    from .models import DataMigrationRun
+
+    return DataMigrationRun.objects.get_or_create(name=name)[0]
+
+
+def _lock_until():
+    return timezone.now() + timedelta(seconds=get_data_migration_settings()['LOCK_TTL'])
+
+
+def acquire_lock(name, owner):
+    """Tomar el lock de la migración; False si otro proceso la está ejecutando"""
+    from .models import DataMigrationRun
+
+    return DataMigrationRun.objects.filter(name=name).exclude(status='completed').filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=timezone.now())
+    ).update(locked_by=owner, locked_until=_lock_until(), status='running', error='') == 1
+
+
+def _release(name, owner, **fields):
+    from .models import DataMigrationRun
+
+    DataMigrationRun.objects.filter(name=name, locked_by=owner).update(locked_by='', locked_until=None, **fields)
+
+
+def reset(name):
+    """Volver a recorrer la tabla desde el principio"""
+    from .models import DataMigrationRun
+
+    DataMigrationRun.objects.filter(name=name).update(
+        status='pending', last_pk=0, target_pk=None, rows_updated=0, batches=0,
+        elapsed_seconds=0, error='', locked_by='', locked_until=None, started_at=None, finished_at=None,
+    )
+
+
+# Ejecución -------------------------------------------------------------------
+
+def _next_bound(queryset, last_pk, target_pk, batch_size):
+    """Pk donde termina el lote que empieza después de last_pk"""
+    bound = queryset.filter(pk__gt=last_pk, pk__lte=target_pk).order_by('pk').values_list(
+        'pk', flat=True
+    )[batch_size - 1:batch_size].first()
+    return target_pk if bound is None else bound
+
+
+def _batches(migration, run, batch_size):
+    """Rangos (desde, hasta] pendientes, calculados lote a lote"""
+    queryset = migration.queryset()
+    last_pk = run.last_pk
+    while last_pk < run.target_pk:
+        bound = _next_bound(queryset, last_pk, run.target_pk, batch_size)
+        yield last_pk, bound
+        last_pk = bound
+
+
+def _apply(migration, low, high):
+    return migration(migration.queryset().filter(pk__gt=low, pk__lte=high))
+
+
+def run_migration(name, batch_size=None, sleep=None, max_batches=None):
+    """
+    Avanzar la migración como máximo max_batches lotes (todos si es None).
+    Devuelve el DataMigrationRun actualizado, o None si otro proceso tiene
+    el lock o ya estaba completada.
+    """
+    from .models import DataMigrationRun
+
+    migration = migrations[name]
+    config = get_data_migration_settings()
+    batch_size = batch_size or config['BATCH_SIZE']
+    sleep = config['SLEEP'] if sleep is None else sleep
+    owner = _owner()
+
+    get_run(name)
+    if not acquire_lock(name, owner):
+        logger.info('Migración de datos %s omitida: en ejecución o completada', name)
+        return None
+
+    run = DataMigrationRun.objects.get(name=name)
+    if run.target_pk is None:
+        run.target_pk = migration.queryset().aggregate(pk=Max('pk'))['pk'] or 0
+        run.started_at = timezone.now()
+        run.save(update_fields=['target_pk', 'started_at', 'updated_at'])
+
+    done = 0
+    try:
+        for low, high in _batches(migration, run, batch_size):
+            if max_batches is not None and done >= max_batches:
+                _release(name, owner, status='paused')
+                run.refresh_from_db()
+                return run
+            if done:
+                time.sleep(sleep)
+            started = time.monotonic()
+            with transaction.atomic():
+                rows = _apply(migration, low, high)
+                saved = DataMigrationRun.objects.filter(name=name, locked_by=owner).update(
+                    last_pk=high,
+                    rows_updated=run.rows_updated + rows,
+                    batches=run.batches + 1,
+                    elapsed_seconds=run.elapsed_seconds + time.monotonic() - started,
+                    locked_until=_lock_until(),
+                )
+                if not saved:
+                    raise DataMigrationError(f'Se perdió el lock de la migración {name}')
+            run.refresh_from_db()
+            done += 1
+    except Exception as exc:
+        _release(name, owner, status='failed', error=repr(exc))
+        raise
+
+    _release(name, owner, status='completed', finished_at=timezone.now())
+    run.refresh_from_db()
+    return run
+
+
+def estimate(name, batch_size=None, sleep=None, sample_batches=None):
+    """
+    Estimar filas, lotes y duración restantes ejecutando unos lotes de
+    muestra dentro de una transacción que se revierte.
+    """
+    migration = migrations[name]
+    config = get_data_migration_settings()
+    batch_size = batch_size or config['BATCH_SIZE']
+    sleep = config['SLEEP'] if sleep is None else sleep
+    sample_batches = sample_batches or config['SAMPLE_BATCHES']
+
+    run = get_run(name)
+    queryset = migration.queryset()
+    target_pk = run.target_pk
+    if target_pk is None:
+        target_pk = queryset.aggregate(pk=Max('pk'))['pk'] or 0
+    rows = queryset.filter(pk__gt=run.last_pk, pk__lte=target_pk).count()
+    batches = -(-rows // batch_size)
+
+    timings = []
+    changed = 0
+    with transaction.atomic():
+        last_pk = run.last_pk
+        while len(timings) < min(sample_batches, batches):
+            bound = _next_bound(queryset, last_pk, target_pk, batch_size)
+            started = time.monotonic()
+            changed += _apply(migration, last_pk, bound)
+            timings.append(time.monotonic() - started)
+            last_pk = bound
+        transaction.set_rollback(True)
+
+    per_batch = sum(timings) / len(timings) if timings else 0
+    return {
+        'rows': rows,
+        'batches': batches,
+        'sample_batches': len(timings),
+        'sample_changed': changed,
+        'seconds_per_batch': round(per_batch, 4),
+        'estimated_seconds': round(batches * per_batch + max(batches - 1, 0) * sleep, 1),
+    }
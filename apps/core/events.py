@@ -0,0 +1,319 @@
+"""
+Eventos en tiempo real del Core App - Arte Ideas
+
+Broker en proceso que reparte eventos (actividad, notificaciones) a las
+conexiones SSE abiertas en el event loop ASGI, en lugar de que el frontend
+consulte ProfileActivityView periódicamente.
+
+- Canales: `user:<id>` (eventos propios) y `tenant:<id>:admins` (todo lo del
+  tenant, para administradores).
+- Cada suscripción tiene una cola acotada. Si el cliente no consume y la
+  cola se llena se descartan los eventos más antiguos; al superar
+  MAX_DROPPED descartes seguidos la conexión se cierra (backpressure).
+- publish() es thread-safe: se puede llamar desde vistas síncronas o signals
+  y entrega en el loop de cada suscriptor con call_soon_threadsafe.
+- El backend decide cómo llegan los eventos al broker: LocalBackend (mismo
+  proceso) o RedisBackend (pub/sub entre procesos y servidores).
+"""
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BACKEND': 'apps.core.events.LocalBackend',
+    'REDIS_CHANNEL': 'arte_ideas:events',
+    'QUEUE_SIZE': 100,        # Eventos pendientes por conexión
+    'MAX_DROPPED': 50,        # Descartes seguidos antes de cerrar la conexión
+    'REPLAY_SIZE': 50,        # Eventos recientes por canal para Last-Event-ID
+    'HEARTBEAT': 15,          # Segundos entre comentarios de keep-alive
+    'IDLE_TIMEOUT': 300,      # Segundos sin eventos antes de cerrar la conexión
+}
+
+ADMIN_ROLES = ('admin', 'super_admin')
+
+
+def get_events_settings():
+    config = {**DEFAULTS, **getattr(settings, 'CORE_EVENTS', {})}
+    if 'BACKEND' not in getattr(settings, 'CORE_EVENTS', {}) and getattr(settings, 'REDIS_URL', None):
+        config['BACKEND'] = 'apps.core.events.RedisBackend'
+    return config
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+def tenant_admins_channel(tenant_id):
+    return f'tenant:{tenant_id}:admins'
+
+
+def channels_for_user(user):
+    channels = [user_channel(user.pk)]
+    if user.role in ADMIN_ROLES and user.tenant_id is not None:
+        channels.append(tenant_admins_channel(user.tenant_id))
+    return channels
+
+
+_sequence = itertools.count()
+
+
+class Event:
+    """Evento serializable con id creciente (usado como Last-Event-ID)"""
+
+    __slots__ = ('id', 'type', 'data', 'channels')
+
+    def __init__(self, type, data, channels, id=None):
+        self.id = id if id is not None else f'{time.time_ns()}-{next(_sequence)}'
+        self.type = type
+        self.data = data
+        self.channels = list(channels)
+
+    @property
+    def sort_key(self):
+        timestamp, _, sequence = self.id.partition('-')
+        return int(timestamp), int(sequence or 0)
+
+    def to_json(self):
+        return json.dumps({'id': self.id, 'type': self.type, 'data': self.data, 'channels': self.channels})
+
+    @classmethod
+    def from_json(cls, raw):
+        payload = json.loads(raw)
+        return cls(payload['type'], payload['data'], payload['channels'], id=payload['id'])
+
+    def to_sse(self):
+        """Formato text/event-stream"""
+        from .renderers import dumps
+
+        return b'id: %s\nevent: %s\ndata: %s\n\n' % (
+            self.id.encode(), self.type.encode(), dumps(self.data)
+        )
+
+
+class Subscription:
+    """Cola acotada de una conexión; solo se usa desde su event loop"""
+
+    def __init__(self, broker, channels, loop, queue_size, max_dropped):
+        self.broker = broker
+        self.channels = channels
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.max_dropped = max_dropped
+        self.dropped = 0
+        self.closed = False
+
+    def offer(self, event):
+        """Encolar sin bloquear; si está llena se descarta el evento más antiguo"""
+        if self.closed:
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            if self.dropped > self.max_dropped:
+                logger.info('Conexión de eventos cerrada por backpressure: %s', self.channels)
+                self.close()
+                return
+        else:
+            self.dropped = 0
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        """Siguiente evento o None si pasa `timeout` sin ninguno"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """Registro de suscripciones por canal y reparto de eventos en proceso"""
+
+    def __init__(self, **options):
+        self.config = {**get_events_settings(), **options}
+        self._subscriptions = {}
+        self._replay = {}
+        self._lock = threading.Lock()
+        self._backend = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = import_string(self.config['BACKEND'])(self)
+        return self._backend
+
+    def subscribe(self, channels, last_event_id=None):
+        """Registrar una suscripción en el loop actual (reenvía lo perdido desde last_event_id)"""
+        subscription = Subscription(
+            self, list(channels), asyncio.get_running_loop(),
+            self.config['QUEUE_SIZE'], self.config['MAX_DROPPED']
+        )
+        self.backend.start()
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions.setdefault(channel, set()).add(subscription)
+            missed = self._missed_events(subscription.channels, last_event_id) if last_event_id else []
+        for event in missed:
+            subscription.offer(event)
+        return subscription
+
+    def _missed_events(self, channels, last_event_id):
+        try:
+            since = Event('', None, (), id=last_event_id).sort_key
+        except ValueError:
+            return []
+        events = {}
+        for channel in channels:
+            for event in self._replay.get(channel, ()):
+                if event.sort_key > since:
+                    events[event.id] = event
+        return sorted(events.values(), key=lambda event: event.sort_key)
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[channel]
+
+    def publish(self, type, data, channels):
+        """Publicar un evento (thread-safe) a través del backend configurado"""
+        event = Event(type, data, channels)
+        self.backend.publish(event)
+        return event
+
+    def dispatch(self, event):
+        """
+        Guardar el evento para Last-Event-ID y entregarlo a las suscripciones
+        de este proceso. Se guarda aunque no haya nadie conectado: son justo
+        los eventos que un cliente que se reconecta necesita recuperar.
+        """
+        with self._lock:
+            targets = set()
+            for channel in event.channels:
+                self._replay.setdefault(channel, deque(maxlen=self.config['REPLAY_SIZE'])).append(event)
+                targets.update(self._subscriptions.get(channel, ()))
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # El loop ya se cerró
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len({sub for subs in self._subscriptions.values() for sub in subs})
+
+
+class LocalBackend:
+    """Eventos solo dentro del proceso actual"""
+
+    def __init__(self, broker):
+        self.broker = broker
+
+    def start(self):
+        pass
+
+    def publish(self, event):
+        self.broker.dispatch(event)
+
+
+class RedisBackend:
+    """Pub/sub de Redis para repartir eventos entre procesos y servidores"""
+
+    def __init__(self, broker):
+        import redis
+
+        self.broker = broker
+        self.channel = broker.config['REDIS_CHANNEL']
+        self.client = redis.Redis.from_url(settings.REDIS_URL)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._listen, name='core-events-redis', daemon=True)
+                self._thread.start()
+
+    def publish(self, event):
+        self.client.publish(self.channel, event.to_json())
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        self.broker.dispatch(Event.from_json(message['data']))
+            except Exception:
+                logger.exception('Error escuchando eventos en Redis; reintentando')
+                time.sleep(1)
+
+
+broker = EventBroker()
+
+
+def publish_activity(activity):
+    """Evento 'activity' para el usuario y los administradores del tenant"""
+    from .fast_serializers import FastUserActivitySerializer
+
+    channels = [user_channel(activity.user_id), tenant_admins_channel(activity.tenant_id)]
+    data = FastUserActivitySerializer(activity).data
+    data['user_id'] = activity.user_id
+    return broker.publish('activity', data, channels)
+
+
+def publish_notification(data, user_id=None, tenant_id=None):
+    """Notificación para un usuario y/o para los administradores de un tenant"""
+    channels = []
+    if user_id is not None:
+        channels.append(user_channel(user_id))
+    if tenant_id is not None:
+        channels.append(tenant_admins_channel(tenant_id))
+    if not channels:
+        return None
+    return broker.publish('notification', data, channels)
+
+
+async def event_stream(subscription, heartbeat=None, idle_timeout=None):
+    """
+    Generador SSE: eventos, comentarios de keep-alive y cierre por
+    inactividad o backpressure. Siempre libera la suscripción.
+    """
+    config = subscription.broker.config
+    heartbeat = heartbeat or config['HEARTBEAT']
+    idle_timeout = idle_timeout or config['IDLE_TIMEOUT']
+    last_event = time.monotonic()
+    try:
+        yield b'retry: 5000\n: conectado\n\n'
+        while not subscription.closed:
+            event = await subscription.get(min(heartbeat, idle_timeout))
+            if event is not None:
+                last_event = time.monotonic()
+                yield event.to_sse()
+            elif time.monotonic() - last_event >= idle_timeout:
+                yield b'event: close\ndata: {"reason": "idle"}\n\n'
+                break
+            else:
+                yield b': ping\n\n'
+        else:
+            yield b'event: close\ndata: {"reason": "backpressure"}\n\n'
+    finally:
+        subscription.close()
@@ -0,0 +1,3 @@
+"""
+Exportaciones del Core App - Arte Ideas
+"""
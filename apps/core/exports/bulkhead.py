@@ -0,0 +1,191 @@
+"""
+Bulkheads para exportaciones pesadas del Core App - Arte Ideas
+
+Un ExportJob nuevo queda 'pending' hasta que el despachador le asigna un
+slot. Hay un tope global (GLOBAL_SLOTS) y uno por tenant según su tier
+(Tenant.location_type), así que un estudio que lanza decenas de
+exportaciones no deja sin workers a los demás.
+
+El reparto entre tenants es un round-robin ponderado: el siguiente slot va
+al tenant con menos trabajos en ejecución por unidad de peso (a igualdad,
+el que espera desde antes). El despachador corre bajo el lock del trabajo
+periódico dispatch_export_jobs (apps/core/jobs.py); se lanza al crear y al
+terminar cada exportación, y una vez por minuto como respaldo.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.core.metrics import percentile
+
+DEFAULTS = {
+    'GLOBAL_SLOTS': 4,        # Exportaciones simultáneas en todo el sistema
+    'TIERS': {                # Por Tenant.location_type: slots propios y peso en el reparto
+        'lima': {'slots': 2, 'weight': 2},
+        'provincia': {'slots': 1, 'weight': 1},
+    },
+    'DEFAULT_TIER': {'slots': 1, 'weight': 1},
+    'STALE_AFTER': 60 * 60,   # Segundos tras los que un trabajo en ejecución se da por perdido
+    'MAX_SCAN': 1000,         # Trabajos pendientes considerados por pasada
+}
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+
+def get_bulkhead_settings():
+    return {**DEFAULTS, **getattr(settings, 'EXPORT_SETTINGS', {}).get('BULKHEAD', {})}
+
+
+def get_tier(config, location_type):
+    return {**config['DEFAULT_TIER'], **config['TIERS'].get(location_type, {})}
+
+
+def _running_by_tenant():
+    from apps.core.models import ExportJob
+
+    return dict(
+        ExportJob.objects.filter(status='running')
+        .values_list('tenant_id').annotate(count=Count('id')).order_by()
+    )
+
+
+def _pending_queues(config):
+    """Trabajos pendientes por tenant en orden de llegada, con su tier"""
+    from apps.core.models import ExportJob
+
+    queues = {}
+    tiers = {}
+    rows = (
+        ExportJob.objects.filter(status='pending')
+        .order_by('created_at', 'pk')
+        .values_list('pk', 'tenant_id', 'tenant__location_type', 'created_at')[:config['MAX_SCAN']]
+    )
+    for pk, tenant_id, location_type, created_at in rows:
+        queues.setdefault(tenant_id, []).append((pk, created_at))
+        tiers[tenant_id] = get_tier(config, location_type)
+    return queues, tiers
+
+
+def reclaim_stale(config, now):
+    """Liberar los slots de trabajos que llevan demasiado tiempo en ejecución"""
+    from apps.core.models import ExportJob
+
+    return ExportJob.objects.filter(
+        status='running', started_at__lt=now - timedelta(seconds=config['STALE_AFTER'])
+    ).update(status='failed', error='Tiempo de ejecución excedido', finished_at=now)
+
+
+def dispatch():
+    """
+    Asignar slots libres a trabajos pendientes y enviarlos a la cola
+    'exports'. Debe ejecutarse bajo el lock de dispatch_export_jobs.
+    """
+    from apps.core.models import ExportJob
+    from apps.core.tasks import run_export_job
+
+    config = get_bulkhead_settings()
+    now = timezone.now()
+    reclaimed = reclaim_stale(config, now)
+    running = _running_by_tenant()
+    total_running = sum(running.values())
+    queues, tiers = _pending_queues(config)
+
+    started = []
+    while total_running < config['GLOBAL_SLOTS']:
+        eligible = [
+            tenant_id for tenant_id, queue in queues.items()
+            if queue and running.get(tenant_id, 0) < tiers[tenant_id]['slots']
+        ]
+        if not eligible:
+            break
+        tenant_id = min(eligible, key=lambda tenant_id: (
+            running.get(tenant_id, 0) / tiers[tenant_id]['weight'], queues[tenant_id][0][1]
+        ))
+        pk, _ = queues[tenant_id].pop(0)
+        # UPDATE condicional: el trabajo pudo cancelarse o tomarse entre tanto
+        if ExportJob.objects.filter(pk=pk, status='pending').update(status='running', started_at=now):
+            running[tenant_id] = running.get(tenant_id, 0) + 1
+            total_running += 1
+            started.append(pk)
+
+    for pk in started:
+        run_export_job.delay(pk)
+    return {
+        'started': len(started),
+        'reclaimed': reclaimed,
+        'running': total_running,
+        'pending': sum(len(queue) for queue in queues.values()),
+        'utilisation': round(total_running / config['GLOBAL_SLOTS'], 2),
+    }
+
+
+def queue_positions():
+    """
+    Posición estimada de cada trabajo pendiente: el orden en que el
+    despachador los tomaría si no terminara ninguno de los actuales.
+    """
+    config = get_bulkhead_settings()
+    running = _running_by_tenant()
+    queues, tiers = _pending_queues(config)
+    order = sorted(
+        ((running.get(tenant_id, 0) + index) / tiers[tenant_id]['weight'], created_at, pk)
+        for tenant_id, queue in queues.items()
+        for index, (pk, created_at) in enumerate(queue)
+    )
+    return {pk: position for position, (_, _, pk) in enumerate(order, start=1)}
+
+
+def bulkhead_metrics(window=3600):
+    """Uso de slots y tiempos de espera/ejecución en la última ventana (segundos)"""
+    from apps.core.models import ExportJob
+
+    config = get_bulkhead_settings()
+    now = timezone.now()
+    since = now - timedelta(seconds=window)
+
+    per_tenant = {}
+    active = (
+        ExportJob.objects.filter(status__in=ACTIVE_STATUSES)
+        .values_list('tenant_id', 'tenant__name', 'status').annotate(count=Count('id')).order_by()
+    )
+    for tenant_id, tenant_name, status, count in active:
+        entry = per_tenant.setdefault(tenant_id, {'tenant_id': tenant_id, 'tenant': tenant_name,
+                                                  'running': 0, 'pending': 0})
+        entry[status] = count
+    running = sum(entry['running'] for entry in per_tenant.values())
+
+    waits = []
+    durations = []
+    busy_seconds = 0.0
+    recent = ExportJob.objects.filter(started_at__isnull=False).exclude(finished_at__lt=since).values_list(
+        'created_at', 'started_at', 'finished_at'
+    )
+    for created_at, started_at, finished_at in recent.iterator():
+        if started_at >= since:
+            waits.append((started_at - created_at).total_seconds())
+        if finished_at is not None and finished_at >= since:
+            durations.append((finished_at - started_at).total_seconds())
+        busy_seconds += max(0.0, ((finished_at or now) - max(started_at, since)).total_seconds())
+
+    def summary(values):
+        return {
+            'count': len(values),
+            'p50': round(percentile(values, 50), 3),
+            'p95': round(percentile(values, 95), 3),
+            'max': round(max(values), 3) if values else 0.0,
+        }
+
+    return {
+        'window_seconds': window,
+        'slots': {
+            'global': config['GLOBAL_SLOTS'],
+            'running': running,
+            'utilisation': round(running / config['GLOBAL_SLOTS'], 2),
+            'utilisation_window': round(busy_seconds / (config['GLOBAL_SLOTS'] * window), 3),
+        },
+        'wait_seconds': summary(waits),
+        'run_seconds': summary(durations),
+        'tenants': sorted(per_tenant.values(), key=lambda entry: (-entry['pending'], -entry['running'])),
+    }
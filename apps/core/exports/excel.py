@@ -0,0 +1,122 @@
+"""
+Exportación Excel en segundo plano del Core App - Arte Ideas
+
+El libro se escribe con xlsxwriter en modo constant_memory: cada fila se
+vuelca a disco al pasar a la siguiente, así que la memoria no depende del
+tamaño. Las filas se leen con las mismas exportaciones declaradas para CSV
+(apps/core/exports/streaming.py) y el progreso se guarda en ExportJob por
+bloques para que el cliente lo consulte.
+"""
+import logging
+import os
+import tempfile
+from datetime import timedelta
+
+import xlsxwriter
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from .streaming import EXPORTS
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'CHUNK_SIZE': 2000,      # Filas entre actualizaciones de progreso
+    'MAX_ROWS': None,        # Límite opcional de filas por exportación
+    'RETENTION_DAYS': 7,     # Días que el archivo queda disponible
+}
+
+# Filas por hoja en Excel (incluida la cabecera); al llenarse se abre otra hoja
+SHEET_MAX_ROWS = 1048576
+
+
+def get_excel_settings():
+    export_settings = getattr(settings, 'EXPORT_SETTINGS', {})
+    config = {**DEFAULTS, **export_settings.get('EXCEL', {})}
+    config['RETENTION_DAYS'] = export_settings.get('STORAGE', {}).get('RETENTION_DAYS', config['RETENTION_DAYS'])
+    return config
+
+
+def write_workbook(path, title, headers, rows, on_progress=None, chunk_size=2000):
+    """Escribir las filas en un .xlsx con memoria constante; devuelve el total"""
+    workbook = xlsxwriter.Workbook(path, {
+        'constant_memory': True,
+        'strings_to_urls': False,
+        'strings_to_formulas': False,
+    })
+    header_format = workbook.add_format({'bold': True})
+
+    def add_sheet(number):
+        sheet = workbook.add_worksheet(title[:31] if number == 1 else f'{title[:25]} ({number})')
+        sheet.write_row(0, 0, headers, header_format)
+        sheet.freeze_panes(1, 0)
+        return sheet
+
+    written = 0
+    sheets = 1
+    sheet = add_sheet(sheets)
+    sheet_row = 1
+    try:
+        for row in rows:
+            if sheet_row >= SHEET_MAX_ROWS:
+                sheets += 1
+                sheet = add_sheet(sheets)
+                sheet_row = 1
+            sheet.write_row(sheet_row, 0, row)
+            sheet_row += 1
+            written += 1
+            if on_progress and written % chunk_size == 0:
+                on_progress(written)
+    finally:
+        workbook.close()
+    return written
+
+
+def run_export(job):
+    """Generar el archivo de un ExportJob y dejarlo listo para descargar"""
+    from apps.core.models import ExportJob
+
+    config = get_excel_settings()
+    export = EXPORTS[job.export_type](job.user, job.tenant)
+    queryset = export.get_queryset()
+    total = queryset.count()
+    if config['MAX_ROWS']:
+        total = min(total, config['MAX_ROWS'])
+    # El despachador (bulkhead.py) ya marcó el trabajo como 'running' al darle slot
+    ExportJob.objects.filter(pk=job.pk).update(total_rows=total, processed_rows=0)
+
+    def on_progress(processed):
+        ExportJob.objects.filter(pk=job.pk).update(processed_rows=processed)
+
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        written = write_workbook(
+            path,
+            str(job.get_export_type_display()),
+            export.get_headers(),
+            export.iter_rows(config['CHUNK_SIZE'], config['MAX_ROWS']),
+            on_progress=on_progress,
+            chunk_size=config['CHUNK_SIZE'],
+        )
+        with open(path, 'rb') as fh:
+            job.file.save(export.get_filename('xlsx'), File(fh), save=False)
+        now = timezone.now()
+        job.status = 'completed'
+        job.total_rows = job.processed_rows = written
+        job.file_size = job.file.size
+        job.finished_at = now
+        job.expires_at = now + timedelta(days=config['RETENTION_DAYS'])
+        job.save(update_fields=[
+            'status', 'total_rows', 'processed_rows', 'file', 'file_size', 'finished_at', 'expires_at'
+        ])
+    except Exception as exc:
+        logger.exception('Exportación %s falló', job.pk)
+        ExportJob.objects.filter(pk=job.pk).update(
+            status='failed', error=repr(exc), finished_at=timezone.now()
+        )
+        raise
+    finally:
+        os.remove(path)
+    return job
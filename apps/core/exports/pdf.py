@@ -0,0 +1,229 @@
+"""
+Servicio de documentos PDF del Core App - Arte Ideas
+
+    document = render_document('pdf/configuration_report.html', context)
+    document.content, document.content_type, document.etag
+
+- Las plantillas Jinja2 se compilan una vez por proceso (entorno cacheado).
+- El render se hace en un pool de procesos (WORKERS); con 0 se hace en línea,
+  que es lo que conviene con el motor 'html' porque renderizarlo cuesta
+  menos que enviarlo a otro proceso.
+- El resultado se guarda en cache con la clave versión de plantillas + hash
+  del contexto, así que volver a descargar un documento sin cambios no
+  vuelve a renderizarlo. El mismo hash sirve de ETag para responder 304.
+
+El contexto debe ser datos simples (dict, list, str, números) porque viaja
+por pickle a los procesos del pool y se serializa para calcular el hash.
+
+Motores: 'weasyprint' (HTML -> PDF, dependencia opcional) o 'html', que
+devuelve el documento HTML listo para imprimir desde el navegador.
+"""
+import functools
+import hashlib
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import weasyprint
+except ImportError:  # pragma: no cover - dependencia opcional
+    weasyprint = None
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / 'templates'
+
+DEFAULTS = {
+    'ENGINE': None,                  # None: 'weasyprint' si está instalado, si no 'html'
+    'TEMPLATE_DIRS': [str(TEMPLATES_DIR)],
+    'WORKERS': None,                 # Procesos de render; None: 2 con weasyprint, 0 (en línea) con html
+    'CACHE_ALIAS': 'default',
+    'CACHE_TIMEOUT': 60 * 60 * 24,   # Segundos que se guarda un documento renderizado
+    'MAX_CACHED_BYTES': 5 * 1024 * 1024,  # Documentos más grandes no se cachean
+}
+
+CONTENT_TYPES = {
+    'weasyprint': 'application/pdf',
+    'html': 'text/html; charset=utf-8',
+}
+
+EXTENSIONS = {
+    'weasyprint': 'pdf',
+    'html': 'html',
+}
+
+
+def get_pdf_settings():
+    config = {**DEFAULTS, **getattr(settings, 'EXPORT_SETTINGS', {}).get('PDF', {})}
+    if config['ENGINE'] is None:
+        config['ENGINE'] = 'weasyprint' if weasyprint is not None else 'html'
+    if config['ENGINE'] not in CONTENT_TYPES:
+        raise ImproperlyConfigured(f"Motor PDF desconocido: {config['ENGINE']}")
+    if config['ENGINE'] == 'weasyprint' and weasyprint is None:
+        raise ImproperlyConfigured("El motor PDF 'weasyprint' requiere instalar weasyprint")
+    if config['WORKERS'] is None:
+        # Renderizar HTML cuesta menos que enviarlo a otro proceso (bench_pdf.py)
+        config['WORKERS'] = 2 if config['ENGINE'] == 'weasyprint' else 0
+    return config
+
+
+# Plantillas ------------------------------------------------------------------
+
+def _money(value, currency=''):
+    try:
+        amount = f'{float(value):,.2f}'
+    except (TypeError, ValueError):
+        return value
+    return f'{currency} {amount}'.strip()
+
+
+@functools.lru_cache(maxsize=None)
+def get_environment(template_dirs):
+    """Entorno Jinja2 del proceso; las plantillas compiladas quedan en su cache"""
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    environment = Environment(
+        loader=FileSystemLoader(list(template_dirs)),
+        autoescape=select_autoescape(['html']),
+        auto_reload=False,
+        cache_size=-1,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    environment.filters['money'] = _money
+    return environment
+
+
+@functools.lru_cache(maxsize=None)
+def templates_version(template_dirs):
+    """Hash del contenido de todas las plantillas (incluye bases e includes)"""
+    digest = hashlib.sha256()
+    for directory in template_dirs:
+        for path in sorted(Path(directory).rglob('*')):
+            if path.is_file():
+                digest.update(str(path.relative_to(directory)).encode())
+                digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def context_hash(context):
+    payload = json.dumps(context, cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render_template(template_dirs, template_name, context, engine):
+    """Renderizar en el proceso actual (es lo que ejecuta cada worker del pool)"""
+    html = get_environment(tuple(template_dirs)).get_template(template_name).render(context)
+    if engine == 'weasyprint':
+        return weasyprint.HTML(string=html, base_url=str(template_dirs[0])).write_pdf()
+    return html.encode('utf-8')
+
+
+# Pool de procesos ------------------------------------------------------------
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers):
+    """Pool compartido por el proceso; se crea al primer uso"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: no hereda hilos ni conexiones abiertas del proceso web
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+# Servicio --------------------------------------------------------------------
+
+class RenderedDocument:
+    """Documento renderizado (o recuperado de la cache)"""
+
+    def __init__(self, content, engine, etag, cached):
+        self.content = content
+        self.engine = engine
+        self.etag = etag
+        self.cached = cached
+
+    @property
+    def content_type(self):
+        return CONTENT_TYPES[self.engine]
+
+    @property
+    def extension(self):
+        return EXTENSIONS[self.engine]
+
+
+def document_etag(template_name, context, config=None):
+    """ETag del documento: se puede calcular sin renderizar"""
+    config = config or get_pdf_settings()
+    version = templates_version(tuple(config['TEMPLATE_DIRS']))
+    digest = hashlib.sha256(
+        f"{config['ENGINE']}:{template_name}:{version}:{context_hash(context)}".encode()
+    ).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _cache_key(etag):
+    return f'exports:pdf:{etag.strip(chr(34))}'
+
+
+def render_documents(requests):
+    """
+    Renderizar varios documentos [(plantilla, contexto), ...] en paralelo.
+    Los que ya están en cache no se renderizan.
+    """
+    config = get_pdf_settings()
+    cache = caches[config['CACHE_ALIAS']]
+    etags = [document_etag(template_name, context, config) for template_name, context in requests]
+    cached = cache.get_many([_cache_key(etag) for etag in etags])
+
+    documents = [None] * len(requests)
+    pending = []
+    for index, etag in enumerate(etags):
+        content = cached.get(_cache_key(etag))
+        if content is not None:
+            documents[index] = RenderedDocument(content, config['ENGINE'], etag, cached=True)
+        else:
+            pending.append(index)
+    if not pending:
+        return documents
+
+    template_dirs = list(config['TEMPLATE_DIRS'])
+    if config['WORKERS']:
+        pool = get_pool(config['WORKERS'])
+        futures = [
+            pool.submit(render_template, template_dirs, *requests[index], config['ENGINE'])
+            for index in pending
+        ]
+        results = [future.result() for future in futures]
+    else:
+        results = [render_template(template_dirs, *requests[index], config['ENGINE']) for index in pending]
+
+    to_cache = {}
+    for index, content in zip(pending, results):
+        documents[index] = RenderedDocument(content, config['ENGINE'], etags[index], cached=False)
+        if len(content) <= config['MAX_CACHED_BYTES']:
+            to_cache[_cache_key(etags[index])] = content
+    if to_cache:
+        cache.set_many(to_cache, config['CACHE_TIMEOUT'])
+    return documents
+
+
+def render_document(template_name, context):
+    """Renderizar un documento (o devolverlo de la cache)"""
+    return render_documents([(template_name, context)])[0]
@@ -0,0 +1,48 @@
+"""
+Serializers de exportación del Core App - Arte Ideas
+"""
+from django.urls import reverse
+from rest_framework import serializers
+
+from apps.core.models import ExportJob
+
+from .streaming import EXPORTS
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Serializer para el estado de un trabajo de exportación"""
+    export_type_display = serializers.CharField(source='get_export_type_display', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    progress = serializers.IntegerField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+    queue_position = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'export_type', 'export_type_display', 'format', 'status', 'status_display',
+            'progress', 'total_rows', 'processed_rows', 'file_size', 'error',
+            'created_at', 'started_at', 'finished_at', 'expires_at', 'download_url', 'queue_position'
+        ]
+        read_only_fields = [
+            'id', 'status', 'total_rows', 'processed_rows', 'file_size', 'error',
+            'created_at', 'started_at', 'finished_at', 'expires_at'
+        ]
+    
+    def get_download_url(self, obj):
+        if obj.status != 'completed' or obj.is_expired:
+            return None
+        url = reverse('core:exports:job_download', kwargs={'job_id': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+    
+    def get_queue_position(self, obj):
+        """Posición estimada en la cola de exportaciones (solo si está pendiente)"""
+        if obj.status != 'pending':
+            return None
+        return self.context.get('queue_positions', {}).get(obj.pk)
+    
+    def validate_export_type(self, value):
+        if value not in EXPORTS:
+            raise serializers.ValidationError('Exportación no disponible')
+        return value
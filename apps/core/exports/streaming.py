@@ -0,0 +1,250 @@
+"""
+Exportación CSV en streaming del Módulo Configuración - Arte Ideas
+
+Cada exportación declara sus columnas como (cabecera, campo ORM). Las filas
+se leen con values_list(...).iterator(chunk_size) y se escriben a CSV un
+bloque a la vez, así que la memoria no depende del número de filas.
+"""
+import csv
+import io
+import itertools
+from datetime import date, datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import CharField
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from apps.core.models import RolePermission, TenantConfiguration, UserActivity, render_description
+
+User = get_user_model()
+
+DEFAULTS = {
+    'ENCODING': 'utf-8',
+    'DELIMITER': ',',
+    'CHUNK_SIZE': 2000,   # Filas leídas y escritas por bloque
+    'MAX_ROWS': None,     # Límite opcional de filas por exportación
+}
+
+# Prefijos que una hoja de cálculo interpretaría como fórmula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def get_csv_settings():
+    return {**DEFAULTS, **getattr(settings, 'EXPORT_SETTINGS', {}).get('CSV', {})}
+
+
+def format_value(value):
+    """Valor de celda: fechas en ISO local, booleanos true/false, sin fórmulas"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(header, rows, chunk_size, delimiter=',', encoding='utf-8'):
+    """Codificar filas como CSV, un bloque de chunk_size filas por vez"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter)
+    # BOM para que Excel detecte UTF-8
+    if encoding.lower().replace('-', '') == 'utf8':
+        buffer.write('\ufeff')
+    writer.writerow(header)
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if chunk:
+            writer.writerows(chunk)
+        yield buffer.getvalue().encode(encoding, errors='replace')
+        if not chunk:
+            return
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
+class CSVExport:
+    """
+    Exportación declarativa: columns es una lista de (cabecera, campo ORM).
+    Con choice_labels los campos con choices se exportan con su etiqueta;
+    los backups los dejan como código para poder restaurarlos.
+    """
+    name = ''
+    model = None
+    columns = ()
+    ordering = ('pk',)
+    choice_labels = True
+    
+    def __init__(self, user, tenant):
+        self.user = user
+        self.tenant = tenant
+    
+    def get_queryset(self):
+        return self.model._default_manager.filter(tenant=self.tenant)
+    
+    def _resolve_field(self, path):
+        model = self.model
+        field = None
+        for part in path.split(LOOKUP_SEP):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return None
+            model = field.related_model
+        return field
+    
+    def get_converters(self):
+        """Funciones por columna (choices -> etiqueta, resto -> format_value)"""
+        converters = []
+        for _, path in self.columns:
+            field = self._resolve_field(path)
+            if self.choice_labels and field is not None and field.choices:
+                labels = {key: str(label) for key, label in field.flatchoices}
+                converters.append(lambda value, labels=labels: labels.get(value, format_value(value)))
+            else:
+                converters.append(format_value)
+        return converters
+    
+    def get_headers(self):
+        return [header for header, _ in self.columns]
+    
+    def get_rows_queryset(self):
+        return self.get_queryset().order_by(*self.ordering).values_list(
+            *(path for _, path in self.columns)
+        )
+    
+    def iter_rows(self, chunk_size, max_rows=None):
+        converters = self.get_converters()
+        queryset = self.get_rows_queryset()
+        if max_rows:
+            queryset = queryset[:max_rows]
+        for row in queryset.iterator(chunk_size=chunk_size):
+            yield [convert(value) for convert, value in zip(converters, row)]
+    
+    def get_filename(self, extension='csv'):
+        timestamp = timezone.localtime().strftime('%Y%m%d_%H%M%S')
+        return f'{self.name}_{self.tenant.slug}_{timestamp}.{extension}'
+    
+    def response(self):
+        config = get_csv_settings()
+        chunk_size = config['CHUNK_SIZE']
+        content = iter_csv(
+            self.get_headers(),
+            self.iter_rows(chunk_size, config['MAX_ROWS']),
+            chunk_size,
+            delimiter=config['DELIMITER'],
+            encoding=config['ENCODING'],
+        )
+        response = StreamingHttpResponse(content, content_type=f"text/csv; charset={config['ENCODING']}")
+        response['Content-Disposition'] = f'attachment; filename="{self.get_filename()}"'
+        return response
+
+
+class UsersExport(CSVExport):
+    """Usuarios del tenant"""
+    name = 'usuarios'
+    model = User
+    columns = (
+        ('id', 'id'),
+        ('usuario', 'username'),
+        ('email', 'email'),
+        ('nombres', 'first_name'),
+        ('apellidos', 'last_name'),
+        ('telefono', 'phone'),
+        ('rol', 'role'),
+        ('activo', 'is_active'),
+        ('fecha_registro', 'date_joined'),
+        ('ultimo_acceso', 'last_login'),
+    )
+
+
+class ActivityExport(CSVExport):
+    """Actividad del tenant (o solo la propia para roles sin administración)"""
+    name = 'actividad'
+    model = UserActivity
+    columns = (
+        ('id', 'id'),
+        ('usuario', 'user__username'),
+        ('accion', 'action'),
+        ('modulo', 'module_name'),
+        ('descripcion', 'description'),
+        ('ip', 'ip_address'),
+        ('fecha', 'created_at'),
+    )
+    
+    def get_queryset(self):
+        queryset = super().get_queryset().annotate(
+            module_name=Coalesce('module_ref__value', 'module', output_field=CharField())
+        )
+        if self.user.role not in ['admin', 'super_admin']:
+            queryset = queryset.filter(user=self.user)
+        return queryset
+    
+    def iter_rows(self, chunk_size, max_rows=None):
+        # La descripción de las filas compactas se arma con su plantilla
+        converters = self.get_converters()
+        description = [path for _, path in self.columns].index('description')
+        queryset = self.get_rows_queryset().values_list(
+            *(path for _, path in self.columns), 'template__value', 'params'
+        )
+        if max_rows:
+            queryset = queryset[:max_rows]
+        for *row, template, params in queryset.iterator(chunk_size=chunk_size):
+            if template is not None:
+                row[description] = render_description(template, params)
+            yield [convert(value) for convert, value in zip(converters, row)]
+
+
+class ConfigurationExport(CSVExport):
+    """Backup de la configuración del tenant"""
+    name = 'configuracion'
+    model = TenantConfiguration
+    ordering = ('module', 'key')
+    choice_labels = False
+    columns = (
+        ('modulo', 'module'),
+        ('clave', 'key'),
+        ('valor', 'value'),
+        ('tipo', 'data_type'),
+        ('descripcion', 'description'),
+        ('editable', 'is_editable'),
+        ('actualizado', 'updated_at'),
+    )
+
+
+class PermissionsExport(CSVExport):
+    """Backup de los permisos por rol del tenant"""
+    name = 'permisos'
+    model = RolePermission
+    ordering = ('role',)
+    choice_labels = False
+    
+    @property
+    def columns(self):
+        booleans = [
+            field.name for field in RolePermission._meta.get_fields()
+            if getattr(field, 'get_internal_type', None) and field.get_internal_type() == 'BooleanField'
+        ]
+        return (('rol', 'role'),) + tuple((name, name) for name in booleans) + (('actualizado', 'updated_at'),)
+
+
+# Exportaciones disponibles por código (las usan también los trabajos Excel)
+EXPORTS = {
+    'users': UsersExport,
+    'activity': ActivityExport,
+    'configuration': ConfigurationExport,
+    'permissions': PermissionsExport,
+}
+
+# Exportaciones que cualquier rol puede pedir (el resto requiere admin)
+OPEN_EXPORTS = {'activity'}
@@ -0,0 +1,26 @@
+"""
+URLs de exportación del Core App - Arte Ideas
+"""
+from django.urls import path
+from .views import (
+    ActivityExportView, ConfigurationExportView, PermissionsExportView, UsersExportView,
+    ExportJobsView, ExportJobDetailView, ExportJobDownloadView, ExportJobsMetricsView,
+    ConfigurationPDFView
+)
+
+app_name = 'exports'
+
+urlpatterns = [
+    path('users/csv/', UsersExportView.as_view(), name='users_csv'),                       # GET - Usuarios
+    path('activity/csv/', ActivityExportView.as_view(), name='activity_csv'),              # GET - Actividad
+    path('configuration/csv/', ConfigurationExportView.as_view(), name='configuration_csv'),  # GET - Configuración
+    path('permissions/csv/', PermissionsExportView.as_view(), name='permissions_csv'),     # GET - Permisos
+    path('configuration/pdf/', ConfigurationPDFView.as_view(), name='configuration_pdf'),     # GET - Reporte PDF
+    
+    # Exportaciones Excel en segundo plano
+    path('jobs/list/', ExportJobsView.as_view(), name='jobs_list'),                                  # GET - Mis exportaciones
+    path('jobs/create/', ExportJobsView.as_view(), name='jobs_create'),                              # POST - Encolar
+    path('jobs/metrics/', ExportJobsMetricsView.as_view(), name='jobs_metrics'),                     # GET - Slots y esperas
+    path('jobs/<int:job_id>/view/', ExportJobDetailView.as_view(), name='job_view'),                 # GET - Progreso
+    path('jobs/<int:job_id>/download/', ExportJobDownloadView.as_view(), name='job_download'),       # GET - Descargar
+]
@@ -0,0 +1,218 @@
+"""
+Views de exportación del Core App - Arte Ideas
+"""
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.cache import get_cached_role_permissions, get_cached_tenant, get_cached_tenant_configuration
+from apps.core.configuration.serializers import TenantSerializer
+from apps.core.fast_serializers import MODULE_FIELDS, SENSITIVE_ACTION_FIELDS, FastRolePermissionSerializer
+from apps.core.models import ExportJob, RolePermission
+from apps.core.tasks import log_activity, request_export_dispatch
+
+from .bulkhead import bulkhead_metrics, queue_positions
+from .pdf import document_etag, render_document
+from .serializers import ExportJobSerializer
+from .streaming import OPEN_EXPORTS, ActivityExport, ConfigurationExport, PermissionsExport, UsersExport
+
+
+class CSVExportView(APIView):
+    """
+    Descarga CSV en streaming de una exportación del tenant del usuario.
+    El super admin (sin tenant) indica el tenant con ?tenant_id=.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    export_class = None
+    admin_only = True
+    
+    def get_tenant(self, request):
+        if request.user.role == 'super_admin' and request.query_params.get('tenant_id'):
+            try:
+                return get_cached_tenant(int(request.query_params['tenant_id']))
+            except ValueError:
+                return None
+        return request.user.tenant
+    
+    def get(self, request):
+        if self.admin_only and request.user.role not in ['admin', 'super_admin']:
+            return Response({'error': 'Sin permisos para exportar'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        tenant = self.get_tenant(request)
+        if tenant is None:
+            return Response({'error': 'Usuario no pertenece a un tenant'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        export = self.export_class(request.user, tenant)
+        log_activity(request.user, 'export', 'Exportó {name} (CSV)', 'exports', name=export.name)
+        return export.response()
+
+
+class UsersExportView(CSVExportView):
+    """Exportar usuarios del tenant"""
+    export_class = UsersExport
+
+
+class ActivityExportView(CSVExportView):
+    """Exportar actividad (todos los roles; sin administración solo la propia)"""
+    export_class = ActivityExport
+    admin_only = False
+
+
+class ConfigurationExportView(CSVExportView):
+    """Backup CSV de la configuración del tenant"""
+    export_class = ConfigurationExport
+
+
+class PermissionsExportView(CSVExportView):
+    """Backup CSV de los permisos por rol"""
+    export_class = PermissionsExport
+
+
+def job_context(request, jobs):
+    """Contexto del serializer; la posición en cola solo se calcula si hay pendientes"""
+    context = {'request': request}
+    if any(job.status == 'pending' for job in jobs):
+        context['queue_positions'] = queue_positions()
+    return context
+
+
+class ExportJobsView(APIView):
+    """Trabajos de exportación Excel del usuario"""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """Listar las exportaciones recientes del usuario"""
+        jobs = list(ExportJob.objects.filter(user=request.user)[:20])
+        return Response(ExportJobSerializer(jobs, many=True, context=job_context(request, jobs)).data)
+    
+    def post(self, request):
+        """Encolar una exportación; devuelve el trabajo para consultar el progreso"""
+        if not request.user.tenant:
+            return Response({'error': 'Usuario no pertenece a un tenant'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = ExportJobSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        export_type = serializer.validated_data['export_type']
+        if export_type not in OPEN_EXPORTS and request.user.role not in ['admin', 'super_admin']:
+            return Response({'error': 'Sin permisos para exportar'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        # Una exportación en curso del mismo tipo se reutiliza en vez de duplicarla
+        job = ExportJob.objects.filter(
+            user=request.user, export_type=export_type, status__in=['pending', 'running']
+        ).first()
+        if job is None:
+            job = serializer.save(user=request.user, tenant=request.user.tenant)
+            log_activity(
+                request.user, 'export', 'Solicitó exportación {export_type} (Excel)', 'exports',
+                export_type=export_type
+            )
+            # Entra a la cola; el despachador en segundo plano le da slot si hay libre
+            request_export_dispatch()
+            job.refresh_from_db()
+        return Response(ExportJobSerializer(job, context=job_context(request, [job])).data, 
+                       status=status.HTTP_202_ACCEPTED)
+
+
+class ExportJobDetailView(APIView):
+    """Progreso y descarga de un trabajo de exportación"""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_job(self, request, job_id):
+        return ExportJob.objects.filter(pk=job_id, user=request.user).first()
+    
+    def get(self, request, job_id):
+        """Consultar el estado y el progreso"""
+        job = self.get_job(request, job_id)
+        if job is None:
+            return Response({'error': 'Exportación no encontrada'}, 
+                          status=status.HTTP_404_NOT_FOUND)
+        return Response(ExportJobSerializer(job, context=job_context(request, [job])).data)
+
+
+class ExportJobDownloadView(ExportJobDetailView):
+    """Descargar el archivo de una exportación terminada"""
+    
+    def get(self, request, job_id):
+        job = self.get_job(request, job_id)
+        if job is None:
+            return Response({'error': 'Exportación no encontrada'}, 
+                          status=status.HTTP_404_NOT_FOUND)
+        if job.is_expired:
+            return Response({'error': 'La exportación ha expirado'}, 
+                          status=status.HTTP_410_GONE)
+        if job.status != 'completed':
+            return Response({'error': 'La exportación aún no está lista', 'progress': job.progress}, 
+                          status=status.HTTP_409_CONFLICT)
+        return FileResponse(job.file.open('rb'), as_attachment=True, 
+                          filename=job.file.name.rsplit('/', 1)[-1])
+
+
+class ExportJobsMetricsView(APIView):
+    """Uso de slots y tiempos de espera de las exportaciones (solo super admin)"""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        if request.user.role != 'super_admin':
+            return Response({'error': 'Solo super admin puede ver estas métricas'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        try:
+            window = max(60, min(int(request.query_params.get('window', 3600)), 7 * 24 * 3600))
+        except ValueError:
+            window = 3600
+        return Response(bulkhead_metrics(window))
+
+
+class ConfigurationPDFView(CSVExportView):
+    """
+    Reporte PDF de la configuración del tenant. El ETag depende solo de los
+    datos y de la versión de las plantillas: si no cambiaron se responde 304
+    sin renderizar, y si otro usuario ya lo pidió sale de la cache.
+    """
+    template_name = 'pdf/configuration_report.html'
+    
+    def get_context(self, tenant):
+        permissions = sorted(get_cached_role_permissions(tenant.pk).values(), key=lambda item: item.role)
+        configuration = get_cached_tenant_configuration(tenant.pk)
+        return {
+            'tenant': dict(TenantSerializer(tenant).data),
+            'updated_at': tenant.updated_at.isoformat(),
+            'columns': [
+                {'field': field, 'label': str(RolePermission._meta.get_field(field).verbose_name)}
+                for field in MODULE_FIELDS + SENSITIVE_ACTION_FIELDS
+            ],
+            'permissions': [dict(row) for row in FastRolePermissionSerializer(permissions, many=True).data],
+            'configuration': [
+                {'module': module, 'key': key, 'value': str(value)}
+                for module, values in sorted(configuration.items())
+                for key, value in sorted(values.items())
+            ],
+        }
+    
+    def get(self, request):
+        if request.user.role not in ['admin', 'super_admin']:
+            return Response({'error': 'Sin permisos para exportar'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        tenant = self.get_tenant(request)
+        if tenant is None:
+            return Response({'error': 'Usuario no pertenece a un tenant'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        context = self.get_context(tenant)
+        etag = document_etag(self.template_name, context)
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            document = render_document(self.template_name, context)
+            response = HttpResponse(document.content, content_type=document.content_type)
+            response['Content-Disposition'] = f'inline; filename="configuracion_{tenant.slug}.{document.extension}"'
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
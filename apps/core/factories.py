@@ -0,0 +1,77 @@
+"""
+Factories del Core App - Arte Ideas
+Generación de datos realistas con factory-boy y Faker
+"""
+import factory
+from django.contrib.auth import get_user_model
+
+from .models import Tenant, UserProfile, UserActivity
+
+User = get_user_model()
+
+FAKER_LOCALE = 'es_ES'
+
+
+class TenantFactory(factory.django.DjangoModelFactory):
+    """Estudio fotográfico con datos de negocio realistas"""
+
+    class Meta:
+        model = Tenant
+        django_get_or_create = ('slug',)
+
+    name = factory.Faker('company', locale=FAKER_LOCALE)
+    slug = factory.Sequence(lambda n: f'estudio-{n}')
+    description = factory.Faker('catch_phrase', locale=FAKER_LOCALE)
+    business_name = factory.LazyAttribute(lambda o: f'{o.name} SAC'[:200])
+    business_address = factory.Faker('street_address', locale=FAKER_LOCALE)
+    business_phone = factory.Faker('numerify', text='9########')
+    business_email = factory.LazyAttribute(lambda o: f'contacto@{o.slug}.pe')
+    business_ruc = factory.Faker('numerify', text='20#########')
+    currency = 'PEN'
+    location_type = factory.Iterator(['lima', 'provincia'])
+    max_users = 50
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    """Usuario de un estudio (el password debe venir ya hasheado)"""
+
+    class Meta:
+        model = User
+        django_get_or_create = ('username',)
+
+    tenant = factory.SubFactory(TenantFactory)
+    username = factory.Sequence(lambda n: f'usuario{n}')
+    first_name = factory.Faker('first_name', locale=FAKER_LOCALE)
+    last_name = factory.Faker('last_name', locale=FAKER_LOCALE)
+    email = factory.LazyAttribute(lambda o: f'{o.username}@{o.tenant.slug}.pe')
+    phone = factory.Faker('numerify', text='9########')
+    address = factory.Faker('city', locale=FAKER_LOCALE)
+    role = factory.Iterator([code for code, _ in User.ROLE_CHOICES if code != 'super_admin'])
+    is_new_user = False
+    email_verified = True
+
+
+class UserProfileFactory(factory.django.DjangoModelFactory):
+    """Perfil con preferencias por defecto"""
+
+    class Meta:
+        model = UserProfile
+
+    user = factory.SubFactory(UserFactory)
+    language = 'es'
+    theme = factory.Iterator(['light', 'light', 'dark'])
+
+
+class UserActivityFactory(factory.django.DjangoModelFactory):
+    """Registro de actividad de un usuario"""
+
+    class Meta:
+        model = UserActivity
+
+    user = factory.SubFactory(UserFactory)
+    tenant = factory.LazyAttribute(lambda o: o.user.tenant)
+    action = factory.Iterator([code for code, _ in UserActivity.ACTION_CHOICES])
+    description = factory.Faker('sentence', nb_words=5, locale=FAKER_LOCALE)
+    module = factory.Iterator(['auth', 'profile', 'users', 'configuration', 'permissions'])
+    ip_address = factory.Faker('ipv4')
+    user_agent = factory.Faker('user_agent')
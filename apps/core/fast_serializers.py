@@ -0,0 +1,224 @@
+"""
+Serializers de solo lectura rápidos del Core App - Arte Ideas
+
+Replican la salida de un ModelSerializer de referencia sin instanciar
+modelos ni ejecutar un SerializerMethodField por fila:
+
+- Los accesores de cada campo se compilan una vez por clase.
+- Las filas se leen como tuplas de `.values_list()` (o con un attrgetter
+  cuando ya se tienen instancias, p. ej. desde la cache).
+- Los campos derivados se calculan por columnas, una pasada por página.
+- Con `?fields=`/`?exclude=` solo se leen las columnas de los campos pedidos.
+
+Solo sirven para lectura; para validar o escribir se usa el serializer
+de referencia.
+"""
+from datetime import timedelta
+from operator import attrgetter
+
+from django.db.models.query import QuerySet
+from django.utils import timezone
+from django.utils.encoding import force_str
+from rest_framework import fields as drf_fields
+from rest_framework.settings import api_settings
+
+from apps.core.configuration.serializers import RolePermissionSerializer, UserManagementSerializer
+from apps.core.models import ActivityModule, ActivityTemplate, render_description
+from apps.core.profile.serializers import UserActivitySerializer
+from apps.core.serializers import get_sparse_params, select_fields
+
+# Campos cuya representación es el propio valor leído de la base de datos
+IDENTITY_FIELDS = (
+    drf_fields.CharField, drf_fields.BooleanField, drf_fields.IntegerField, drf_fields.ChoiceField,
+)
+
+
+class FastReadSerializer:
+    """
+    Base de los serializers de lectura.
+
+    reference       ModelSerializer cuya salida (campos y orden) se replica.
+    display_fields  {'role_display': 'role'}: texto de las choices de la columna.
+    derived_fields  {'status_display': ('is_active',)}: se calculan con
+                    derive_<nombre>(columnas) y devuelven una lista por página.
+    """
+    reference = None
+    display_fields = {}
+    derived_fields = {}
+
+    def __init__(self, instance=None, many=False, context=None, fields=None, exclude=None):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+        if fields is None and exclude is None:
+            fields, exclude = get_sparse_params(self.context.get('request'))
+        self.fields = fields
+        self.exclude = exclude
+
+    @classmethod
+    def compile(cls):
+        """Plan de campos con sus columnas de origen y conversores (una vez por clase)"""
+        if '_plan' in cls.__dict__:
+            return cls._plan
+        model = cls.reference.Meta.model
+        plan = []
+        for name, field in cls.reference().fields.items():
+            if field.write_only:
+                continue
+            if name in cls.display_fields:
+                source = cls.display_fields[name]
+                choices = dict(model._meta.get_field(source).flatchoices)
+                plan.append((name, 'display', (source,), choices))
+            elif name in cls.derived_fields:
+                plan.append((name, 'derived', tuple(cls.derived_fields[name]), None))
+            else:
+                converter = None if isinstance(field, IDENTITY_FIELDS) else field
+                plan.append((name, 'value', (field.source,), converter))
+        cls._plan = plan
+        return plan
+
+    def get_plan(self):
+        """Plan recortado por fields/exclude y columnas que hay que leer"""
+        plan = self.compile()
+        if self.fields is not None or self.exclude:
+            keep = set(select_fields([entry[0] for entry in plan], self.fields, self.exclude))
+            plan = [entry for entry in plan if entry[0] in keep]
+        columns = []
+        for _, _, sources, _ in plan:
+            for source in sources:
+                if source not in columns:
+                    columns.append(source)
+        return plan, columns
+
+    def _read_rows(self, columns):
+        source = self.instance
+        if isinstance(source, QuerySet):
+            return list(source.values_list(*columns))
+        if not self.many:
+            source = [source]
+        getter = attrgetter(*columns)
+        if len(columns) == 1:
+            return [(getter(obj),) for obj in source]
+        return [getter(obj) for obj in source]
+
+    def _convert(self, field, values):
+        """Representación DRF de una columna completa"""
+        if isinstance(field, drf_fields.DateTimeField):
+            output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+            field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+            if output_format and output_format.lower() == drf_fields.ISO_8601 and field_timezone is not None:
+                converted = []
+                for value in values:
+                    if not value:
+                        converted.append(None)
+                        continue
+                    if timezone.is_aware(value):
+                        text = value.astimezone(field_timezone).isoformat()
+                    else:
+                        text = timezone.make_aware(value, field_timezone).isoformat()
+                    converted.append(text[:-6] + 'Z' if text.endswith('+00:00') else text)
+                return converted
+        return [None if value is None else field.to_representation(value) for value in values]
+
+    @property
+    def data(self):
+        plan, columns = self.get_plan()
+        # Sin campos pedidos se lee la pk solo para conservar el número de filas
+        columns = columns or ['pk']
+        rows = self._read_rows(columns)
+        column_values = dict(zip(columns, zip(*rows))) if rows else dict.fromkeys(columns, ())
+
+        names = []
+        output_columns = []
+        for name, kind, sources, extra in plan:
+            names.append(name)
+            if kind == 'display':
+                output_columns.append([
+                    None if value is None else force_str(extra.get(value, value))
+                    for value in column_values[sources[0]]
+                ])
+            elif kind == 'derived':
+                output_columns.append(getattr(self, f'derive_{name}')(*(column_values[source] for source in sources)))
+            elif extra is None:
+                output_columns.append(column_values[sources[0]])
+            else:
+                output_columns.append(self._convert(extra, column_values[sources[0]]))
+
+        data = [dict(zip(names, values)) for values in zip(*output_columns)] if rows else []
+        if not self.many:
+            return data[0] if data else {}
+        return data
+
+
+class FastUserManagementSerializer(FastReadSerializer):
+    """Lectura rápida equivalente a UserManagementSerializer"""
+    reference = UserManagementSerializer
+    display_fields = {'role_display': 'role'}
+    derived_fields = {'status_display': ('is_active',)}
+
+    def derive_status_display(self, is_active):
+        return ["Activo" if value else "Inactivo" for value in is_active]
+
+
+class FastUserActivitySerializer(FastReadSerializer):
+    """Lectura rápida equivalente a UserActivitySerializer"""
+    reference = UserActivitySerializer
+    display_fields = {'action_display': 'action'}
+    derived_fields = {
+        'description': ('description', 'template_id', 'params'),
+        'module': ('module', 'module_ref_id'),
+        'time_ago': ('created_at',),
+    }
+
+    def derive_description(self, description, template_id, params):
+        templates = ActivityTemplate.values_for(template_id)
+        return [
+            text if template is None else render_description(templates[template], values)
+            for text, template, values in zip(description, template_id, params)
+        ]
+
+    def derive_module(self, module, module_ref_id):
+        modules = ActivityModule.values_for(module_ref_id)
+        return [name if ref is None else modules[ref] for name, ref in zip(module, module_ref_id)]
+
+    def derive_time_ago(self, created_at):
+        now = timezone.now()
+        result = []
+        for value in created_at:
+            diff = now - value
+            if diff < timedelta(minutes=1):
+                result.append("Hace unos segundos")
+            elif diff < timedelta(hours=1):
+                result.append(f"Hace {diff.seconds // 60} minutos")
+            elif diff < timedelta(days=1):
+                result.append(f"Hace {diff.seconds // 3600} horas")
+            else:
+                result.append(f"Hace {diff.days} días")
+        return result
+
+
+MODULE_FIELDS = (
+    'access_dashboard', 'access_agenda', 'access_pedidos', 'access_clientes',
+    'access_inventario', 'access_activos', 'access_gastos', 'access_produccion',
+    'access_contratos', 'access_reportes',
+)
+SENSITIVE_ACTION_FIELDS = (
+    'view_costos', 'view_precios', 'view_margenes', 'view_datos_clientes',
+    'view_datos_financieros', 'edit_precios', 'delete_registros',
+)
+
+
+class FastRolePermissionSerializer(FastReadSerializer):
+    """Lectura rápida equivalente a RolePermissionSerializer"""
+    reference = RolePermissionSerializer
+    display_fields = {'role_display': 'role'}
+    derived_fields = {
+        'modules_count': MODULE_FIELDS,
+        'sensitive_actions_count': SENSITIVE_ACTION_FIELDS,
+    }
+
+    def derive_modules_count(self, *flags):
+        return [sum(row) for row in zip(*flags)]
+
+    def derive_sensitive_actions_count(self, *flags):
+        return [sum(row) for row in zip(*flags)]
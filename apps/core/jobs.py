@@ -0,0 +1,242 @@
+"""
+Trabajos de mantenimiento del Core App - Arte Ideas
+
+Todos son idempotentes: repetir una ejecución no cambia el resultado, y lo
+que no cabe en MAX_BATCHES lotes queda para la siguiente.
+"""
+from datetime import date, datetime, time as dt_time, timedelta
+
+from django.db import models, transaction
+from django.db.models import CharField, Count
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .scheduler import delete_in_batches, get_job_state, get_scheduler_settings, periodic_job, set_job_state
+
+# Días recalculados como máximo por ejecución del resumen de actividad
+ROLLUP_MAX_DAYS = 31
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, dt_time.min))
+    return start, start + timedelta(days=1)
+
+
+@periodic_job(every=timedelta(hours=1))
+def purge_expired_tokens(batch_size, max_batches):
+    """Borrar refresh tokens caducados (y su entrada en la blacklist)"""
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+    deleted, pending = delete_in_batches(
+        OutstandingToken.objects.filter(expires_at__lt=timezone.now()), batch_size, max_batches
+    )
+    return {'deleted': deleted, 'pending': pending}
+
+
+def rollup_day(day):
+    """Recalcular el resumen de un día (reemplaza el anterior)"""
+    from .models import ActivityDailyRollup, UserActivity
+
+    start, end = _day_bounds(day)
+    rows = (
+        UserActivity.objects.filter(created_at__gte=start, created_at__lt=end)
+        .values('tenant_id', 'action', module_name=Coalesce('module_ref__value', 'module', output_field=CharField()))
+        .annotate(count=Count('id'), users_count=Count('user_id', distinct=True))
+        .order_by()
+    )
+    rollups = [ActivityDailyRollup(day=day, module=row.pop('module_name'), **row) for row in rows]
+    with transaction.atomic():
+        ActivityDailyRollup.objects.filter(day=day).delete()
+        ActivityDailyRollup.objects.bulk_create(rollups)
+    return len(rollups)
+
+
+def _rolled_up_until():
+    """
+    Último día resumido por rollup_user_activity. Se guarda en el estado del
+    trabajo y no se deduce de ActivityDailyRollup: los días sin actividad no
+    escriben filas y el resumen no avanzaría tras una racha de días vacíos.
+    """
+    from .models import ActivityDailyRollup
+
+    day = get_job_state('rollup_user_activity').get('rolled_up_until')
+    if day:
+        return date.fromisoformat(day)
+    return ActivityDailyRollup.objects.order_by('-day').values_list('day', flat=True).first()
+
+
+@periodic_job(every=timedelta(hours=1))
+def rollup_user_activity(batch_size, max_batches):
+    """
+    Resumir la actividad por día desde el último día resumido (que se
+    recalcula por si estaba incompleto) hasta hoy.
+    """
+    from .models import UserActivity
+
+    today = timezone.localdate()
+    last_day = _rolled_up_until()
+    if last_day is None:
+        first_activity = UserActivity.objects.order_by('created_at').values_list('created_at', flat=True).first()
+        if first_activity is None:
+            return {'days': 0, 'rows': 0}
+        last_day = timezone.localdate(first_activity)
+
+    days = rows = 0
+    day = last_day
+    while day <= today and days < ROLLUP_MAX_DAYS:
+        rows += rollup_day(day)
+        days += 1
+        day += timedelta(days=1)
+    until = day - timedelta(days=1)
+    set_job_state('rollup_user_activity', rolled_up_until=until.isoformat())
+    return {'days': days, 'rows': rows, 'until': str(until)}
+
+
+@periodic_job(every=timedelta(days=1))
+def purge_old_activity(batch_size, max_batches):
+    """
+    Borrar la actividad más antigua que ACTIVITY_RETENTION_DAYS, solo de
+    días que ya están resumidos.
+    """
+    from .models import UserActivity
+
+    retention = get_scheduler_settings()['ACTIVITY_RETENTION_DAYS']
+    if retention is None:
+        return {'deleted': 0, 'pending': False}
+    last_day = _rolled_up_until()
+    if last_day is None:
+        return {'deleted': 0, 'pending': False}
+
+    cutoff = min(timezone.now() - timedelta(days=retention), _day_bounds(last_day)[0])
+    deleted, pending = delete_in_batches(
+        UserActivity.objects.filter(created_at__lt=cutoff), batch_size, max_batches
+    )
+    return {'deleted': deleted, 'pending': pending}
+
+
+@periodic_job(every=timedelta(minutes=5))
+def warm_caches(batch_size, max_batches):
+    """Precargar en cache el tenant, permisos y configuración de los tenants activos"""
+    from .cache import get_cached_role_permissions, get_cached_tenant, get_cached_tenant_configuration
+    from .models import Tenant
+
+    tenant_ids = Tenant.objects.filter(is_active=True).order_by('pk').values_list('pk', flat=True)
+    warmed = 0
+    for tenant_id in tenant_ids[:batch_size * max_batches].iterator(chunk_size=batch_size):
+        get_cached_tenant(tenant_id)
+        get_cached_role_permissions(tenant_id)
+        get_cached_tenant_configuration(tenant_id)
+        warmed += 1
+    return {'tenants': warmed}
+
+
+@periodic_job(every=timedelta(hours=1))
+def purge_expired_exports(batch_size, max_batches):
+    """Borrar los archivos de exportaciones vencidas y marcarlas como expiradas"""
+    from .models import ExportJob
+
+    expired = 0
+    for _ in range(max_batches):
+        jobs = list(
+            ExportJob.objects.filter(status='completed', expires_at__lte=timezone.now())
+            .order_by('pk')[:batch_size]
+        )
+        for job in jobs:
+            if job.file:
+                job.file.delete(save=False)
+        ExportJob.objects.filter(pk__in=[job.pk for job in jobs]).update(status='expired', file='', file_size=0)
+        expired += len(jobs)
+        if len(jobs) < batch_size:
+            return {'expired': expired, 'pending': False}
+    return {'expired': expired, 'pending': True}
+
+
+@periodic_job(every=timedelta(minutes=1))
+def dispatch_export_jobs(batch_size, max_batches):
+    """Asignar slots libres a exportaciones pendientes (respaldo del disparo por evento)"""
+    from .exports.bulkhead import dispatch
+
+    return dispatch()
+
+
+def _cascade_relations(model):
+    """Relaciones inversas que se borrarían en cascada al borrar una fila del modelo"""
+    return [
+        relation for relation in model._meta.related_objects
+        if not relation.many_to_many and relation.on_delete is models.CASCADE
+    ]
+
+
+@periodic_job(every=timedelta(hours=1))
+def purge_deleted_users(batch_size, max_batches):
+    """
+    Borrar definitivamente los usuarios eliminados hace más de
+    USER_RETENTION_DAYS. Primero se borran sus datos dependientes por lotes
+    (actividad, perfil, exportaciones...) y solo al final la fila del usuario,
+    cuando su cascada ya está vacía y el DELETE es barato.
+    """
+    from .configuration.sync import tombstones_suppressed
+    from .models import ExportJob, User
+
+    retention = get_scheduler_settings()['USER_RETENTION_DAYS']
+    user_ids = list(
+        User.all_objects.filter(deleted_at__lt=timezone.now() - timedelta(days=retention))
+        .order_by('pk').values_list('pk', flat=True)[:batch_size]
+    )
+    if not user_ids:
+        return {'users': 0, 'rows': 0, 'pending': False}
+
+    # Los archivos de las exportaciones no se borran con la fila
+    for job in ExportJob.objects.filter(user_id__in=user_ids).exclude(file='')[:batch_size * max_batches]:
+        job.file.delete(save=False)
+
+    rows = 0
+    batches_left = max_batches
+    with tombstones_suppressed():
+        for relation in _cascade_relations(User):
+            queryset = relation.related_model._base_manager.filter(**{f'{relation.field.name}__in': user_ids})
+            deleted, pending = delete_in_batches(queryset, batch_size, batches_left)
+            rows += deleted
+            batches_left -= -(-deleted // batch_size)
+            if pending or batches_left <= 0:
+                return {'users': 0, 'rows': rows, 'pending': True}
+
+        User.all_objects.filter(pk__in=user_ids).delete()
+    return {'users': len(user_ids), 'rows': rows, 'pending': len(user_ids) == batch_size}
+
+
+@periodic_job(every=timedelta(minutes=1))
+def run_offboardings(batch_size, max_batches):
+    """Avanzar las bajas de tenants en curso desde su punto de control"""
+    from .configuration.offboarding import ACTIVE_STATUSES, run_offboarding
+    from .models import TenantOffboarding
+
+    batches = completed = 0
+    for job in list(TenantOffboarding.objects.filter(status__in=ACTIVE_STATUSES).order_by('created_at')):
+        if batches >= max_batches:
+            break
+        try:
+            batches += run_offboarding(job, batch_size, max_batches - batches)
+        except Exception as exc:
+            # Sale de la cola para no reintentarse sin fin; offboard_tenant --resume
+            # la reanuda desde su último punto de control
+            TenantOffboarding.objects.filter(pk=job.pk).update(
+                status='failed', error=repr(exc), updated_at=timezone.now()
+            )
+            raise
+        completed += job.status == 'completed'
+    pending = TenantOffboarding.objects.filter(status__in=ACTIVE_STATUSES).exists()
+    return {'batches': batches, 'completed': completed, 'pending': pending}
+
+
+@periodic_job(every=timedelta(days=1))
+def purge_tombstones(batch_size, max_batches):
+    """Borrar las lápidas de sincronización más viejas que TOMBSTONE_RETENTION_DAYS"""
+    from .models import Tombstone
+
+    retention = get_scheduler_settings()['TOMBSTONE_RETENTION_DAYS']
+    deleted, pending = delete_in_batches(
+        Tombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=retention)),
+        batch_size, max_batches
+    )
+    return {'deleted': deleted, 'pending': pending}
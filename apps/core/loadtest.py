@@ -0,0 +1,240 @@
+"""
+Harness de pruebas de carga - Arte Ideas
+Recorridos de usuario concurrentes contra la app ASGI en proceso o un servidor HTTP
+
+No requiere servicios externos: en modo 'asgi' las peticiones se entregan
+directamente a config.asgi.application; con una URL base se usa urllib
+contra un servidor en marcha (runserver, gunicorn, uvicorn...).
+"""
+import asyncio
+import json
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from .metrics import percentile
+
+API_PREFIX = '/api/core'
+
+
+class ASGITransport:
+    """Entrega peticiones HTTP a una aplicación ASGI dentro del proceso"""
+
+    def __init__(self, application=None):
+        if application is None:
+            from config.asgi import application
+        self.application = application
+        self._client_port = 40000
+
+    async def request(self, method, path, body=None, headers=None):
+        payload = json.dumps(body).encode() if body is not None else b''
+        path, _, query = path.partition('?')
+        raw_headers = [(b'host', b'localhost'), (b'content-type', b'application/json'),
+                       (b'content-length', str(len(payload)).encode())]
+        for name, value in (headers or {}).items():
+            raw_headers.append((name.lower().encode(), value.encode()))
+        self._client_port += 1
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': raw_headers,
+            'client': ('127.0.0.1', self._client_port),
+            'server': ('localhost', 80),
+        }
+
+        finished = asyncio.Event()
+        request_sent = False
+        response = {'status': 0, 'body': []}
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {'type': 'http.request', 'body': payload, 'more_body': False}
+            await finished.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+            elif message['type'] == 'http.response.body':
+                response['body'].append(message.get('body', b''))
+                if not message.get('more_body', False):
+                    finished.set()
+
+        await self.application(scope, receive, send)
+        finished.set()
+        return response['status'], b''.join(response['body'])
+
+
+class HTTPTransport:
+    """Envía peticiones a un servidor HTTP real usando urllib en hilos"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _request(self, method, path, body, headers):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method)
+        request.add_header('Content-Type', 'application/json')
+        for name, value in (headers or {}).items():
+            request.add_header(name, value)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+        except (urllib.error.URLError, OSError):
+            return 0, b''
+
+    async def request(self, method, path, body=None, headers=None):
+        return await asyncio.to_thread(self._request, method, path, body, headers)
+
+
+class LoadStats:
+    """Acumula latencias y errores por endpoint"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint, status, elapsed_ms):
+        self.latencies[endpoint].append(elapsed_ms)
+        self.statuses[endpoint][status] += 1
+        if not 200 <= status < 400:
+            self.errors[endpoint] += 1
+
+    def report(self, wall_seconds, meta=None):
+        """Resumen serializable a JSON con percentiles y throughput"""
+        total = sum(len(values) for values in self.latencies.values())
+        endpoints = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            endpoints[endpoint] = {
+                'count': len(values),
+                'errors': self.errors[endpoint],
+                'statuses': {str(code): count for code, count in sorted(self.statuses[endpoint].items())},
+                'mean_ms': round(sum(values) / len(values), 2),
+                'p50_ms': round(percentile(values, 50), 2),
+                'p95_ms': round(percentile(values, 95), 2),
+                'p99_ms': round(percentile(values, 99), 2),
+                'max_ms': round(max(values), 2),
+                'rps': round(len(values) / wall_seconds, 2) if wall_seconds else 0.0,
+            }
+        return {
+            'meta': meta or {},
+            'summary': {
+                'requests': total,
+                'errors': sum(self.errors.values()),
+                'duration_s': round(wall_seconds, 3),
+                'throughput_rps': round(total / wall_seconds, 2) if wall_seconds else 0.0,
+            },
+            'endpoints': endpoints,
+        }
+
+
+class UserJourney:
+    """
+    Recorrido de un usuario virtual:
+    login → perfil/estadísticas/actividad/completitud → configuración (lectura y,
+    si el rol lo permite, actualización idempotente)
+    """
+
+    def __init__(self, transport, stats, username, password, think_time=0.0):
+        self.transport = transport
+        self.stats = stats
+        self.username = username
+        self.password = password
+        self.think_time = think_time
+        self.headers = {}
+
+    async def call(self, method, path, body=None):
+        start = time.perf_counter()
+        status, content = await self.transport.request(method, API_PREFIX + path, body, self.headers)
+        self.stats.record(f'{method} {path}', status, (time.perf_counter() - start) * 1000)
+        if self.think_time:
+            await asyncio.sleep(self.think_time)
+        try:
+            return status, json.loads(content) if content else None
+        except ValueError:
+            return status, None
+
+    async def run(self):
+        status, data = await self.call('POST', '/auth/login/', {
+            'username': self.username, 'password': self.password
+        })
+        if status != 200 or not data:
+            return
+        self.headers = {'Authorization': f"Bearer {data['access']}"}
+
+        status, profile = await self.call('GET', '/profile/view/')
+        await self.call('GET', '/profile/statistics/')
+        await self.call('GET', '/profile/activity/')
+        await self.call('GET', '/profile/completion/')
+
+        status, business = await self.call('GET', '/config/business/view/')
+        if status == 200 and profile and profile.get('role') in ('admin', 'super_admin'):
+            await self.call('PUT', '/config/business/edit/', {
+                'business_name': business['business_name']
+            })
+
+
+async def run_load(transport, credentials, users=10, iterations=1, duration=None,
+                   think_time=0.0, ramp_up=0.0):
+    """
+    Ejecutar `users` usuarios virtuales concurrentes. Cada uno repite el
+    recorrido `iterations` veces, o hasta agotar `duration` segundos si se indica.
+    """
+    stats = LoadStats()
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def virtual_user(index):
+        if ramp_up and users > 1:
+            await asyncio.sleep(ramp_up * index / users)
+        username, password = credentials[index % len(credentials)]
+        completed = 0
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    break
+            elif completed >= iterations:
+                break
+            await UserJourney(transport, stats, username, password, think_time).run()
+            completed += 1
+
+    started_at = datetime.now(dt_timezone.utc).isoformat()
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(i) for i in range(users)))
+    wall_seconds = time.perf_counter() - start
+
+    return stats.report(wall_seconds, meta={
+        'started_at': started_at,
+        'users': users,
+        'iterations': None if duration else iterations,
+        'duration': duration,
+        'think_time': think_time,
+    })
+
+
+def compare_reports(current, previous):
+    """Diferencias de p95 y throughput frente a una ejecución anterior"""
+    rows = []
+    for endpoint, stats in current['endpoints'].items():
+        before = previous.get('endpoints', {}).get(endpoint)
+        if not before:
+            continue
+        delta = stats['p95_ms'] - before['p95_ms']
+        change = (delta / before['p95_ms'] * 100) if before['p95_ms'] else 0.0
+        rows.append((endpoint, before['p95_ms'], stats['p95_ms'], change))
+    before_rps = previous.get('summary', {}).get('throughput_rps', 0)
+    return rows, before_rps, current['summary']['throughput_rps']
@@ -0,0 +1,77 @@
+"""
+Comando para ejecutar pruebas de carga con usuarios virtuales concurrentes
+"""
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.loadtest import ASGITransport, HTTPTransport, run_load, compare_reports
+
+
+class Command(BaseCommand):
+    help = 'Ejecutar el recorrido login → perfil → configuración con usuarios concurrentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', default='asgi',
+                            help="'asgi' para la app en proceso o una URL base (http://localhost:8000)")
+        parser.add_argument('--users', type=int, default=10, help='Usuarios virtuales concurrentes')
+        parser.add_argument('--iterations', type=int, default=5, help='Recorridos por usuario virtual')
+        parser.add_argument('--duration', type=float, default=None,
+                            help='Duración en segundos (reemplaza a --iterations)')
+        parser.add_argument('--think-time', type=float, default=0.0, help='Pausa entre peticiones (s)')
+        parser.add_argument('--ramp-up', type=float, default=0.0, help='Segundos para arrancar todos los usuarios')
+        parser.add_argument('--credentials', action='append', default=[],
+                            help='usuario:contraseña (repetible; por defecto admin_a:admin123)')
+        parser.add_argument('--output', help='Guardar el resultado en JSON')
+        parser.add_argument('--compare', help='JSON de una ejecución anterior para comparar')
+
+    def handle(self, *args, **options):
+        credentials = []
+        for item in options['credentials'] or ['admin_a:admin123']:
+            username, sep, password = item.partition(':')
+            if not sep:
+                raise CommandError(f'Credencial inválida: {item} (formato usuario:contraseña)')
+            credentials.append((username, password))
+
+        if options['target'] == 'asgi':
+            transport = ASGITransport()
+        else:
+            transport = HTTPTransport(options['target'])
+
+        report = asyncio.run(run_load(
+            transport, credentials,
+            users=options['users'],
+            iterations=options['iterations'],
+            duration=options['duration'],
+            think_time=options['think_time'],
+            ramp_up=options['ramp_up'],
+        ))
+        report['meta']['target'] = options['target']
+
+        self.stdout.write(f"{'Endpoint':<36} {'n':>6} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8}")
+        for endpoint, stats in report['endpoints'].items():
+            self.stdout.write(
+                f"{endpoint:<36} {stats['count']:>6} {stats['errors']:>5} "
+                f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['rps']:>8.1f}"
+            )
+        summary = report['summary']
+        self.stdout.write(self.style.SUCCESS(
+            f"\n{summary['requests']} peticiones, {summary['errors']} errores, "
+            f"{summary['throughput_rps']} req/s en {summary['duration_s']}s"
+        ))
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as fh:
+                previous = json.load(fh)
+            rows, before_rps, after_rps = compare_reports(report, previous)
+            self.stdout.write('\nComparación p95 (ms):')
+            for endpoint, before, after, change in rows:
+                style = self.style.ERROR if change > 10 else self.style.SUCCESS
+                self.stdout.write(style(f'{endpoint:<36} {before:>8.1f} → {after:>8.1f} ({change:+.1f}%)'))
+            self.stdout.write(f'Throughput: {before_rps} → {after_rps} req/s')
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(report, fh, indent=2, ensure_ascii=False)
+            self.stdout.write(f"Resultados guardados en {options['output']}")
@@ -0,0 +1,56 @@
+"""
+Comando para dar de baja un tenant borrando sus datos por lotes
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.configuration.offboarding import resume_offboarding, start_offboarding
+from apps.core.models import Tenant, TenantOffboarding
+from apps.core.scheduler import run_job
+
+
+class Command(BaseCommand):
+    help = 'Dar de baja un tenant: lo desactiva y borra sus datos por lotes (reanudable)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug', nargs='?', help='Slug del tenant')
+        parser.add_argument('--archive', action='store_true', help='Guardar un ZIP con los datos antes de borrar')
+        parser.add_argument('--resume', type=int, metavar='ID', help='Reanudar la baja con este id')
+        parser.add_argument('--background', action='store_true',
+                            help='Solo encolar; la completa el trabajo periódico run_offboardings')
+
+    def handle(self, *args, **options):
+        if options['resume']:
+            job = TenantOffboarding.objects.filter(pk=options['resume']).first()
+            if job is None:
+                raise CommandError(f"Baja desconocida: {options['resume']}")
+            resume_offboarding(job)
+        else:
+            try:
+                tenant = Tenant.objects.get(slug=options['slug'])
+            except Tenant.DoesNotExist:
+                raise CommandError(f"Tenant desconocido: {options['slug']}")
+            job = start_offboarding(tenant, archive=options['archive'])
+            job.refresh_from_db()
+            self.stdout.write(f'Baja #{job.pk} de {job.tenant_name}: {len(job.plan)} pasos')
+
+        if options['background']:
+            return
+
+        # Bajo el lock de run_offboardings, igual que el trabajo periódico
+        while job.status != 'completed':
+            try:
+                if run_job('run_offboardings', force=True) is None:
+                    time.sleep(1)
+            except Exception:
+                job.refresh_from_db()
+                if job.status != 'failed':
+                    raise
+            job.refresh_from_db()
+            if job.status == 'failed':
+                raise CommandError(f'La baja #{job.pk} falló: {job.error}. Reanudar con --resume {job.pk}')
+            self.stdout.write(f'{job.progress:>3}% - paso {job.step}/{len(job.plan)}, {job.deleted_rows} filas borradas')
+        if job.archive_file:
+            self.stdout.write(f'Archivo: {job.archive_file.name} ({job.archive_size} bytes)')
+        self.stdout.write(self.style.SUCCESS(f'✓ {job.tenant_name} dado de baja'))
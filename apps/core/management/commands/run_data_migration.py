@@ -0,0 +1,57 @@
+"""
+Comando que ejecuta las migraciones de datos por lotes con el tráfico en marcha
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.data_migrations import estimate, get_run, migrations, reset, run_migration
+
+
+class Command(BaseCommand):
+    help = 'Ejecutar (o estimar) una migración de datos por lotes; se reanuda donde quedó'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', help='Nombre de la migración')
+        parser.add_argument('--list', action='store_true', help='Listar las migraciones y su progreso')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Estimar filas y duración con unos lotes de muestra revertidos')
+        parser.add_argument('--batch-size', type=int, default=None, help='Filas por lote')
+        parser.add_argument('--sleep', type=float, default=None, help='Segundos de pausa entre lotes')
+        parser.add_argument('--max-batches', type=int, default=None, help='Lotes en esta ejecución')
+        parser.add_argument('--reset', action='store_true', help='Empezar de nuevo desde el primer pk')
+
+    def handle(self, *args, **options):
+        if options['list'] or not options['name']:
+            for name, migration in sorted(migrations.items()):
+                run = get_run(name)
+                self.stdout.write(
+                    f'{name:<25} {migration.model_label:<20} {run.get_status_display():<14} '
+                    f'{run.progress:>3}%  {run.rows_updated} filas'
+                )
+            return
+
+        name = options['name']
+        if name not in migrations:
+            raise CommandError(f'Migración de datos desconocida: {name}')
+
+        if options['dry_run']:
+            result = estimate(name, batch_size=options['batch_size'], sleep=options['sleep'])
+            self.stdout.write(
+                f"{name}: {result['rows']} filas en {result['batches']} lotes, "
+                f"~{result['seconds_per_batch']} s por lote "
+                f"({result['sample_changed']} filas cambiadas en {result['sample_batches']} lotes de muestra). "
+                f"Duración estimada: {result['estimated_seconds']} s"
+            )
+            return
+
+        if options['reset']:
+            reset(name)
+        run = run_migration(
+            name, batch_size=options['batch_size'], sleep=options['sleep'], max_batches=options['max_batches']
+        )
+        if run is None:
+            self.stdout.write(self.style.WARNING(f'{name}: en ejecución en otro proceso o ya completada'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'{name}: {run.get_status_display()} ({run.progress}%), {run.rows_updated} filas '
+            f'en {run.batches} lotes, {run.elapsed_seconds:.1f} s de trabajo'
+        ))
@@ -0,0 +1,49 @@
+"""
+Comando que ejecuta los trabajos periódicos sin Celery beat
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from apps.core.scheduler import ensure_jobs, get_scheduler_settings, jobs, run_due_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = 'Ejecutar los trabajos periódicos de mantenimiento en este proceso'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Ejecutar los trabajos pendientes y salir')
+        parser.add_argument('--job', action='append', default=[],
+                            help='Ejecutar ya este trabajo aunque no le toque (repetible)')
+        parser.add_argument('--list', action='store_true', help='Listar los trabajos registrados')
+        parser.add_argument('--tick', type=float, default=None, help='Segundos entre revisiones')
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for name, job in sorted(jobs.items()):
+                self.stdout.write(f'{name:<25} cada {job.every}')
+            return
+
+        ensure_jobs()
+        if options['job']:
+            for name in options['job']:
+                if name not in jobs:
+                    raise CommandError(f'Trabajo desconocido: {name}')
+                self.report(name, run_job(name, force=True))
+            return
+
+        tick = options['tick'] or get_scheduler_settings()['TICK']
+        while True:
+            close_old_connections()
+            for name, result in run_due_jobs().items():
+                self.report(name, result)
+            if options['once']:
+                return
+            time.sleep(tick)
+
+    def report(self, name, result):
+        if result is None:
+            self.stdout.write(self.style.WARNING(f'{name}: omitido o con error'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{name}: {result}'))
@@ -1,17 +1,237 @@
 """
 Comando para crear datos de prueba para tenants A y B
+
+Con --tenants N genera además datos sintéticos a escala para pruebas de
+capacidad: N tenants, --users-per-tenant usuarios por tenant y --activities
+registros de actividad por usuario, insertados con bulk_create por bloques.
 """
+import itertools
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import django
+import factory.random
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
-from apps.core.models import Tenant, RolePermission, TenantConfiguration, UserProfile
+from django.contrib.auth.hashers import make_password
+from django.db import connections
+from django.db.models.sql import InsertQuery
+from django.utils import timezone
+from apps.core.configuration.provisioning import DEFAULT_CONFIGS, seed_tenant_defaults
+from apps.core.factories import TenantFactory, UserFactory, UserActivityFactory
+from apps.core.models import (
+    Tenant, RolePermission, TenantConfiguration, UserProfile, UserActivity, ActivityModule, ActivityTemplate,
+    UserAgent
+)
 
 User = get_user_model()
 
+# Tenants procesados por iteración en el modo sintético
+TENANTS_PER_ITERATION = 100
+
+# Filas de muestra de actividad generadas con Faker para reutilizar
+ACTIVITY_SAMPLE_SIZE = 500
+
+
+def _chunked(iterable, size):
+    """Agrupar un iterable en listas de tamaño fijo sin materializarlo"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _insert_activities(activities):
+    """
+    Insertar actividad respetando el created_at de cada fila. Es un INSERT
+    en modo raw (como loaddata), que no aplica auto_now_add y no modifica
+    el campo del modelo, compartido por todo el proceso.
+    """
+    fields = [field for field in UserActivity._meta.local_concrete_fields if not field.primary_key]
+    connection = connections['default']
+    batch_size = max(connection.ops.bulk_batch_size(fields, activities), 1)
+    for batch in _chunked(activities, batch_size):
+        query = InsertQuery(UserActivity)
+        query.insert_values(fields, batch, raw=True)
+        query.get_compiler(connection=connection).execute_sql()
+
+
+def _init_worker():
+    """Inicializar Django en procesos hijos (necesario con spawn)"""
+    django.setup()
+
+
+def generate_tenant_range(start, stop, options):
+    """
+    Generar los tenants [start, stop) con sus permisos, configuraciones,
+    usuarios, perfiles y actividad. Devuelve el conteo de filas creadas.
+    """
+    seed = options['seed'] + start
+    rng = random.Random(seed)
+    factory.random.reseed_random(seed)
+
+    chunk_size = options['chunk_size']
+    roles = [code for code, _ in RolePermission.ROLE_CHOICES if code != 'super_admin']
+    now = timezone.now()
+    spread_seconds = int(timedelta(days=options['days']).total_seconds())
+    counts = {'tenants': 0, 'users': 0, 'activities': 0}
+
+    # Muestras de actividad generadas una sola vez con la factory
+    sample_tenant = TenantFactory.build()
+    sample_user = UserFactory.build(tenant=sample_tenant)
+    built = UserActivityFactory.build_batch(ACTIVITY_SAMPLE_SIZE, user=sample_user, tenant=sample_tenant)
+    # La actividad se guarda en forma compacta: ids de las tablas de dimensión
+    templates = ActivityTemplate.intern_many(a.description for a in built)
+    modules = ActivityModule.intern_many(a.module for a in built)
+    agents = UserAgent.intern_many(a.user_agent for a in built)
+    samples = [
+        (a.action, templates[a.description], modules[a.module], a.ip_address, agents[a.user_agent])
+        for a in built
+    ]
+
+    for indexes in _chunked(range(start, stop), TENANTS_PER_ITERATION):
+        slugs = [f"{options['prefix']}-{i}" for i in indexes]
+        Tenant.objects.bulk_create(
+            [TenantFactory.build(slug=slug) for slug in slugs],
+            batch_size=chunk_size, ignore_conflicts=True
+        )
+        tenants = list(Tenant.objects.filter(slug__in=slugs))
+        counts['tenants'] += len(tenants)
+
+        seed_tenant_defaults(tenants, batch_size=chunk_size)
+
+        users = (
+            UserFactory.build(
+                tenant=tenant,
+                username=f'{tenant.slug}.{j}',
+                password=options['password_hash'],
+                role=roles[j % len(roles)],
+            )
+            for tenant in tenants
+            for j in range(options['users_per_tenant'])
+        )
+        for chunk in _chunked(users, chunk_size):
+            User.objects.bulk_create(chunk, ignore_conflicts=True)
+
+        user_rows = list(
+            User.objects.filter(tenant__in=tenants).values_list('id', 'tenant_id')
+        )
+        counts['users'] += len(user_rows)
+        for chunk in _chunked((UserProfile(user_id=user_id) for user_id, _ in user_rows), chunk_size):
+            UserProfile.objects.bulk_create(chunk, ignore_conflicts=True)
+
+        activities = (
+            UserActivity(
+                user_id=user_id,
+                tenant_id=tenant_id,
+                action=action,
+                template_id=template_id,
+                module_ref_id=module_ref_id,
+                ip_address=ip_address,
+                agent_id=agent_id,
+                created_at=now - timedelta(seconds=rng.randrange(spread_seconds or 1)),
+            )
+            for user_id, tenant_id in user_rows
+            for action, template_id, module_ref_id, ip_address, agent_id in (
+                rng.choice(samples) for _ in range(options['activities'])
+            )
+        )
+        for chunk in _chunked(activities, chunk_size):
+            _insert_activities(chunk)
+            counts['activities'] += len(chunk)
+
+    return counts
+
+
+def _run_range(args):
+    return generate_tenant_range(*args)
+
 
 class Command(BaseCommand):
     help = 'Crear tenants de prueba A y B con usuarios y configuraciones'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--tenants', type=int, default=0,
+                            help='Generar N tenants sintéticos para pruebas de capacidad')
+        parser.add_argument('--users-per-tenant', type=int, default=10,
+                            help='Usuarios por tenant sintético')
+        parser.add_argument('--activities', type=int, default=0,
+                            help='Registros de UserActivity por usuario sintético')
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Filas por sentencia bulk_create')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Procesos en paralelo (repartidos por rango de tenants)')
+        parser.add_argument('--prefix', default='sintetico',
+                            help='Prefijo del slug de los tenants sintéticos')
+        parser.add_argument('--password', default='user123',
+                            help='Contraseña común de los usuarios sintéticos')
+        parser.add_argument('--days', type=int, default=90,
+                            help='Días hacia atrás en los que se reparte la actividad')
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Semilla para datos reproducibles')
+
     def handle(self, *args, **options):
+        if options['tenants']:
+            self._generate_synthetic_data(options)
+        else:
+            self._create_demo_tenants()
+
+    def _generate_synthetic_data(self, options):
+        """Generar datos sintéticos a escala, opcionalmente en varios procesos"""
+        total = options['tenants']
+        workers = max(1, options['workers'])
+        if workers > 1 and connections['default'].vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                'SQLite no admite escrituras concurrentes: se usará un solo proceso'
+            ))
+            workers = 1
+
+        # Un único hash para todos los usuarios: evita el coste de PBKDF2 por fila
+        worker_options = {
+            'chunk_size': options['chunk_size'],
+            'users_per_tenant': options['users_per_tenant'],
+            'activities': options['activities'],
+            'prefix': options['prefix'],
+            'password_hash': make_password(options['password']),
+            'days': options['days'],
+            'seed': options['seed'],
+        }
+
+        step = -(-total // workers)
+        ranges = [
+            (start, min(start + step, total), worker_options)
+            for start in range(0, total, step)
+        ]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generando {total} tenants en {len(ranges)} proceso(s)...'
+        ))
+        started = time.perf_counter()
+        if len(ranges) == 1:
+            results = [_run_range(ranges[0])]
+        else:
+            connections.close_all()
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+            with ProcessPoolExecutor(max_workers=len(ranges), mp_context=context,
+                                     initializer=_init_worker) as pool:
+                results = list(pool.map(_run_range, ranges))
+        elapsed = time.perf_counter() - started
+
+        totals = {key: sum(result[key] for result in results) for key in results[0]}
+        rate = totals['activities'] / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {totals['tenants']} tenants, {totals['users']} usuarios y "
+            f"{totals['activities']} actividades en {elapsed:.1f}s ({rate:,.0f} actividades/s)"
+        ))
+
+    def _create_demo_tenants(self):
+        """Crear los tenants de demostración A y B"""
         self.stdout.write(self.style.SUCCESS('Creando tenants de prueba...'))
         
         # Crear Tenant A (Lima - Acceso completo)
@@ -183,16 +403,8 @@ class Command(BaseCommand):
                     self.stdout.write(f'✓ Permisos creados para {role} en {tenant.name}')
         
         # Crear configuraciones básicas para cada tenant
-        configs = [
-            ('general', 'company_logo', '', 'string', 'Logo de la empresa'),
-            ('general', 'timezone', 'America/Lima', 'string', 'Zona horaria'),
-            ('general', 'date_format', 'DD/MM/YYYY', 'string', 'Formato de fecha'),
-            ('crm', 'auto_assign_leads', 'true', 'boolean', 'Asignar leads automáticamente'),
-            ('commerce', 'tax_rate', '18', 'float', 'Tasa de impuesto (%)'),
-        ]
-        
         for tenant in [tenant_a, tenant_b]:
-            for module, key, value, data_type, description in configs:
+            for module, key, value, data_type, description in DEFAULT_CONFIGS:
                 config, created = TenantConfiguration.objects.get_or_create(
                     tenant=tenant,
                     module=module,
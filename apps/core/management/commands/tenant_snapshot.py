@@ -0,0 +1,51 @@
+"""
+Comando para exportar o importar el snapshot de configuración de un tenant
+"""
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.core.configuration.snapshot import SnapshotError, apply_snapshot, build_snapshot
+from apps.core.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Exportar o importar la configuración de un tenant (negocio, permisos y parámetros)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['export', 'import'])
+        parser.add_argument('slug', help='Slug del tenant')
+        parser.add_argument('file', nargs='?', default='-', help="Archivo JSON ('-' para stdout/stdin)")
+        parser.add_argument('--prune', action='store_true',
+                            help='Al importar, borrar permisos y parámetros que no estén en el snapshot')
+        parser.add_argument('--dry-run', action='store_true', help='Al importar, solo validar')
+
+    def handle(self, *args, **options):
+        try:
+            tenant = Tenant.objects.get(slug=options['slug'])
+        except Tenant.DoesNotExist:
+            raise CommandError(f"Tenant desconocido: {options['slug']}")
+
+        if options['action'] == 'export':
+            payload = json.dumps(build_snapshot(tenant), cls=DjangoJSONEncoder, ensure_ascii=False, indent=2)
+            if options['file'] == '-':
+                self.stdout.write(payload)
+            else:
+                with open(options['file'], 'w', encoding='utf-8') as handle:
+                    handle.write(payload)
+                self.stdout.write(self.style.SUCCESS(f"Snapshot de {tenant.slug} guardado en {options['file']}"))
+            return
+
+        try:
+            if options['file'] == '-':
+                snapshot = json.load(sys.stdin)
+            else:
+                with open(options['file'], encoding='utf-8') as handle:
+                    snapshot = json.load(handle)
+            summary = apply_snapshot(tenant, snapshot, prune=options['prune'], dry_run=options['dry_run'])
+        except (OSError, json.JSONDecodeError, SnapshotError) as exc:
+            raise CommandError(f'No se pudo importar el snapshot: {exc}')
+        verb = 'validado' if options['dry_run'] else 'aplicado'
+        self.stdout.write(self.style.SUCCESS(f'Snapshot {verb} en {tenant.slug}: {summary}'))
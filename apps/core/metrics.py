@@ -0,0 +1,14 @@
+"""
+Métricas del Core App - Arte Ideas
+Utilidades estadísticas compartidas (harness de carga, métricas de exportación)
+"""
+import math
+
+
+def percentile(values, pct):
+    """Percentil por rango más cercano sobre una lista de valores"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_migrate_user_roles_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Nombre')),
+                ('is_enabled', models.BooleanField(default=True, verbose_name='Habilitado')),
+                ('locked_by', models.CharField(blank=True, max_length=64, verbose_name='Bloqueado por')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Bloqueado hasta')),
+                ('last_status', models.CharField(choices=[('never', 'Sin ejecutar'), ('running', 'En ejecución'), ('success', 'Correcto'), ('failure', 'Error')], default='never', max_length=10, verbose_name='Último estado')),
+                ('last_started_at', models.DateTimeField(blank=True, null=True, verbose_name='Último inicio')),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Último fin')),
+                ('last_duration_ms', models.PositiveIntegerField(blank=True, null=True, verbose_name='Duración (ms)')),
+                ('last_result', models.JSONField(blank=True, default=dict, verbose_name='Último resultado')),
+                ('last_error', models.TextField(blank=True, verbose_name='Último error')),
+                ('run_count', models.PositiveIntegerField(default=0, verbose_name='Ejecuciones')),
+            ],
+            options={
+                'verbose_name': 'Trabajo Programado',
+                'verbose_name_plural': 'Trabajos Programados',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivityDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('action', models.CharField(choices=[('login', 'Inicio de sesión'), ('logout', 'Cierre de sesión'), ('create', 'Crear registro'), ('update', 'Actualizar registro'), ('delete', 'Eliminar registro'), ('export', 'Exportar datos'), ('config_change', 'Cambio de configuración')], max_length=20, verbose_name='Acción')),
+                ('module', models.CharField(blank=True, max_length=50, verbose_name='Módulo')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Cantidad')),
+                ('users_count', models.PositiveIntegerField(default=0, verbose_name='Usuarios distintos')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.tenant', verbose_name='Tenant')),
+            ],
+            options={
+                'verbose_name': 'Resumen Diario de Actividad',
+                'verbose_name_plural': 'Resúmenes Diarios de Actividad',
+                'ordering': ['-day', 'tenant', 'action'],
+                'unique_together': {('tenant', 'day', 'action', 'module')},
+            },
+        ),
+    ]
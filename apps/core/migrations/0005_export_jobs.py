@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_scheduled_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('export_type', models.CharField(choices=[('users', 'Usuarios'), ('activity', 'Actividad'), ('configuration', 'Configuración'), ('permissions', 'Permisos')], max_length=20, verbose_name='Exportación')),
+                ('format', models.CharField(choices=[('xlsx', 'Excel')], default='xlsx', max_length=10, verbose_name='Formato')),
+                ('status', models.CharField(choices=[('pending', 'En cola'), ('running', 'Generando'), ('completed', 'Completado'), ('failed', 'Error'), ('expired', 'Expirado')], default='pending', max_length=10, verbose_name='Estado')),
+                ('total_rows', models.PositiveIntegerField(default=0, verbose_name='Filas totales')),
+                ('processed_rows', models.PositiveIntegerField(default=0, verbose_name='Filas procesadas')),
+                ('file', models.FileField(blank=True, upload_to='exports/%Y/%m/%d/', verbose_name='Archivo')),
+                ('file_size', models.PositiveBigIntegerField(default=0, verbose_name='Tamaño (bytes)')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Inicio')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('expires_at', models.DateTimeField(blank=True, null=True, verbose_name='Expira')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.tenant', verbose_name='Tenant')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de Exportación',
+                'verbose_name_plural': 'Trabajos de Exportación',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='core_export_status_ec2891_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_export_jobs'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exportjob',
+            index=models.Index(fields=['status', 'created_at'], name='core_export_status_2ad959_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_export_jobs_queue_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['-created_at'], name='core_activity_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['tenant', '-created_at'], name='core_activity_tenant_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_user_soft_delete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantOffboarding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tenant_ref', models.IntegerField(verbose_name='Id del tenant')),
+                ('tenant_name', models.CharField(max_length=100, verbose_name='Nombre del tenant')),
+                ('status', models.CharField(choices=[('pending', 'En cola'), ('archiving', 'Archivando'), ('deleting', 'Eliminando'), ('completed', 'Completado'), ('failed', 'Error')], default='pending', max_length=10, verbose_name='Estado')),
+                ('archive', models.BooleanField(default=False, verbose_name='Archivar antes de borrar')),
+                ('archive_file', models.FileField(blank=True, upload_to='offboarding/%Y/%m/%d/', verbose_name='Archivo')),
+                ('archive_size', models.PositiveBigIntegerField(default=0, verbose_name='Tamaño (bytes)')),
+                ('plan', models.JSONField(blank=True, default=list, verbose_name='Plan')),
+                ('step', models.PositiveIntegerField(default=0, verbose_name='Paso')),
+                ('total_rows', models.PositiveBigIntegerField(default=0, verbose_name='Filas totales')),
+                ('deleted_rows', models.PositiveBigIntegerField(default=0, verbose_name='Filas borradas')),
+                ('tables', models.JSONField(blank=True, default=dict, verbose_name='Filas borradas por tabla')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+                ('tenant', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.tenant', verbose_name='Tenant')),
+            ],
+            options={
+                'verbose_name': 'Baja de Tenant',
+                'verbose_name_plural': 'Bajas de Tenants',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_tenant_offboarding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataMigrationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Nombre')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('running', 'En ejecución'), ('paused', 'Pausada'), ('completed', 'Completada'), ('failed', 'Error')], default='pending', max_length=10, verbose_name='Estado')),
+                ('last_pk', models.BigIntegerField(default=0, verbose_name='Último pk procesado')),
+                ('target_pk', models.BigIntegerField(blank=True, null=True, verbose_name='Pk final')),
+                ('rows_updated', models.BigIntegerField(default=0, verbose_name='Filas actualizadas')),
+                ('batches', models.PositiveIntegerField(default=0, verbose_name='Lotes')),
+                ('elapsed_seconds', models.FloatField(default=0, verbose_name='Segundos de trabajo')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('locked_by', models.CharField(blank=True, max_length=64, verbose_name='Bloqueado por')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Bloqueado hasta')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Inicio')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Migración de Datos',
+                'verbose_name_plural': 'Migraciones de Datos',
+                'ordering': ['name'],
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_data_migration_runs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityModule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(editable=False, max_length=40, unique=True, verbose_name='Hash')),
+                ('value', models.TextField(verbose_name='Valor')),
+            ],
+            options={
+                'verbose_name': 'Módulo de Actividad',
+                'verbose_name_plural': 'Módulos de Actividad',
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivityTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(editable=False, max_length=40, unique=True, verbose_name='Hash')),
+                ('value', models.TextField(verbose_name='Valor')),
+            ],
+            options={
+                'verbose_name': 'Plantilla de Actividad',
+                'verbose_name_plural': 'Plantillas de Actividad',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserAgent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(editable=False, max_length=40, unique=True, verbose_name='Hash')),
+                ('value', models.TextField(verbose_name='Valor')),
+            ],
+            options={
+                'verbose_name': 'User Agent',
+                'verbose_name_plural': 'User Agents',
+            },
+        ),
+        migrations.AddField(
+            model_name='useractivity',
+            name='params',
+            field=models.JSONField(blank=True, null=True, verbose_name='Parámetros'),
+        ),
+        migrations.AlterField(
+            model_name='useractivity',
+            name='description',
+            field=models.TextField(blank=True, verbose_name='Descripción'),
+        ),
+        migrations.AddField(
+            model_name='useractivity',
+            name='agent',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.useragent', verbose_name='User Agent (dimensión)'),
+        ),
+        migrations.AddField(
+            model_name='useractivity',
+            name='module_ref',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.activitymodule', verbose_name='Módulo (dimensión)'),
+        ),
+        migrations.AddField(
+            model_name='useractivity',
+            name='template',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.activitytemplate', verbose_name='Plantilla'),
+        ),
+    ]
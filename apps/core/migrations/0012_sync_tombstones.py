@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:36
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_activity_dimensions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, verbose_name='Modelo')),
+                ('tenant_ref', models.BigIntegerField(blank=True, null=True, verbose_name='ID del tenant')),
+                ('object_key', models.JSONField(default=dict, verbose_name='Identificador')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Borrado')),
+            ],
+            options={
+                'verbose_name': 'Lápida de Sincronización',
+                'verbose_name_plural': 'Lápidas de Sincronización',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='rolepermission',
+            index=models.Index(fields=['tenant', 'updated_at'], name='core_roleperm_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenantconfiguration',
+            index=models.Index(fields=['tenant', 'updated_at'], name='core_tenantconf_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['tenant', 'updated_at'], name='core_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['model', 'tenant_ref', 'deleted_at'], name='core_tombstone_feed_idx'),
+        ),
+    ]
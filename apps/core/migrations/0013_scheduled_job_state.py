@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_sync_tombstones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledjob',
+            name='state',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Estado'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_scheduled_job_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenantoffboarding',
+            name='archive_after',
+            field=models.JSONField(blank=True, null=True, verbose_name='Último pk archivado'),
+        ),
+        migrations.AddField(
+            model_name='tenantoffboarding',
+            name='archive_parts',
+            field=models.JSONField(blank=True, default=list, verbose_name='Bloques archivados'),
+        ),
+        migrations.AddField(
+            model_name='tenantoffboarding',
+            name='archive_step',
+            field=models.PositiveIntegerField(default=0, verbose_name='Tabla archivada'),
+        ),
+    ]
@@ -6,4 +6,5 @@ Importación centralizada de todos los modelos
 # Importar todos los modelos para que Django los reconozca
 from .tenant import *
 from .user import *
-from .system import *
\ No newline at end of file
+from .system import *
+from .exports import *
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Modelos de Exportación
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class ExportJob(models.Model):
+    """
+    Exportación Excel generada en segundo plano (apps/core/exports/excel.py)
+    """
+    EXPORT_TYPE_CHOICES = [
+        ('users', 'Usuarios'),
+        ('activity', 'Actividad'),
+        ('configuration', 'Configuración'),
+        ('permissions', 'Permisos'),
+    ]
+    
+    FORMAT_CHOICES = [
+        ('xlsx', 'Excel'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', 'En cola'),
+        ('running', 'Generando'),
+        ('completed', 'Completado'),
+        ('failed', 'Error'),
+        ('expired', 'Expirado'),
+    ]
+    
+    tenant = models.ForeignKey('Tenant', on_delete=models.CASCADE, verbose_name='Tenant')
+    user = models.ForeignKey('User', on_delete=models.CASCADE, verbose_name='Solicitado por')
+    
+    export_type = models.CharField(max_length=20, choices=EXPORT_TYPE_CHOICES, verbose_name='Exportación')
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='xlsx', verbose_name='Formato')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name='Estado')
+    
+    # Progreso
+    total_rows = models.PositiveIntegerField(default=0, verbose_name='Filas totales')
+    processed_rows = models.PositiveIntegerField(default=0, verbose_name='Filas procesadas')
+    
+    # Resultado
+    file = models.FileField(upload_to='exports/%Y/%m/%d/', blank=True, verbose_name='Archivo')
+    file_size = models.PositiveBigIntegerField(default=0, verbose_name='Tamaño (bytes)')
+    error = models.TextField(blank=True, verbose_name='Error')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Inicio')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Fin')
+    expires_at = models.DateTimeField(null=True, blank=True, verbose_name='Expira')
+    
+    class Meta:
+        verbose_name = 'Trabajo de Exportación'
+        verbose_name_plural = 'Trabajos de Exportación'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'expires_at']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_export_type_display()} - {self.get_status_display()} ({self.created_at})"
+    
+    @property
+    def progress(self):
+        """Porcentaje de filas procesadas"""
+        if self.status == 'completed':
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(99, int(self.processed_rows * 100 / self.total_rows))
+    
+    @property
+    def is_expired(self):
+        return self.status == 'expired' or (
+            self.expires_at is not None and self.expires_at <= timezone.now()
+        )
@@ -2,6 +2,7 @@
 Modelos del Sistema (Configuraciones y Permisos)
 """
 from django.db import models
+from django.utils import timezone
 
 
 class SystemConfiguration(models.Model):
@@ -67,6 +68,7 @@ class RolePermission(models.Model):
         verbose_name = 'Permiso de Rol'
         verbose_name_plural = 'Permisos de Roles'
         unique_together = ['tenant', 'role']
+        indexes = [models.Index(fields=['tenant', 'updated_at'], name='core_roleperm_updated_idx')]
     
     def __str__(self):
         return f"{self.tenant.name} - {self.get_role_display()}"
@@ -110,4 +112,113 @@ class RolePermission(models.Model):
             }
         }
         
-        return defaults.get(role, {})
\ No newline at end of file
+        return defaults.get(role, {})
+
+
+class ScheduledJob(models.Model):
+    """
+    Estado de un trabajo periódico de mantenimiento (apps/core/scheduler.py)
+    """
+    STATUS_CHOICES = [
+        ('never', 'Sin ejecutar'),
+        ('running', 'En ejecución'),
+        ('success', 'Correcto'),
+        ('failure', 'Error'),
+    ]
+    
+    name = models.CharField(max_length=100, unique=True, verbose_name='Nombre')
+    is_enabled = models.BooleanField(default=True, verbose_name='Habilitado')
+    
+    # Lock entre workers: se toma con un UPDATE condicional
+    locked_by = models.CharField(max_length=64, blank=True, verbose_name='Bloqueado por')
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name='Bloqueado hasta')
+    
+    # Última ejecución
+    last_status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='never', verbose_name='Último estado')
+    last_started_at = models.DateTimeField(null=True, blank=True, verbose_name='Último inicio')
+    last_finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Último fin')
+    last_duration_ms = models.PositiveIntegerField(null=True, blank=True, verbose_name='Duración (ms)')
+    last_result = models.JSONField(default=dict, blank=True, verbose_name='Último resultado')
+    last_error = models.TextField(blank=True, verbose_name='Último error')
+    run_count = models.PositiveIntegerField(default=0, verbose_name='Ejecuciones')
+    
+    # Estado propio del trabajo entre ejecuciones (p. ej. hasta qué día resumió)
+    state = models.JSONField(default=dict, blank=True, verbose_name='Estado')
+    
+    class Meta:
+        verbose_name = 'Trabajo Programado'
+        verbose_name_plural = 'Trabajos Programados'
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"{self.name} ({self.get_last_status_display()})"
+
+
+class DataMigrationRun(models.Model):
+    """
+    Progreso de una migración de datos por lotes (apps/core/data_migrations.py)
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pendiente'),
+        ('running', 'En ejecución'),
+        ('paused', 'Pausada'),
+        ('completed', 'Completada'),
+        ('failed', 'Error'),
+    ]
+    
+    name = models.CharField(max_length=100, unique=True, verbose_name='Nombre')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name='Estado')
+    
+    # Punto de control: se recorre (last_pk, target_pk] por rangos de pk
+    last_pk = models.BigIntegerField(default=0, verbose_name='Último pk procesado')
+    target_pk = models.BigIntegerField(null=True, blank=True, verbose_name='Pk final')
+    rows_updated = models.BigIntegerField(default=0, verbose_name='Filas actualizadas')
+    batches = models.PositiveIntegerField(default=0, verbose_name='Lotes')
+    elapsed_seconds = models.FloatField(default=0, verbose_name='Segundos de trabajo')
+    error = models.TextField(blank=True, verbose_name='Error')
+    
+    # Lock entre procesos: se toma con un UPDATE condicional
+    locked_by = models.CharField(max_length=64, blank=True, verbose_name='Bloqueado por')
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name='Bloqueado hasta')
+    
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Inicio')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Fin')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Migración de Datos'
+        verbose_name_plural = 'Migraciones de Datos'
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
+    
+    @property
+    def progress(self):
+        """Porcentaje del rango de pks recorrido"""
+        if self.status == 'completed':
+            return 100
+        if not self.target_pk:
+            return 0
+        return min(100, int(self.last_pk * 100 / self.target_pk))
+
+
+class Tombstone(models.Model):
+    """
+    Fila borrada de un recurso sincronizable (usuarios, permisos,
+    configuración), para que la sincronización incremental informe el borrado.
+    Se purga tras TOMBSTONE_RETENTION_DAYS.
+    """
+    model = models.CharField(max_length=100, verbose_name='Modelo')
+    # Sin FK: la lápida sobrevive al borrado del tenant
+    tenant_ref = models.BigIntegerField(null=True, blank=True, verbose_name='ID del tenant')
+    object_key = models.JSONField(default=dict, verbose_name='Identificador')
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name='Borrado')
+    
+    class Meta:
+        verbose_name = 'Lápida de Sincronización'
+        verbose_name_plural = 'Lápidas de Sincronización'
+        indexes = [models.Index(fields=['model', 'tenant_ref', 'deleted_at'], name='core_tombstone_feed_idx')]
+    
+    def __str__(self):
+        return f"{self.model} {self.object_key}"
@@ -1,6 +1,8 @@
 """
 Modelos relacionados con Tenants (Estudios Fotográficos)
 """
+import re
+
 from django.db import models
 
 
@@ -50,6 +52,9 @@ class Tenant(models.Model):
         verbose_name='Tipo de Ubicación'
     )
     
+    # Instancias servidas por la cache (get_cached_tenant): no se guardan
+    read_only = False
+    
     class Meta:
         verbose_name = 'Estudio Fotográfico'
         verbose_name_plural = 'Estudios Fotográficos'
@@ -57,11 +62,17 @@ class Tenant(models.Model):
     def __str__(self):
         return f"{self.name}"
         
+    @staticmethod
+    def make_slug(name):
+        """Slug por defecto a partir del nombre"""
+        return re.sub(r'[^a-zA-Z0-9]', '', name.lower())[:50]
+        
     def save(self, *args, **kwargs):
+        if self.read_only:
+            raise ValueError('Tenant de la cache (solo lectura): leer la fila con Tenant.objects para editarla')
         # Generar slug automáticamente si no existe
         if not self.slug:
-            import re
-            self.slug = re.sub(r'[^a-zA-Z0-9]', '', self.name.lower())[:50]
+            self.slug = self.make_slug(self.name)
         super().save(*args, **kwargs)
         
     def has_global_data_access(self):
@@ -110,6 +121,7 @@ class TenantConfiguration(models.Model):
         verbose_name = 'Configuración del Tenant'
         verbose_name_plural = 'Configuraciones del Tenant'
         unique_together = ['tenant', 'module', 'key']
+        indexes = [models.Index(fields=['tenant', 'updated_at'], name='core_tenantconf_updated_idx')]
     
     def __str__(self):
         return f"{self.tenant.name} - {self.module}.{self.key}"
@@ -125,4 +137,63 @@ class TenantConfiguration(models.Model):
         elif self.data_type == 'json':
             import json
             return json.loads(self.value)
-        return self.value
\ No newline at end of file
+        return self.value
+
+
+class TenantOffboarding(models.Model):
+    """
+    Baja de un tenant por lotes (apps/core/configuration/offboarding.py).
+    Guarda el punto de control para poder reanudar tras una caída; conserva
+    el id y el nombre porque la fila del tenant se borra al final.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'En cola'),
+        ('archiving', 'Archivando'),
+        ('deleting', 'Eliminando'),
+        ('completed', 'Completado'),
+        ('failed', 'Error'),
+    ]
+    
+    tenant = models.ForeignKey(Tenant, on_delete=models.SET_NULL, null=True, blank=True, verbose_name='Tenant')
+    tenant_ref = models.IntegerField(verbose_name='Id del tenant')
+    tenant_name = models.CharField(max_length=100, verbose_name='Nombre del tenant')
+    requested_by = models.ForeignKey('User', on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='+', verbose_name='Solicitado por')
+    
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name='Estado')
+    archive = models.BooleanField(default=False, verbose_name='Archivar antes de borrar')
+    archive_file = models.FileField(upload_to='offboarding/%Y/%m/%d/', blank=True, verbose_name='Archivo')
+    archive_size = models.PositiveBigIntegerField(default=0, verbose_name='Tamaño (bytes)')
+    # Punto de control del archivo: tabla en curso, último pk archivado y bloques ya escritos
+    archive_step = models.PositiveIntegerField(default=0, verbose_name='Tabla archivada')
+    archive_after = models.JSONField(null=True, blank=True, verbose_name='Último pk archivado')
+    archive_parts = models.JSONField(default=list, blank=True, verbose_name='Bloques archivados')
+    
+    # Punto de control: plan fijado al crear la baja, paso en curso y filas borradas por tabla
+    plan = models.JSONField(default=list, blank=True, verbose_name='Plan')
+    step = models.PositiveIntegerField(default=0, verbose_name='Paso')
+    total_rows = models.PositiveBigIntegerField(default=0, verbose_name='Filas totales')
+    deleted_rows = models.PositiveBigIntegerField(default=0, verbose_name='Filas borradas')
+    tables = models.JSONField(default=dict, blank=True, verbose_name='Filas borradas por tabla')
+    error = models.TextField(blank=True, verbose_name='Error')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Fin')
+    
+    class Meta:
+        verbose_name = 'Baja de Tenant'
+        verbose_name_plural = 'Bajas de Tenants'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.tenant_name} - {self.get_status_display()}"
+    
+    @property
+    def progress(self):
+        """Porcentaje de filas borradas"""
+        if self.status == 'completed':
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(99, int(self.deleted_rows * 100 / self.total_rows))
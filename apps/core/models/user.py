@@ -1,8 +1,23 @@
 """
 Modelos relacionados con Usuarios
 """
-from django.contrib.auth.models import AbstractUser
-from django.db import models
+import hashlib
+
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.db import models, transaction
+from django.utils import timezone
+
+# Ids de las tablas de dimensión ya confirmados en la BD: {(modelo, valor): id}
+_interned_ids = {}
+_interned_values = {}
+INTERNED_CACHE_SIZE = 10000
+
+
+class ActiveUserManager(UserManager):
+    """Manager por defecto: excluye los usuarios eliminados (soft delete)"""
+    
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class User(AbstractUser):
@@ -50,14 +65,47 @@ class User(AbstractUser):
     # Fechas importantes
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True, verbose_name='Eliminado')
+    
+    # objects oculta los eliminados; all_objects los incluye (purga, auditoría)
+    objects = ActiveUserManager()
+    all_objects = UserManager()
     
     class Meta:
         verbose_name = 'Usuario'
         verbose_name_plural = 'Usuarios'
+        indexes = [models.Index(fields=['tenant', 'updated_at'], name='core_user_updated_idx')]
         
     def __str__(self):
         return f"{self.get_full_name()} ({self.username})"
         
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Tenant y borrado al cargar: al guardar se sabe si cambió la pertenencia
+        instance._loaded_membership = (instance.__dict__.get('tenant_id'), instance.__dict__.get('deleted_at'))
+        return instance
+        
+    @property
+    def membership_changed(self):
+        """True si cambió el tenant o el borrado desde que se cargó (o si es nuevo)"""
+        return getattr(self, '_loaded_membership', None) != (self.tenant_id, self.deleted_at)
+        
+    @property
+    def is_deleted(self):
+        return self.deleted_at is not None
+        
+    def soft_delete(self):
+        """
+        Marcar el usuario como eliminado sin tocar sus datos relacionados; el
+        trabajo purge_deleted_users los borra por lotes tras la retención.
+        El username se libera para poder volver a usarlo.
+        """
+        self.deleted_at = timezone.now()
+        self.is_active = False
+        self.username = f'{self.username}.deleted-{self.pk}'[-150:]
+        self.save(update_fields=['deleted_at', 'is_active', 'username', 'updated_at'])
+        
     def get_permissions_list(self):
         """
         Obtener lista de permisos según el rol
@@ -161,9 +209,124 @@ class UserProfile(models.Model):
         return f"Perfil de {self.user.get_full_name()}"
 
 
+def _remember_interned(model, ids):
+    if len(_interned_ids) + len(ids) > INTERNED_CACHE_SIZE:
+        _interned_ids.clear()
+        _interned_values.clear()
+    for value, pk in ids.items():
+        _interned_ids[model, value] = pk
+        _interned_values[model, pk] = value
+
+
+class InternedValue(models.Model):
+    """
+    Texto repetido guardado una sola vez (tabla de dimensión). Las filas no
+    se modifican ni se borran, así que sus ids se cachean en el proceso
+    una vez confirmados.
+    """
+    digest = models.CharField(max_length=40, unique=True, editable=False, verbose_name='Hash')
+    value = models.TextField(verbose_name='Valor')
+    
+    class Meta:
+        abstract = True
+    
+    def __str__(self):
+        return self.value[:80]
+    
+    @staticmethod
+    def make_digest(value):
+        return hashlib.sha1(value.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def intern_many(cls, values):
+        """{valor: id} creando las filas que falten (los valores vacíos se omiten)"""
+        ids = {}
+        missing = {}
+        for value in set(values):
+            if not value:
+                continue
+            pk = _interned_ids.get((cls, value))
+            if pk is None:
+                missing[cls.make_digest(value)] = value
+            else:
+                ids[value] = pk
+        if not missing:
+            return ids
+        
+        found = dict(cls.objects.filter(digest__in=list(missing)).values_list('digest', 'pk'))
+        new = [cls(digest=digest, value=value) for digest, value in missing.items() if digest not in found]
+        if new:
+            cls.objects.bulk_create(new, ignore_conflicts=True)
+            found.update(cls.objects.filter(digest__in=[row.digest for row in new]).values_list('digest', 'pk'))
+        resolved = {missing[digest]: pk for digest, pk in found.items()}
+        ids.update(resolved)
+        transaction.on_commit(lambda: _remember_interned(cls, resolved))
+        return ids
+    
+    @classmethod
+    def intern(cls, value):
+        return cls.intern_many([value]).get(value)
+    
+    @classmethod
+    def values_for(cls, ids):
+        """{id: valor} de los ids dados (los None se omiten)"""
+        values = {}
+        missing = set()
+        for pk in set(ids):
+            if pk is None:
+                continue
+            value = _interned_values.get((cls, pk))
+            if value is None:
+                missing.add(pk)
+            else:
+                values[pk] = value
+        if missing:
+            found = dict(cls.objects.filter(pk__in=missing).values_list('pk', 'value'))
+            values.update(found)
+            transaction.on_commit(lambda: _remember_interned(cls, {value: pk for pk, value in found.items()}))
+        return values
+
+
+class ActivityModule(InternedValue):
+    """Módulo de la aplicación en el que ocurrió una actividad"""
+    
+    class Meta:
+        verbose_name = 'Módulo de Actividad'
+        verbose_name_plural = 'Módulos de Actividad'
+
+
+class ActivityTemplate(InternedValue):
+    """Plantilla de descripción de actividad, p. ej. 'Actualizó el usuario {username}'"""
+    
+    class Meta:
+        verbose_name = 'Plantilla de Actividad'
+        verbose_name_plural = 'Plantillas de Actividad'
+
+
+class UserAgent(InternedValue):
+    """User agent de los clientes que registraron actividad"""
+    
+    class Meta:
+        verbose_name = 'User Agent'
+        verbose_name_plural = 'User Agents'
+
+
+def render_description(template, params):
+    """Texto de una plantilla de actividad con sus parámetros"""
+    if not params:
+        return template
+    try:
+        return template.format_map(params)
+    except (KeyError, IndexError, ValueError):
+        return template
+
+
 class UserActivity(models.Model):
     """
-    Registro de actividad del usuario
+    Registro de actividad del usuario. Las filas nuevas guardan la
+    descripción como plantilla + parámetros y el módulo y el user agent
+    como ids de tablas de dimensión; description, module y user_agent solo
+    tienen valor en filas antiguas aún no migradas (activity_dimensions).
     """
     ACTION_CHOICES = [
         ('login', 'Inicio de sesión'),
@@ -179,9 +342,24 @@ class UserActivity(models.Model):
     tenant = models.ForeignKey('Tenant', on_delete=models.CASCADE, verbose_name='Tenant')
     
     action = models.CharField(max_length=20, choices=ACTION_CHOICES, verbose_name='Acción')
-    description = models.TextField(verbose_name='Descripción')
+    description = models.TextField(blank=True, verbose_name='Descripción')
     module = models.CharField(max_length=50, blank=True, verbose_name='Módulo')
     
+    # Forma compacta (sin índice: nunca se filtra la tabla por ellas)
+    template = models.ForeignKey(
+        ActivityTemplate, on_delete=models.PROTECT, null=True, blank=True, db_index=False,
+        related_name='+', verbose_name='Plantilla'
+    )
+    params = models.JSONField(null=True, blank=True, verbose_name='Parámetros')
+    module_ref = models.ForeignKey(
+        ActivityModule, on_delete=models.PROTECT, null=True, blank=True, db_index=False,
+        related_name='+', verbose_name='Módulo (dimensión)'
+    )
+    agent = models.ForeignKey(
+        UserAgent, on_delete=models.PROTECT, null=True, blank=True, db_index=False,
+        related_name='+', verbose_name='User Agent (dimensión)'
+    )
+    
     # Metadatos
     ip_address = models.GenericIPAddressField(null=True, blank=True, verbose_name='Dirección IP')
     user_agent = models.TextField(blank=True, verbose_name='User Agent')
@@ -191,6 +369,56 @@ class UserActivity(models.Model):
         verbose_name = 'Actividad de Usuario'
         verbose_name_plural = 'Actividades de Usuario'
         ordering = ['-created_at']
+        indexes = [
+            # Listados por fecha (admin acotado por fecha, exportaciones)
+            models.Index(fields=['-created_at'], name='core_activity_created_idx'),
+            models.Index(fields=['tenant', '-created_at'], name='core_activity_tenant_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.action} - {self.created_at}"
+    
+    def _dimension_value(self, name):
+        """Valor de una FK de dimensión (del select_related o de la cache del proceso)"""
+        field = self._meta.get_field(name)
+        if field.is_cached(self):
+            return getattr(self, name).value
+        pk = getattr(self, field.attname)
+        return field.related_model.values_for([pk])[pk]
+    
+    @property
+    def rendered_description(self):
+        if self.template_id is None:
+            return self.description
+        return render_description(self._dimension_value('template'), self.params)
+    
+    @property
+    def module_name(self):
+        return self.module if self.module_ref_id is None else self._dimension_value('module_ref')
+    
+    @property
+    def user_agent_text(self):
+        return self.user_agent if self.agent_id is None else self._dimension_value('agent')
+
+
+class ActivityDailyRollup(models.Model):
+    """
+    Resumen diario de actividad por tenant, acción y módulo
+    (lo recalcula el trabajo periódico rollup_user_activity)
+    """
+    tenant = models.ForeignKey('Tenant', on_delete=models.CASCADE, verbose_name='Tenant')
+    day = models.DateField(verbose_name='Día')
+    action = models.CharField(max_length=20, choices=UserActivity.ACTION_CHOICES, verbose_name='Acción')
+    module = models.CharField(max_length=50, blank=True, verbose_name='Módulo')
+    count = models.PositiveIntegerField(default=0, verbose_name='Cantidad')
+    users_count = models.PositiveIntegerField(default=0, verbose_name='Usuarios distintos')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Resumen Diario de Actividad'
+        verbose_name_plural = 'Resúmenes Diarios de Actividad'
+        ordering = ['-day', 'tenant', 'action']
+        unique_together = ['tenant', 'day', 'action', 'module']
     
     def __str__(self):
-        return f"{self.user.username} - {self.action} - {self.created_at}"
\ No newline at end of file
+        return f"{self.tenant_id} - {self.day} - {self.action}: {self.count}"
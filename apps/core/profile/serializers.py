@@ -5,6 +5,7 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from apps.core.models import UserProfile, UserActivity
+from apps.core.serializers import SparseFieldsetMixin
 
 User = get_user_model()
 
@@ -28,7 +29,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return int((completed / len(fields)) * 100)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer para datos del usuario en Mi Perfil"""
     profile = UserProfileSerializer(read_only=True)
     full_name = serializers.SerializerMethodField()
@@ -44,6 +45,14 @@ class UserSerializer(serializers.ModelSerializer):
             'last_login', 'profile'
         ]
         read_only_fields = ['id', 'username', 'date_joined', 'last_login', 'email_verified']
+        field_sources = {
+            'full_name': ('first_name', 'last_name', 'username'),
+            # completion_percentage lee campos del propio usuario
+            'profile': (
+                'profile__language', 'profile__theme', 'profile__email_notifications',
+                'first_name', 'last_name', 'email', 'phone', 'address', 'bio'
+            ),
+        }
     
     def get_full_name(self, obj):
         return obj.get_full_name() or obj.username
@@ -60,6 +69,8 @@ class UserStatisticsSerializer(serializers.Serializer):
 class UserActivitySerializer(serializers.ModelSerializer):
     """Serializer para actividad del usuario"""
     action_display = serializers.CharField(source='get_action_display', read_only=True)
+    description = serializers.CharField(source='rendered_description', read_only=True)
+    module = serializers.CharField(source='module_name', read_only=True)
     time_ago = serializers.SerializerMethodField()
     
     class Meta:
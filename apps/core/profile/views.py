@@ -5,11 +5,14 @@ from rest_framework import status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
+from apps.core.fast_serializers import FastUserActivitySerializer
 from apps.core.models import UserActivity
+from apps.core.serializers import get_sparse_params
+from apps.core.tasks import log_activity
 import random
 
 from .serializers import (
-    UserSerializer, UserStatisticsSerializer, UserActivitySerializer,
+    UserSerializer, UserStatisticsSerializer,
     ChangePasswordSerializer, ChangeEmailSerializer
 )
 
@@ -22,7 +25,10 @@ class ProfileView(APIView):
     
     def get(self, request):
         """Obtener datos del perfil actual"""
-        serializer = UserSerializer(request.user)
+        fields, exclude = get_sparse_params(request)
+        # request.user ya está leído: solo faltan las relaciones que usan los campos pedidos
+        user = UserSerializer.prefetch_instance(request.user, fields, exclude)
+        serializer = UserSerializer(user, fields=fields, exclude=exclude)
         return Response(serializer.data)
     
     def put(self, request):
@@ -32,13 +38,7 @@ class ProfileView(APIView):
             serializer.save()
             
             # Registrar actividad
-            UserActivity.objects.create(
-                user=request.user,
-                tenant=request.user.tenant,
-                action='update',
-                description='Actualizó su perfil personal',
-                module='profile'
-            )
+            log_activity(request.user, 'update', 'Actualizó su perfil personal', 'profile')
             
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -99,7 +99,7 @@ class ProfileActivityView(APIView):
             user=request.user
         ).order_by('-created_at')[:10]
         
-        serializer = UserActivitySerializer(activities, many=True)
+        serializer = FastUserActivitySerializer(activities, many=True, context={'request': request})
         return Response(serializer.data)
 
 
@@ -116,13 +116,7 @@ class ChangePasswordView(APIView):
             user.save()
             
             # Registrar actividad
-            UserActivity.objects.create(
-                user=user,
-                tenant=user.tenant,
-                action='update',
-                description='Cambió su contraseña',
-                module='security'
-            )
+            log_activity(user, 'update', 'Cambió su contraseña', 'security')
             
             return Response({'message': 'Contraseña actualizada correctamente'})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -143,12 +137,9 @@ class ChangeEmailView(APIView):
             user.save()
             
             # Registrar actividad
-            UserActivity.objects.create(
-                user=user,
-                tenant=user.tenant,
-                action='update',
-                description=f'Cambió su email de {old_email} a {user.email}',
-                module='security'
+            log_activity(
+                user, 'update', 'Cambió su email de {old_email} a {email}', 'security',
+                old_email=old_email, email=user.email
             )
             
             return Response({'message': 'Email actualizado correctamente'})
@@ -0,0 +1,157 @@
+"""
+Renderers y parsers JSON del Core App - Arte Ideas
+
+ORJSONRenderer / ORJSONParser usan orjson (datetime, date, UUID y
+subclases de dict/list nativos; Decimal y cadenas perezosas vía `default`).
+Si orjson no está instalado se comportan como los de DRF.
+
+stream_queryset() codifica un queryset por bloques dentro de un
+StreamingHttpResponse para listados grandes: la memoria depende del tamaño
+del bloque y no del número de filas. Bajo ASGI Django consumiría entero un
+iterador síncrono antes de enviar nada, así que ahí se entrega un iterador
+async que lee cada bloque con sync_to_async (en el hilo de la conexión a
+la BD); bajo WSGI se entrega el iterador síncrono.
+"""
+import datetime
+import decimal
+import itertools
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models.query import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+DEFAULT_STREAM_CHUNK_SIZE = 500
+
+
+def _default(obj):
+    """Tipos que orjson no serializa de forma nativa (mismo criterio que DRF)"""
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if isinstance(obj, (QuerySet, set, frozenset)) or hasattr(obj, '__iter__'):
+        return list(obj)
+    raise TypeError(f'Tipo no serializable a JSON: {type(obj).__name__}')
+
+
+def dumps(data, indent=False):
+    """Serializar a bytes JSON con orjson o, en su defecto, con el encoder de DRF"""
+    if orjson is not None:
+        option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=option)
+    return json.dumps(
+        data, cls=JSONEncoder, ensure_ascii=False,
+        indent=2 if indent else None, separators=None if indent else (',', ':')
+    ).encode('utf-8')
+
+
+def loads(content):
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Renderer JSON basado en orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return dumps(data, indent=bool(indent))
+
+
+class ORJSONParser(BaseParser):
+    """Parser JSON basado en orjson"""
+    media_type = 'application/json'
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return JSONParser().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read() if stream is not None else b'')
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+def iter_json_array(rows, chunk_size=DEFAULT_STREAM_CHUNK_SIZE):
+    """Codificar un iterable de filas como un array JSON, un bloque a la vez"""
+    iterator = iter(rows)
+    yield b'['
+    first = True
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            break
+        encoded = dumps(chunk)[1:-1]
+        yield encoded if first else b',' + encoded
+        first = False
+    yield b']'
+
+
+def iter_serialized_queryset(queryset, serializer_class, chunk_size, context=None):
+    """Serializar un queryset por bloques sin cargarlo entero en memoria"""
+    iterator = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield from serializer_class(chunk, many=True, context=context or {}).data
+
+
+async def aiter_blocks(blocks):
+    """Recorrer desde el event loop un iterador síncrono que usa el ORM, un bloque por llamada"""
+    blocks = iter(blocks)
+    done = object()
+    next_block = sync_to_async(next, thread_sensitive=True)
+    while True:
+        block = await next_block(blocks, done)
+        if block is done:
+            return
+        yield block
+
+
+def streaming_response(blocks, request, content_type):
+    """StreamingHttpResponse que envía los bloques según llegan, con WSGI o con ASGI"""
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        blocks = aiter_blocks(blocks)
+    return StreamingHttpResponse(blocks, content_type=content_type)
+
+
+def stream_queryset(queryset, serializer_class, chunk_size=None, context=None):
+    """StreamingHttpResponse con el queryset serializado como array JSON (context['request'] elige WSGI/ASGI)"""
+    chunk_size = chunk_size or getattr(settings, 'STREAMING_JSON_CHUNK_SIZE', DEFAULT_STREAM_CHUNK_SIZE)
+    rows = iter_serialized_queryset(queryset, serializer_class, chunk_size, context)
+    return streaming_response(
+        iter_json_array(rows, chunk_size), (context or {}).get('request'), content_type='application/json'
+    )
+
+
+def wants_stream(request):
+    """El cliente pide respuesta en streaming con ?stream=true"""
+    return request.query_params.get('stream', '').lower() in ('1', 'true', 'yes')
@@ -0,0 +1,130 @@
+"""
+Cache de respuestas del Core App - Arte Ideas
+
+Decorador para métodos GET de APIView cuya salida es idéntica para todos
+los usuarios que comparten tenant y rol. Guarda los bytes ya renderizados,
+así un acierto no ejecuta la vista ni los serializers.
+
+Cada entrada depende de una lista de modelos. Las generaciones van por
+tenant: al guardar o borrar una instancia se incrementa la generación del
+modelo en el tenant de la instancia (y la de las respuestas sin tenant,
+como la lista de tenants del super admin), así un cambio en un tenant no
+vacía la cache de los demás. purge_model() invalida el modelo en todos.
+"""
+import functools
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from .cache import GLOBAL_NAMESPACE, core_cache, tenant_namespace
+
+CACHE_HEADER = 'X-Cache'
+
+_tracked_models = set()
+
+
+def model_namespace(model, scope=None):
+    """Generación del modelo en todos los tenants (scope None) o en uno ('global' sin tenant)"""
+    namespace = f'model:{model._meta.label_lower}'
+    return namespace if scope is None else f'{namespace}:{scope}'
+
+
+def _invalidate(namespace):
+    core_cache.invalidate(namespace)
+    transaction.on_commit(lambda: core_cache.invalidate(namespace))
+
+
+def purge_model(model):
+    """Invalidar todas las respuestas que dependen del modelo, en todos los tenants"""
+    _invalidate(model_namespace(model))
+
+
+def purge_instance(model, tenant_id=None):
+    """Invalidar las respuestas del tenant y las sin tenant que dependen del modelo"""
+    if tenant_id is not None:
+        _invalidate(model_namespace(model, tenant_id))
+    _invalidate(model_namespace(model, GLOBAL_NAMESPACE))
+
+
+def _purge_on_change(sender, instance, **kwargs):
+    tenant_id = instance.pk if sender._meta.label_lower == 'core.tenant' else getattr(instance, 'tenant_id', None)
+    purge_instance(sender, tenant_id)
+
+
+def _track(model):
+    """Conectar (una sola vez) los signals que purgan las respuestas del modelo"""
+    label = model._meta.label_lower
+    if label in _tracked_models:
+        return
+    _tracked_models.add(label)
+    post_save.connect(_purge_on_change, sender=model, weak=False, dispatch_uid=f'response_cache:save:{label}')
+    post_delete.connect(_purge_on_change, sender=model, weak=False, dispatch_uid=f'response_cache:delete:{label}')
+
+
+def build_cache_parts(view, request, depends_on, scope):
+    """Partes de la clave: vista, ruta, parámetros, rol y generación de cada modelo en el scope"""
+    query = '&'.join(
+        f'{key}={value}'
+        for key in sorted(request.query_params)
+        for value in request.query_params.getlist(key)
+    )
+    versions = ','.join(
+        f'{core_cache.generation(model_namespace(model))}.{core_cache.generation(model_namespace(model, scope))}'
+        for model in depends_on
+    )
+    return (
+        f'{view.__class__.__module__}.{view.__class__.__qualname__}',
+        request.path,
+        query,
+        getattr(request.user, 'role', ''),
+        request.accepted_media_type,
+        versions,
+    )
+
+
+def cache_response(depends_on=(), timeout=None):
+    """
+    Cachear la respuesta 200 de un método de APIView por tenant, rol y
+    parámetros de la URL.
+
+        @cache_response(depends_on=[RolePermission])
+        def get(self, request, role=None):
+            ...
+    """
+    depends_on = list(depends_on)
+    for model in depends_on:
+        _track(model)
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            tenant_id = getattr(request.user, 'tenant_id', None)
+            namespace = tenant_namespace(tenant_id) if tenant_id else GLOBAL_NAMESPACE
+            parts = build_cache_parts(view, request, depends_on, tenant_id or GLOBAL_NAMESPACE)
+
+            cached = core_cache.get(namespace, 'response', *parts)
+            if cached is not None:
+                status_code, content_type, content = cached
+                response = HttpResponse(content, status=status_code, content_type=content_type)
+                response[CACHE_HEADER] = 'HIT'
+                return response
+
+            response = method(view, request, *args, **kwargs)
+            if isinstance(response, Response) and response.status_code == 200:
+                response.accepted_renderer = request.accepted_renderer
+                response.accepted_media_type = request.accepted_media_type
+                response.renderer_context = view.get_renderer_context()
+                response.render()
+                core_cache.set(
+                    namespace, 'response', *parts,
+                    value=(response.status_code, response['Content-Type'], response.content),
+                    timeout=timeout
+                )
+                response[CACHE_HEADER] = 'MISS'
+            return response
+
+        return wrapper
+
+    return decorator
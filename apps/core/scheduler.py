@@ -0,0 +1,251 @@
+"""
+Trabajos periódicos del Core App - Arte Ideas
+
+Un trabajo es una función que recibe el tamaño de lote y el máximo de lotes
+por ejecución y devuelve un diccionario con lo que hizo:
+
+    @periodic_job(every=timedelta(hours=1))
+    def purge_expired_tokens(batch_size, max_batches):
+        ...
+        return {'deleted': deleted}
+
+Con Celery los programa beat (config/celery.py); sin broker el comando
+run_scheduler hace lo mismo en un proceso. Cada ejecución toma un lock en su
+fila ScheduledJob con un UPDATE condicional, así que aunque varios workers
+lo lancen a la vez solo uno lo ejecuta. El lock caduca (LOCK_TTL) si el
+worker muere a mitad; un paso largo dentro de una ejecución lo renueva con
+extend_lock(). El estado y la duración de la última ejecución se ven en el
+admin.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .background import task
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'LOCK_TTL': 600,                 # Segundos antes de considerar abandonado un lock
+    'BATCH_SIZE': 1000,              # Filas por lote
+    'MAX_BATCHES': 50,               # Lotes por ejecución; el resto queda para la siguiente
+    'TICK': 30,                      # Segundos entre revisiones de run_scheduler
+    'ACTIVITY_RETENTION_DAYS': 365,  # None para conservar toda la actividad
+    'USER_RETENTION_DAYS': 30,       # Días que se conserva un usuario eliminado antes de purgarlo
+    'TOMBSTONE_RETENTION_DAYS': 30,  # Días que se conservan las lápidas de la sincronización incremental
+}
+
+jobs = {}
+
+# Trabajo que se está ejecutando en este hilo: (nombre, dueño del lock)
+_running = threading.local()
+
+
+def get_scheduler_settings():
+    return {**DEFAULTS, **getattr(settings, 'CORE_SCHEDULER', {})}
+
+
+class PeriodicJob:
+    """Trabajo registrado con su intervalo"""
+
+    def __init__(self, func, name, every):
+        self.func = func
+        self.name = name
+        self.every = every
+
+    def __call__(self, batch_size, max_batches):
+        return self.func(batch_size=batch_size, max_batches=max_batches)
+
+
+def periodic_job(func=None, *, every, name=None):
+    """Registrar una función como trabajo periódico"""
+    def decorator(func):
+        job_name = name or func.__name__
+        jobs[job_name] = PeriodicJob(func, job_name, every)
+        return func
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def delete_in_batches(queryset, batch_size, max_batches):
+    """Borrar por lotes de pks; devuelve (borrados, quedan_pendientes)"""
+    deleted = 0
+    for _ in range(max_batches):
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted, False
+        queryset.model._base_manager.filter(pk__in=pks).delete()
+        deleted += len(pks)
+        if len(pks) < batch_size:
+            return deleted, False
+    return deleted, queryset.exists()
+
+
+# Lock y registro de ejecuciones ----------------------------------------------
+
+def _owner():
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'[-64:]
+
+
+def ensure_jobs():
+    """Crear la fila de cada trabajo registrado que aún no la tenga"""
+    from .models import ScheduledJob
+
+    ScheduledJob.objects.bulk_create(
+        [ScheduledJob(name=name) for name in jobs], ignore_conflicts=True
+    )
+
+
+def _job_exists(name):
+    from .models import ScheduledJob
+
+    return ScheduledJob.objects.filter(name=name).exists()
+
+
+def get_job_state(name):
+    """Estado guardado del trabajo entre ejecuciones"""
+    from .models import ScheduledJob
+
+    return ScheduledJob.objects.filter(name=name).values_list('state', flat=True).first() or {}
+
+
+def set_job_state(name, **values):
+    """Guardar valores en el estado del trabajo (se mezclan con los anteriores)"""
+    from .models import ScheduledJob
+
+    state = {**get_job_state(name), **values}
+    ScheduledJob.objects.update_or_create(name=name, defaults={'state': state})
+
+
+def acquire_lock(name, owner, force=False):
+    """Tomar el lock del trabajo; False si otro lo tiene o está deshabilitado"""
+    from .models import ScheduledJob
+
+    now = timezone.now()
+    queryset = ScheduledJob.objects.filter(name=name).filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    )
+    if not force:
+        queryset = queryset.filter(is_enabled=True)
+    return queryset.update(
+        locked_by=owner,
+        locked_until=now + timedelta(seconds=get_scheduler_settings()['LOCK_TTL']),
+        last_status='running',
+        last_started_at=now,
+    ) == 1
+
+
+def extend_lock():
+    """Renovar LOCK_TTL el lock del trabajo en curso en este hilo; False si ya no es suyo"""
+    from .models import ScheduledJob
+
+    current = getattr(_running, 'job', None)
+    if current is None:
+        return False
+    name, owner = current
+    return ScheduledJob.objects.filter(name=name, locked_by=owner).update(
+        locked_until=timezone.now() + timedelta(seconds=get_scheduler_settings()['LOCK_TTL'])
+    ) == 1
+
+
+def _finish(name, owner, started, status, result=None, error=''):
+    from .models import ScheduledJob
+
+    ScheduledJob.objects.filter(name=name, locked_by=owner).update(
+        locked_by='',
+        locked_until=None,
+        last_status=status,
+        last_finished_at=timezone.now(),
+        last_duration_ms=int((time.monotonic() - started) * 1000),
+        last_result=result or {},
+        last_error=error,
+        run_count=F('run_count') + 1,
+    )
+
+
+def run_job(name, force=False):
+    """
+    Ejecutar un trabajo si nadie más lo está ejecutando. Devuelve su
+    resultado, o None si no se pudo tomar el lock.
+    """
+    job = jobs[name]
+    config = get_scheduler_settings()
+    owner = _owner()
+    acquired = acquire_lock(name, owner, force=force)
+    if not acquired and not _job_exists(name):
+        # Primera ejecución del trabajo: crear su fila y reintentar
+        ensure_jobs()
+        acquired = acquire_lock(name, owner, force=force)
+    if not acquired:
+        logger.info('Trabajo %s omitido: en ejecución o deshabilitado', name)
+        return None
+
+    started = time.monotonic()
+    _running.job = (name, owner)
+    try:
+        result = job(batch_size=config['BATCH_SIZE'], max_batches=config['MAX_BATCHES']) or {}
+    except Exception as exc:
+        _finish(name, owner, started, 'failure', error=repr(exc))
+        raise
+    finally:
+        _running.job = None
+    _finish(name, owner, started, 'success', result=result)
+    return result
+
+
+def due_jobs(now=None):
+    """Nombres de los trabajos habilitados cuyo intervalo ya se cumplió"""
+    from .models import ScheduledJob
+
+    now = now or timezone.now()
+    states = {
+        job.name: job for job in ScheduledJob.objects.filter(name__in=list(jobs))
+    }
+    due = []
+    for name, job in jobs.items():
+        state = states.get(name)
+        if state is not None and not state.is_enabled:
+            continue
+        if state is None or state.last_started_at is None or state.last_started_at <= now - job.every:
+            due.append(name)
+    return due
+
+
+def run_due_jobs(now=None):
+    """Ejecutar los trabajos pendientes; un fallo no detiene a los demás"""
+    results = {}
+    for name in due_jobs(now):
+        try:
+            results[name] = run_job(name)
+        except Exception:
+            logger.exception('Trabajo %s falló', name)
+            results[name] = None
+    return results
+
+
+@task(name='apps.core.scheduler.run_scheduled_job')
+def run_scheduled_job(name, force=False):
+    """Tarea que lanza beat (o el admin) para ejecutar un trabajo"""
+    return run_job(name, force=force)
+
+
+def beat_schedule():
+    """Programación de Celery beat equivalente a los trabajos registrados"""
+    return {
+        f'core:{name}': {
+            'task': run_scheduled_job.name,
+            'schedule': job.every.total_seconds(),
+            'args': (name,),
+        }
+        for name, job in jobs.items()
+    }
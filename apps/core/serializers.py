@@ -0,0 +1,139 @@
+"""
+Serializers compartidos del Core App - Arte Ideas
+
+SparseFieldsetMixin permite pedir solo algunos campos con
+`?fields=id,username` o quitar algunos con `?exclude=profile`, y traduce
+los campos pedidos a `.only()` / `select_related()` para que las columnas y
+joins que no se usan no se lleguen a consultar.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import prefetch_related_objects
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+
+
+def parse_field_list(value):
+    """'a, b,,c' -> ['a', 'b', 'c'] (None si no se indicó)"""
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def get_sparse_params(request):
+    """(fields, exclude) pedidos en la query string"""
+    if request is None:
+        return None, None
+    params = getattr(request, 'query_params', request.GET)
+    return parse_field_list(params.get(FIELDS_PARAM)), parse_field_list(params.get(EXCLUDE_PARAM))
+
+
+def select_fields(available, fields=None, exclude=None):
+    """Nombres que se conservan respetando el orden declarado"""
+    keep = list(available)
+    if fields is not None:
+        requested = set(fields)
+        keep = [name for name in keep if name in requested]
+    if exclude:
+        excluded = set(exclude)
+        keep = [name for name in keep if name not in excluded]
+    return keep
+
+
+class SparseFieldsetMixin:
+    """
+    Recorte de campos para ModelSerializer.
+
+    Los campos se toman de los argumentos `fields`/`exclude` o, si no se
+    pasan, de la query string del request del contexto. Para campos que no
+    corresponden a una columna (SerializerMethodField, propiedades) se
+    declaran sus dependencias en `Meta.field_sources`:
+
+        field_sources = {'full_name': ('first_name', 'last_name')}
+    """
+
+    def __init__(self, *args, fields=None, exclude=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is None and exclude is None:
+            fields, exclude = get_sparse_params(self.context.get('request'))
+        if fields is None and not exclude:
+            return
+        keep = set(select_fields(self.fields, fields, exclude))
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
+
+    @classmethod
+    def get_orm_paths(cls, fields=None, exclude=None):
+        """
+        Rutas ORM necesarias para los campos que se van a devolver.
+        Devuelve (only, select_related) o None si algún campo no puede
+        resolverse (en ese caso no se recorta la consulta).
+        """
+        serializer = cls(fields=fields, exclude=exclude)
+        return _collect_paths(serializer, '')
+
+    @classmethod
+    def optimize_queryset(cls, queryset, fields=None, exclude=None):
+        """Aplicar .only()/select_related() según los campos pedidos"""
+        paths = cls.get_orm_paths(fields, exclude)
+        if paths is None:
+            return queryset
+        only, related = paths
+        if related:
+            queryset = queryset.select_related(*sorted(related))
+        return queryset.only(*sorted(only))
+
+    @classmethod
+    def prefetch_instance(cls, instance, fields=None, exclude=None):
+        """
+        Cargar en una instancia ya leída (p. ej. request.user) solo las
+        relaciones que usan los campos pedidos; las que ya están en la
+        instancia no se vuelven a consultar.
+        """
+        paths = cls.get_orm_paths(fields, exclude)
+        if paths and paths[1]:
+            prefetch_related_objects([instance], *sorted(paths[1]))
+        return instance
+
+
+def _collect_paths(serializer, prefix):
+    model = serializer.Meta.model
+    declared = getattr(serializer.Meta, 'field_sources', {})
+    only = {f'{prefix}{model._meta.pk.name}'}
+    related = set()
+
+    def add(path):
+        only.add(f'{prefix}{path}')
+        parts = path.split('__')
+        for index in range(1, len(parts)):
+            related.add(f"{prefix}{'__'.join(parts[:index])}")
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in declared:
+            for path in declared[name]:
+                add(path)
+            continue
+        if isinstance(field, serializers.BaseSerializer):
+            if field.source == '*' or not hasattr(field, 'Meta'):
+                return None
+            nested = _collect_paths(field, f'{prefix}{field.source}__')
+            if nested is None:
+                return None
+            related.add(f'{prefix}{field.source}')
+            only.update(nested[0])
+            related.update(nested[1])
+            continue
+        source = field.source
+        if source.startswith('get_') and source.endswith('_display'):
+            source = source[len('get_'):-len('_display')]
+        path = source.replace('.', '__')
+        try:
+            model._meta.get_field(path.split('__')[0])
+        except FieldDoesNotExist:
+            return None
+        add(path)
+    return only, related
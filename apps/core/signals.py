@@ -0,0 +1,53 @@
+"""
+Signals del Core App - Arte Ideas
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import invalidate_tenant
+from .configuration.sync import record_tombstone
+from .events import publish_activity
+from .response_cache import purge_instance
+from .models import Tenant, TenantConfiguration, RolePermission, UserActivity
+
+
+@receiver([post_save, post_delete], sender=Tenant)
+def invalidate_tenant_cache(sender, instance, **kwargs):
+    """Invalidar la cache del tenant al modificarlo"""
+    invalidate_tenant(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=TenantConfiguration)
+@receiver([post_save, post_delete], sender=RolePermission)
+def invalidate_tenant_settings_cache(sender, instance, **kwargs):
+    """Invalidar la cache del tenant al cambiar su configuración o permisos"""
+    invalidate_tenant(instance.tenant_id)
+
+
+@receiver(post_save, sender=UserActivity)
+def push_user_activity(sender, instance, created, **kwargs):
+    """Enviar la actividad nueva a las conexiones en tiempo real al confirmar"""
+    if created:
+        transaction.on_commit(lambda: publish_activity(instance))
+
+
+@receiver(post_delete, sender=get_user_model())
+@receiver(post_delete, sender=TenantConfiguration)
+@receiver(post_delete, sender=RolePermission)
+def record_sync_tombstone(sender, instance, **kwargs):
+    """Registrar el borrado para la sincronización incremental"""
+    record_tombstone(instance)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def purge_tenants_list(sender, instance, signal, created=False, **kwargs):
+    """
+    Invalidar la lista de tenants (users_count) solo cuando un usuario entra,
+    sale o se borra de un tenant; guardar last_login no la toca.
+    """
+    if signal is post_delete or created or instance.membership_changed:
+        purge_instance(Tenant)
+        instance._loaded_membership = (instance.tenant_id, instance.deleted_at)
@@ -0,0 +1,76 @@
+"""
+Tareas del Core App - Arte Ideas
+"""
+from .background import task
+
+
+@task(queue='activity', max_retries=3)
+def record_activity(user_id, tenant_id, action, description, module='', ip_address=None, user_agent='',
+                    params=None):
+    """
+    Registrar una UserActivity fuera del ciclo de la petición. Con params,
+    description es una plantilla ('Creó el usuario {username}').
+    """
+    from .models import ActivityModule, ActivityTemplate, UserActivity, UserAgent
+
+    if tenant_id is None:
+        # La actividad siempre pertenece a un tenant (super admin no tiene)
+        return None
+    activity = UserActivity.objects.create(
+        user_id=user_id,
+        tenant_id=tenant_id,
+        action=action,
+        template_id=ActivityTemplate.intern(description),
+        params=params or None,
+        module_ref_id=ActivityModule.intern(module),
+        agent_id=UserAgent.intern(user_agent),
+        ip_address=ip_address,
+    )
+    return activity.pk
+
+
+@task(max_retries=3)
+def create_user_profile(user_id):
+    """Crear el perfil de un usuario nuevo (idempotente ante reintentos)"""
+    from .models import UserProfile
+
+    # Un solo INSERT; si el perfil ya existe (reintento) no hace nada
+    UserProfile.objects.bulk_create([UserProfile(user_id=user_id)], ignore_conflicts=True)
+    return user_id
+
+
+def log_activity(user, action, description, module='', **params):
+    """
+    Encolar el registro de actividad del usuario de la petición. Los datos
+    variables van como parámetros de la plantilla, no dentro del texto:
+
+        log_activity(request.user, 'delete', 'Eliminó el usuario {username}', 'users', username=username)
+    """
+    return record_activity.delay(user.pk, user.tenant_id, action, description, module, params=params or None)
+
+
+@task(queue='exports')
+def run_export_job(job_id):
+    """Generar el archivo de un ExportJob que ya tiene slot asignado"""
+    from .exports.excel import run_export
+    from .models import ExportJob
+
+    job = ExportJob.objects.select_related('tenant', 'user').filter(pk=job_id, status='running').first()
+    if job is None:
+        # Ya procesado o reclamado por exceder el tiempo
+        return None
+    try:
+        return run_export(job).pk
+    finally:
+        # El slot quedó libre: dárselo al siguiente
+        request_export_dispatch()
+
+
+def request_export_dispatch():
+    """
+    Encolar el despachador de exportaciones: la petición no espera al
+    reparto de slots (se omite si otro despachador ya está corriendo)
+    """
+    from .scheduler import run_scheduled_job
+
+    return run_scheduled_job.delay('dispatch_export_jobs')
@@ -1,14 +1,76 @@
 """
 Tests del Core App - Arte Ideas
 """
-from django.test import TestCase
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+from zipfile import ZipFile
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.urls import reverse
-from rest_framework.test import APITestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import Tenant, UserProfile, RolePermission
+from .background import TaskError, task
+from .admin_mixins import EstimatedCountPaginator
+from .authentication.backends import TenantJWTAuthentication
+from .cache import (
+    LocalLRUCache, TwoTierCache, get_cached_tenant, get_cached_role_permission, get_tenant_setting
+)
+from .configuration.serializers import RolePermissionSerializer, UserManagementSerializer
+from .configuration.provisioning import (
+    DEFAULT_CONFIGS, DEFAULT_ROLES, MAX_PASSWORDS, ProvisioningError, provision_tenants
+)
+from .backfills import parse_description
+from .data_migrations import acquire_lock as acquire_migration_lock, estimate, run_migration
+from .configuration.offboarding import resume_offboarding, run_offboarding, start_offboarding
+from .configuration.snapshot import SnapshotError, apply_snapshot, build_snapshot
+from .configuration.sync import encode_cursor
+from .events import (
+    Event, EventBroker, channels_for_user, event_stream, publish_activity, tenant_admins_channel, user_channel
+)
+from .exports import bulkhead, excel, pdf
+from .exports.streaming import iter_csv
+from .fast_serializers import (
+    FastRolePermissionSerializer, FastUserActivitySerializer, FastUserManagementSerializer
+)
+from .jobs import (
+    ROLLUP_MAX_DAYS, purge_deleted_users, purge_expired_exports, purge_expired_tokens, purge_old_activity,
+    purge_tombstones, rollup_day, rollup_user_activity
+)
+from .loadtest import ASGITransport, run_load
+from .metrics import percentile
+from .models import (
+    Tenant, UserProfile, UserActivity, RolePermission, TenantConfiguration, ScheduledJob, ActivityDailyRollup,
+    ExportJob, TenantOffboarding, DataMigrationRun, ActivityTemplate, UserAgent, Tombstone
+)
+from .models.user import _interned_values
+from .profile.serializers import UserActivitySerializer
+from .renderers import ORJSONRenderer, iter_json_array
+from .response_cache import CACHE_HEADER
+from .scheduler import acquire_lock, due_jobs, ensure_jobs, extend_lock, run_job, run_scheduled_job
+from .tasks import log_activity, record_activity
 
 User = get_user_model()
 
@@ -570,4 +632,1678 @@ class HU01RoleAPITest(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['role'], 'produccion')
-        self.assertEqual(response.data['role_display'], 'Producción')
\ No newline at end of file
+        self.assertEqual(response.data['role_display'], 'Producción')
+
+class SetupTenantsCommandTest(TestCase):
+    """Tests para la generación sintética de setup_tenants"""
+    
+    def test_synthetic_generation(self):
+        """Test generación masiva de tenants, usuarios y actividad"""
+        call_command(
+            'setup_tenants', tenants=3, users_per_tenant=4, activities=5,
+            chunk_size=7, stdout=StringIO()
+        )
+        
+        tenants = Tenant.objects.filter(slug__startswith='sintetico-')
+        self.assertEqual(tenants.count(), 3)
+        self.assertEqual(User.objects.filter(tenant__in=tenants).count(), 12)
+        self.assertEqual(UserProfile.objects.filter(user__tenant__in=tenants).count(), 12)
+        self.assertEqual(UserActivity.objects.filter(tenant__in=tenants).count(), 60)
+        self.assertTrue(RolePermission.objects.filter(tenant=tenants.first()).exists())
+        
+        # Todos comparten el mismo hash calculado una sola vez
+        user = User.objects.filter(tenant__in=tenants).first()
+        self.assertTrue(user.check_password('user123'))
+    
+    def test_synthetic_activity_keeps_created_at_field_intact(self):
+        """Test que la actividad se reparte en el tiempo sin tocar auto_now_add"""
+        call_command(
+            'setup_tenants', tenants=1, users_per_tenant=2, activities=20,
+            chunk_size=7, stdout=StringIO()
+        )
+        
+        self.assertTrue(UserActivity._meta.get_field('created_at').auto_now_add)
+        dates = UserActivity.objects.filter(tenant__slug='sintetico-0').values_list('created_at', flat=True)
+        self.assertGreater(len(set(dates)), 1)
+        self.assertTrue(all(date <= timezone.now() for date in dates))
+    
+    def test_synthetic_generation_is_repeatable(self):
+        """Test que re-ejecutar no duplica tenants ni usuarios"""
+        for _ in range(2):
+            call_command('setup_tenants', tenants=2, users_per_tenant=2, stdout=StringIO())
+        
+        tenants = Tenant.objects.filter(slug__startswith='sintetico-')
+        self.assertEqual(tenants.count(), 2)
+        self.assertEqual(User.objects.filter(tenant__in=tenants).count(), 4)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoadTestHarnessTest(TestCase):
+    """Tests para el harness de pruebas de carga"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(
+            name="Test Studio",
+            business_name="Test Business",
+            business_address="Test Address",
+            business_phone="123456789",
+            business_email="test@test.com",
+            business_ruc="12345678901"
+        )
+        self.admin_user = User.objects.create_user(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass123",
+            tenant=self.tenant,
+            role="admin"
+        )
+        UserProfile.objects.create(user=self.admin_user)
+    
+    def test_percentile(self):
+        """Test percentil por rango más cercano"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+    
+    def test_asgi_journey_report(self):
+        """Test recorrido completo contra la app ASGI en proceso"""
+        report = async_to_sync(run_load)(
+            ASGITransport(), [('admin', 'adminpass123')], users=2, iterations=1
+        )
+        
+        self.assertEqual(report['summary']['errors'], 0)
+        self.assertEqual(report['endpoints']['POST /auth/login/']['count'], 2)
+        self.assertIn('PUT /config/business/edit/', report['endpoints'])
+        for stats in report['endpoints'].values():
+            self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+
+
+class CoreCacheTest(TestCase):
+    """Tests para la cache de dos niveles"""
+    
+    def setUp(self):
+        self.cache = TwoTierCache(LOCAL_MAX_ENTRIES=3, KEY_PREFIX='test')
+        self.tenant = Tenant.objects.create(
+            name="Test Studio",
+            business_name="Test Business",
+            business_address="Test Address",
+            business_phone="123456789",
+            business_email="test@test.com",
+            business_ruc="12345678901"
+        )
+    
+    def test_local_lru_is_bounded(self):
+        """Test que el LRU local no supera su capacidad"""
+        lru = LocalLRUCache(max_entries=2)
+        lru.set('a', 1, 60)
+        lru.set('b', 2, 60)
+        lru.get('a')
+        lru.set('c', 3, 60)
+        self.assertEqual(len(lru), 2)
+        self.assertEqual(lru.get('b'), (False, None))
+        self.assertEqual(lru.get('a'), (True, 1))
+    
+    def test_namespace_invalidation(self):
+        """Test invalidación por generación solo del namespace afectado"""
+        self.cache.set('tenant:1', 'dato', value='a')
+        self.cache.set('tenant:2', 'dato', value='b')
+        self.cache.invalidate('tenant:1')
+        
+        self.assertIsNone(self.cache.get('tenant:1', 'dato'))
+        self.assertEqual(self.cache.get('tenant:2', 'dato'), 'b')
+    
+    def test_single_flight_recompute(self):
+        """Test que hilos concurrentes calculan el valor una sola vez"""
+        calls = []
+        
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return 42
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                self.cache.get_or_set('global', 'lento', compute=compute)
+            ))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(len(calls), 1)
+    
+    def test_early_expiration_recomputes_before_expiry(self):
+        """Test expiración anticipada cuando el cálculo es caro y queda poco tiempo"""
+        key = self.cache.make_key('global', 'caro')
+        self.cache._write(key, 'viejo', delta=1000.0, timeout=1)
+        value = self.cache.get_or_set('global', 'caro', compute=lambda: 'nuevo')
+        self.assertEqual(value, 'nuevo')
+    
+    def test_cached_tenant_lookup(self):
+        """Test que el tenant cacheado no consulta la BD y se invalida al guardar"""
+        get_cached_tenant(self.tenant.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_tenant(self.tenant.id).name, "Test Studio")
+        
+        self.tenant.name = "Renombrado"
+        self.tenant.save()
+        self.assertEqual(get_cached_tenant(self.tenant.id).name, "Renombrado")
+    
+    def test_cached_tenant_is_read_only(self):
+        """Test que el tenant de la cache (y el de request.user) no se puede guardar"""
+        cached = get_cached_tenant(self.tenant.id)
+        cached.name = "Desfasado"
+        with self.assertRaises(ValueError):
+            cached.save()
+        self.assertEqual(Tenant.objects.get(pk=self.tenant.pk).name, "Test Studio")
+        self.assertNotEqual(get_cached_tenant(self.tenant.id).name, "Desfasado")
+        
+        user = User.objects.create_user(username="lector", password="pass123", tenant=self.tenant)
+        authenticated = TenantJWTAuthentication().get_user(RefreshToken.for_user(user).access_token)
+        self.assertTrue(authenticated.tenant.read_only)
+        self.assertFalse(Tenant.objects.get(pk=self.tenant.pk).read_only)
+    
+    def test_role_permission_cache_invalidated_on_save(self):
+        """Test invalidación de permisos cacheados al modificarlos"""
+        permission = RolePermission.objects.create(
+            tenant=self.tenant, role='admin', **RolePermission.get_default_permissions('admin')
+        )
+        self.assertTrue(get_cached_role_permission(self.tenant.id, 'admin').access_gastos)
+        
+        permission.access_gastos = False
+        permission.save()
+        self.assertFalse(get_cached_role_permission(self.tenant.id, 'admin').access_gastos)
+    
+    def test_tenant_configuration_lookup(self):
+        """Test configuración tipada cacheada por tenant"""
+        TenantConfiguration.objects.create(
+            tenant=self.tenant, module='commerce', key='tax_rate', value='18', data_type='float'
+        )
+        self.assertEqual(get_tenant_setting(self.tenant.id, 'commerce', 'tax_rate'), 18.0)
+        self.assertEqual(get_tenant_setting(self.tenant.id, 'crm', 'otra', default='x'), 'x')
+
+
+class ResponseCacheTest(APITestCase):
+    """Tests para la cache de respuestas por tenant y rol"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(
+            name="Test Studio",
+            business_name="Test Business",
+            business_address="Test Address",
+            business_phone="123456789",
+            business_email="test@test.com",
+            business_ruc="12345678901"
+        )
+        self.admin_user = User.objects.create_user(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass123",
+            tenant=self.tenant,
+            role="admin"
+        )
+        RolePermission.objects.create(
+            tenant=self.tenant,
+            role="admin",
+            **RolePermission.get_default_permissions("admin")
+        )
+        refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    
+    def test_hit_skips_view(self):
+        """Test que un acierto devuelve los mismos bytes sin consultar permisos"""
+        url = reverse('core:configuration:permissions_view', kwargs={'role': 'admin'})
+        first = self.client.get(url)
+        self.assertEqual(first[CACHE_HEADER], 'MISS')
+        
+        with self.assertNumQueries(1):  # solo la autenticación del usuario
+            second = self.client.get(url)
+        self.assertEqual(second[CACHE_HEADER], 'HIT')
+        self.assertEqual(second.content, first.content)
+    
+    def test_purged_when_dependency_saved(self):
+        """Test purga automática al guardar un modelo del que depende"""
+        url = reverse('core:configuration:business_view')
+        self.client.get(url)
+        
+        self.tenant.business_name = "Nuevo Nombre"
+        self.tenant.save()
+        
+        response = self.client.get(url)
+        self.assertEqual(response[CACHE_HEADER], 'MISS')
+        self.assertEqual(response.json()['business_name'], "Nuevo Nombre")
+    
+    def test_changes_in_other_tenant_keep_cache(self):
+        """Test que las generaciones van por tenant: otro tenant no purga esta respuesta"""
+        url = reverse('core:configuration:permissions_view', kwargs={'role': 'admin'})
+        self.client.get(url)
+        
+        other = Tenant.objects.create(name="Otro Studio", business_name="Otro")
+        RolePermission.objects.create(tenant=other, role="admin", **RolePermission.get_default_permissions("admin"))
+        self.assertEqual(self.client.get(url)[CACHE_HEADER], 'HIT')
+        
+        permission = RolePermission.objects.get(tenant=self.tenant, role="admin")
+        permission.view_costos = not permission.view_costos
+        permission.save()
+        self.assertEqual(self.client.get(url)[CACHE_HEADER], 'MISS')
+    
+    def test_tenants_list_purged_only_on_membership_change(self):
+        """Test que guardar last_login no purga la lista de tenants y crear un usuario sí"""
+        superadmin = User.objects.create_user(username="root", password="pass123", role="super_admin")
+        self.client.force_authenticate(superadmin)
+        url = reverse('core:configuration:tenants_list')
+        self.client.get(url)
+        
+        user = User.objects.get(pk=self.admin_user.pk)
+        user.last_login = timezone.now()
+        user.save(update_fields=['last_login'])
+        user.first_name = "Ana"
+        user.save()
+        self.assertEqual(self.client.get(url)[CACHE_HEADER], 'HIT')
+        
+        User.objects.create_user(username="nuevo", password="pass123", tenant=self.tenant)
+        response = self.client.get(url)
+        self.assertEqual(response[CACHE_HEADER], 'MISS')
+        self.assertEqual(response.json()[0]['users_count'], 2)
+        
+        User.objects.get(username="nuevo").soft_delete()
+        self.assertEqual(self.client.get(url)[CACHE_HEADER], 'MISS')
+    
+    def test_key_varies_by_query_params(self):
+        """Test que los parámetros de la URL forman parte de la clave"""
+        url = reverse('core:configuration:roles_list')
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)[CACHE_HEADER], 'HIT')
+        self.assertEqual(self.client.get(url, {'page': 2})[CACHE_HEADER], 'MISS')
+    
+    def test_errors_are_not_cached(self):
+        """Test que las respuestas de error no se cachean"""
+        url = reverse('core:configuration:permissions_view', kwargs={'role': 'operario'})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header(CACHE_HEADER))
+
+
+class ORJSONRendererTest(APITestCase):
+    """Tests para el renderer/parser orjson y el modo streaming"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(
+            name="Test Studio",
+            business_name="Test Business",
+            business_address="Test Address",
+            business_phone="123456789",
+            business_email="test@test.com",
+            business_ruc="12345678901"
+        )
+        self.admin_user = User.objects.create_user(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass123",
+            tenant=self.tenant,
+            role="admin"
+        )
+        for i in range(7):
+            User.objects.create_user(
+                username=f"empleado{i}",
+                password="pass123",
+                tenant=self.tenant,
+                role="employee"
+            )
+        refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    
+    def test_renders_same_values_as_drf(self):
+        """Test que Decimal, datetime, UUID y textos perezosos coinciden con DRF"""
+        data = {
+            'total': Decimal('10.50'),
+            'fecha': timezone.now(),
+            'dia': date(2024, 1, 31),
+            'id': uuid.uuid4(),
+            'texto': gettext_lazy('Activo'),
+            'duracion': timedelta(minutes=1),
+        }
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(data)),
+            json.loads(JSONRenderer().render(data))
+        )
+    
+    def test_stream_matches_regular_response(self):
+        """Test que ?stream=true devuelve el mismo listado en bloques"""
+        url = reverse('core:configuration:users_list')
+        regular = self.client.get(url).json()
+        
+        with override_settings(STREAMING_JSON_CHUNK_SIZE=3):
+            response = self.client.get(url, {'stream': 'true'})
+            chunks = list(response.streaming_content)
+        self.assertTrue(response.streaming)
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual(
+            json.loads(b''.join(chunks)),
+            sorted(regular, key=lambda row: row['id'])
+        )
+    
+    async def test_stream_is_async_under_asgi(self):
+        """Test que bajo ASGI los bloques se envían según se leen, sin consumir el iterador entero"""
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.admin_user).access_token))()
+        url = reverse('core:configuration:users_list')
+        with override_settings(STREAMING_JSON_CHUNK_SIZE=3):
+            response = await self.async_client.get(url, {'stream': 'true'}, headers={'authorization': f'Bearer {token}'})
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertTrue(response.is_async)
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual(len(json.loads(b''.join(chunks))), 7)
+    
+    def test_iter_json_array_empty(self):
+        """Test de array vacío en streaming"""
+        self.assertEqual(b''.join(iter_json_array([])), b'[]')
+    
+    def test_invalid_json_is_parse_error(self):
+        """Test que un cuerpo JSON inválido devuelve 400"""
+        url = reverse('core:configuration:business_edit')
+        response = self.client.put(url, data='{"business_name": ', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FastReadSerializerTest(TestCase):
+    """Tests de equivalencia entre los serializers rápidos y los de referencia"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(
+            name="Test Studio",
+            business_name="Test Business",
+            business_address="Test Address",
+            business_phone="123456789",
+            business_email="test@test.com",
+            business_ruc="12345678901"
+        )
+        self.user = User.objects.create_user(
+            username="admin",
+            password="adminpass123",
+            tenant=self.tenant,
+            role="admin"
+        )
+        User.objects.create_user(
+            username="inactivo",
+            password="pass123",
+            tenant=self.tenant,
+            role="employee",
+            is_active=False
+        )
+        for minutes in (0, 5, 120, 3000):
+            activity = UserActivity.objects.create(
+                user=self.user, tenant=self.tenant, action='login', description='Inició sesión'
+            )
+            UserActivity.objects.filter(pk=activity.pk).update(
+                created_at=timezone.now() - timedelta(minutes=minutes)
+            )
+        for role in ('admin', 'employee'):
+            RolePermission.objects.create(
+                tenant=self.tenant, role=role, **RolePermission.get_default_permissions(role)
+            )
+    
+    def test_user_management_output_is_identical(self):
+        users = User.objects.filter(tenant=self.tenant).order_by('id')
+        self.assertEqual(
+            FastUserManagementSerializer(users, many=True).data,
+            UserManagementSerializer(users, many=True).data
+        )
+    
+    def test_user_activity_output_is_identical(self):
+        activities = UserActivity.objects.filter(user=self.user).order_by('-created_at')
+        self.assertEqual(
+            FastUserActivitySerializer(activities, many=True).data,
+            UserActivitySerializer(activities, many=True).data
+        )
+    
+    def test_role_permission_output_is_identical_from_instances(self):
+        permissions = list(RolePermission.objects.filter(tenant=self.tenant))
+        self.assertEqual(
+            FastRolePermissionSerializer(permissions, many=True).data,
+            RolePermissionSerializer(permissions, many=True).data
+        )
+        self.assertEqual(
+            FastRolePermissionSerializer(permissions[0]).data,
+            RolePermissionSerializer(permissions[0]).data
+        )
+
+
+class SparseFieldsetTest(APITestCase):
+    """Tests para ?fields= / ?exclude= y su traducción a la consulta"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(
+            name="Test Studio",
+            business_name="Test Business",
+            business_address="Test Address",
+            business_phone="123456789",
+            business_email="test@test.com",
+            business_ruc="12345678901"
+        )
+        self.admin_user = User.objects.create_user(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass123",
+            tenant=self.tenant,
+            role="admin"
+        )
+        UserProfile.objects.create(user=self.admin_user)
+        User.objects.create_user(username="empleado", password="pass123", tenant=self.tenant, role="employee")
+        refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    
+    def test_profile_fields_trim_output_and_queries(self):
+        """Test que solo se devuelven los campos pedidos, sin releer el usuario autenticado"""
+        url = reverse('core:profile:profile_view')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {'fields': 'id,username'})
+        self.assertEqual(response.json(), {'id': self.admin_user.id, 'username': 'admin'})
+        # el usuario solo lo lee la autenticación y el perfil no hace falta
+        sql = [query['sql'] for query in ctx.captured_queries]
+        self.assertEqual(sum('FROM "core_user"' in query for query in sql), 1)
+        self.assertFalse(any('"core_userprofile"' in query for query in sql))
+    
+    def test_profile_nested_fields_load_only_needed_relations(self):
+        """Test que solo se carga el perfil anidado; el tenant ya viene de la autenticación"""
+        url = reverse('core:profile:profile_view')
+        full = self.client.get(url).json()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {'fields': 'full_name,tenant_name,profile'})
+        self.assertEqual(response.json(), {
+            key: full[key] for key in ('full_name', 'tenant_name', 'profile')
+        })
+        # autenticación + el perfil
+        self.assertEqual(len(ctx.captured_queries), 2)
+    
+    def test_exclude_on_fast_list(self):
+        """Test de ?exclude= en el listado de usuarios"""
+        url = reverse('core:configuration:users_list')
+        rows = self.client.get(url, {'exclude': 'email,phone,role_display'}).json()
+        self.assertEqual(len(rows), 1)
+        self.assertNotIn('email', rows[0])
+        self.assertNotIn('role_display', rows[0])
+        self.assertEqual(rows[0]['status_display'], 'Activo')
+    
+    def test_tenant_fields(self):
+        """Test de ?fields= en la configuración del negocio"""
+        url = reverse('core:configuration:business_view')
+        response = self.client.get(url, {'fields': 'name,currency_display'})
+        self.assertEqual(set(response.json()), {'name', 'currency_display'})
+
+
+class AsyncEndpointsTest(APITestCase):
+    """Tests para las variantes async de los endpoints de lectura"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(
+            name="Test Studio",
+            business_name="Test Business",
+            business_address="Test Address",
+            business_phone="123456789",
+            business_email="test@test.com",
+            business_ruc="12345678901"
+        )
+        self.admin_user = User.objects.create_user(
+            username="admin",
+            email="admin@test.com",
+            password="adminpass123",
+            tenant=self.tenant,
+            role="admin",
+            first_name="Ana"
+        )
+        UserProfile.objects.create(user=self.admin_user)
+        RolePermission.objects.create(
+            tenant=self.tenant, role="admin", **RolePermission.get_default_permissions("admin")
+        )
+        UserActivity.objects.create(
+            user=self.admin_user, tenant=self.tenant, action='login', description='Inició sesión'
+        )
+        log_activity(self.admin_user, 'update', 'Actualizó el usuario {username}', 'users', username='maria')
+        self.token = str(RefreshToken.for_user(self.admin_user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+    
+    def test_same_output_as_sync_views(self):
+        """Test que cada endpoint async devuelve lo mismo que su versión DRF"""
+        pairs = [
+            ('core:profile:profile_view', 'core:async_api:profile_view', {}),
+            ('core:profile:activity', 'core:async_api:activity', {}),
+            ('core:profile:completion', 'core:async_api:completion', {}),
+            ('core:configuration:business_view', 'core:async_api:business_view', {}),
+            ('core:configuration:roles_list', 'core:async_api:roles_list', {}),
+            ('core:configuration:permissions_view', 'core:async_api:permissions_view', {'role': 'admin'}),
+        ]
+        for sync_name, async_name, kwargs in pairs:
+            with self.subTest(endpoint=async_name):
+                expected = self.client.get(reverse(sync_name, kwargs=kwargs))
+                response = self.client.get(reverse(async_name, kwargs=kwargs))
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.json(), expected.json())
+    
+    def test_authentication_errors_match_drf(self):
+        """Test de 401 sin token y con token inválido"""
+        self.client.credentials()
+        for headers in ({}, {'HTTP_AUTHORIZATION': 'Bearer invalido'}):
+            expected = self.client.get(reverse('core:profile:profile_view'), **headers)
+            response = self.client.get(reverse('core:async_api:profile_view'), **headers)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(response.json(), expected.json())
+            self.assertEqual(response['WWW-Authenticate'], expected['WWW-Authenticate'])
+    
+    def test_method_not_allowed(self):
+        """Test de 405 para métodos que la vista async no admite"""
+        response = self.client.post(reverse('core:async_api:profile_view'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+    
+    async def test_templated_activity_with_cold_cache(self):
+        """Test que la actividad con plantilla se sirve en el event loop sin cache de dimensiones"""
+        _interned_values.clear()
+        response = await self.async_client.get(
+            reverse('core:async_api:activity'), headers={'authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            {'description': 'Actualizó el usuario maria', 'module': 'users'},
+            [{'description': row['description'], 'module': row['module']} for row in response.json()]
+        )
+    
+    async def test_runs_under_async_client(self):
+        """Test con el cliente ASGI (sin hilos por petición)"""
+        response = await self.async_client.get(
+            reverse('core:async_api:profile_view'),
+            {'fields': 'username,profile'},
+            headers={'authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()), {'username', 'profile'})
+
+
+class RealtimeEventsTest(TestCase):
+    """Tests para el broker de eventos y el canal SSE"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(
+            name="Test Studio",
+            business_name="Test Business",
+            business_address="Test Address",
+            business_phone="123456789",
+            business_email="test@test.com",
+            business_ruc="12345678901"
+        )
+        self.admin_user = User.objects.create_user(
+            username="admin", password="adminpass123", tenant=self.tenant, role="admin"
+        )
+        self.employee = User.objects.create_user(
+            username="empleado", password="pass123", tenant=self.tenant, role="employee"
+        )
+    
+    async def test_fan_out_to_user_and_tenant_admins(self):
+        """Test que un evento llega al usuario y a los admins, publicado desde otro hilo"""
+        broker = EventBroker(BACKEND='apps.core.events.LocalBackend')
+        admin = broker.subscribe(channels_for_user(self.admin_user))
+        employee = broker.subscribe(channels_for_user(self.employee))
+        other = broker.subscribe([user_channel(999)])
+        
+        thread = threading.Thread(target=broker.publish, args=(
+            'activity', {'action': 'login'}, [user_channel(self.employee.pk), tenant_admins_channel(self.tenant.pk)]
+        ))
+        thread.start()
+        thread.join()
+        
+        self.assertEqual((await admin.get(1)).data, {'action': 'login'})
+        self.assertEqual((await employee.get(1)).type, 'activity')
+        self.assertIsNone(await other.get(0.05))
+    
+    async def test_events_published_while_disconnected_are_replayed(self):
+        """Test que lo publicado sin nadie conectado se recupera al reconectar con Last-Event-ID"""
+        broker = EventBroker(BACKEND='apps.core.events.LocalBackend')
+        subscription = broker.subscribe(channels_for_user(self.employee))
+        seen = broker.publish('notification', {'n': 0}, [user_channel(self.employee.pk)])
+        self.assertEqual((await subscription.get(1)).id, seen.id)
+        subscription.close()
+        
+        activity = await UserActivity.objects.acreate(
+            user=self.employee, tenant=self.tenant, action='create', description='Creó un pedido'
+        )
+        with mock.patch('apps.core.events.broker', broker):
+            await sync_to_async(publish_activity)(activity)
+        
+        subscription = broker.subscribe(channels_for_user(self.employee), last_event_id=seen.id)
+        event = await subscription.get(1)
+        self.assertEqual((event.type, event.data['description']), ('activity', 'Creó un pedido'))
+    
+    async def test_slow_consumer_is_dropped(self):
+        """Test de backpressure: cola acotada y cierre tras demasiados descartes"""
+        broker = EventBroker(BACKEND='apps.core.events.LocalBackend', QUEUE_SIZE=2, MAX_DROPPED=2)
+        subscription = broker.subscribe([user_channel(1)])
+        for i in range(4):
+            subscription.offer(Event('notification', {'n': i}, [user_channel(1)]))
+        self.assertFalse(subscription.closed)
+        self.assertEqual((await subscription.get(1)).data, {'n': 2})
+        
+        for i in range(5):
+            subscription.offer(Event('notification', {'n': i}, [user_channel(1)]))
+        self.assertTrue(subscription.closed)
+        self.assertEqual(broker.subscriber_count(), 0)
+    
+    async def test_idle_connection_is_closed(self):
+        """Test de keep-alive y cierre por inactividad"""
+        broker = EventBroker(BACKEND='apps.core.events.LocalBackend')
+        subscription = broker.subscribe([user_channel(1)])
+        chunks = [chunk async for chunk in event_stream(subscription, heartbeat=0.01, idle_timeout=0.05)]
+        self.assertTrue(chunks[0].startswith(b'retry:'))
+        self.assertIn(b': ping\n\n', chunks)
+        self.assertIn(b'"idle"', chunks[-1])
+        self.assertEqual(broker.subscriber_count(), 0)
+    
+    async def test_sse_endpoint_pushes_new_activity(self):
+        """Test de extremo a extremo: UserActivity nueva llega por el canal SSE"""
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.admin_user).access_token))()
+        response = await self.async_client.get(reverse('core:async_api:events'), {'token': token})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+        
+        def create_activity():
+            with self.captureOnCommitCallbacks(execute=True):
+                UserActivity.objects.create(
+                    user=self.employee, tenant=self.tenant, action='create', description='Creó un pedido'
+                )
+        await sync_to_async(create_activity)()
+        
+        chunk = await asyncio.wait_for(anext(stream), 2)
+        self.assertIn(b'event: activity', chunk)
+        self.assertIn('Creó un pedido'.encode(), chunk)
+        await stream.aclose()
+
+
+_flaky_calls = []
+
+
+@task(name='tests.flaky', max_retries=2, retry_backoff=0)
+def flaky_task(fail_times):
+    _flaky_calls.append(fail_times)
+    if len(_flaky_calls) <= fail_times:
+        raise ValueError('fallo temporal')
+    return len(_flaky_calls)
+
+
+@task(name='tests.slow', queue='tests-serial')
+def slow_task(seconds):
+    start = time.monotonic()
+    time.sleep(seconds)
+    return start
+
+
+class BackgroundTasksTest(TestCase):
+    """Tests para la capa de tareas en segundo plano"""
+    
+    def setUp(self):
+        _flaky_calls.clear()
+    
+    def test_eager_retries_and_result(self):
+        """Test de reintentos y resultado guardado en modo eager"""
+        result = flaky_task.delay(2)
+        self.assertEqual(result.status, 'SUCCESS')
+        self.assertEqual(result.get(timeout=1), 3)
+        
+        _flaky_calls.clear()
+        with self.assertLogs('apps.core.background', 'ERROR'):
+            result = flaky_task.delay(5)
+        self.assertEqual(result.status, 'FAILURE')
+        with self.assertRaises(TaskError):
+            result.get(timeout=1)
+    
+    def test_local_backend_runs_after_commit_with_queue_concurrency(self):
+        """Test del backend local: espera al commit y respeta la concurrencia de la cola"""
+        config = {'BACKEND': 'local', 'QUEUES': {'tests-serial': 1}}
+        with override_settings(CORE_TASKS=config):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                first = slow_task.delay(0.05)
+                second = slow_task.delay(0.05)
+            self.assertEqual(first.status, 'PENDING')
+            for callback in callbacks:
+                callback()
+            starts = sorted([first.get(timeout=2), second.get(timeout=2)])
+        self.assertGreaterEqual(starts[1] - starts[0], 0.05)
+    
+    def test_core_side_effects_use_tasks(self):
+        """Test que crear un usuario encola la actividad"""
+        tenant = Tenant.objects.create(name="Test Studio", business_name="Test Business")
+        admin = User.objects.create_user(username="admin", password="adminpass123", tenant=tenant, role="admin")
+        api = APIClient()
+        api.force_authenticate(admin)
+        with mock.patch.object(record_activity, 'delay', wraps=record_activity.delay) as delayed:
+            response = api.post(reverse('core:configuration:users_create'), {
+                'username': 'nuevo',
+                'email': 'nuevo@test.com',
+                'role': 'admin',
+                'password': 'ClaveSegura-123',
+                'confirm_password': 'ClaveSegura-123',
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        delayed.assert_called_once()
+        self.assertTrue(UserProfile.objects.filter(user__username='nuevo').exists())
+        self.assertTrue(UserActivity.objects.filter(user=admin, action='create').exists())
+    
+    def test_new_user_has_profile_before_tasks_run(self):
+        """Test que el perfil se crea en la petición aunque la cola no haya corrido"""
+        tenant = Tenant.objects.create(name="Test Studio", business_name="Test Business")
+        admin = User.objects.create_user(username="admin", password="adminpass123", tenant=tenant, role="admin")
+        api = APIClient()
+        api.force_authenticate(admin)
+        with override_settings(CORE_TASKS={'BACKEND': 'local'}):
+            with self.captureOnCommitCallbacks(execute=False):
+                response = api.post(reverse('core:configuration:users_create'), {
+                    'username': 'nuevo',
+                    'email': 'nuevo@test.com',
+                    'role': 'admin',
+                    'password': 'ClaveSegura-123',
+                    'confirm_password': 'ClaveSegura-123',
+                }, format='json')
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+                self.assertTrue(UserProfile.objects.filter(user__username='nuevo').exists())
+                self.assertFalse(UserActivity.objects.filter(user=admin, action='create').exists())
+
+
+class ScheduledJobsTest(TestCase):
+    """Tests para los trabajos periódicos de mantenimiento"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Studio", business_name="Test Business")
+        self.user = User.objects.create_user(username="testuser", password="testpass123", tenant=self.tenant)
+    
+    def test_run_records_status_and_lock_blocks_concurrent_runs(self):
+        """Test que la ejecución queda registrada y el lock evita ejecuciones simultáneas"""
+        self.assertEqual(run_job('warm_caches'), {'tenants': 1})
+        job = ScheduledJob.objects.get(name='warm_caches')
+        self.assertEqual(job.last_status, 'success')
+        self.assertEqual(job.run_count, 1)
+        self.assertIsNotNone(job.last_duration_ms)
+        self.assertIsNone(job.locked_until)
+        self.assertNotIn('warm_caches', due_jobs())
+        
+        self.assertTrue(acquire_lock('warm_caches', 'otro-worker'))
+        self.assertIsNone(run_job('warm_caches', force=True))
+        self.assertEqual(ScheduledJob.objects.get(name='warm_caches').run_count, 1)
+    
+    def test_registered_rows_are_created_only_on_first_run(self):
+        """Test que run_job solo crea las filas de los trabajos cuando falta la suya"""
+        ScheduledJob.objects.all().delete()
+        with mock.patch('apps.core.scheduler.ensure_jobs', wraps=ensure_jobs) as ensured:
+            run_job('warm_caches')
+            run_job('warm_caches', force=True)
+        self.assertEqual(ensured.call_count, 1)
+        self.assertEqual(ScheduledJob.objects.get(name='warm_caches').run_count, 2)
+    
+    def test_purge_expired_tokens_in_batches(self):
+        """Test del borrado por lotes de tokens caducados"""
+        from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+        
+        for _ in range(5):
+            RefreshToken.for_user(self.user)
+        OutstandingToken.objects.update(expires_at=timezone.now() - timedelta(days=1))
+        RefreshToken.for_user(self.user)
+        
+        self.assertEqual(purge_expired_tokens(batch_size=2, max_batches=2), {'deleted': 4, 'pending': True})
+        self.assertEqual(purge_expired_tokens(batch_size=2, max_batches=2), {'deleted': 1, 'pending': False})
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+    
+    def test_activity_rollup_is_idempotent(self):
+        """Test que repetir el resumen de actividad no duplica filas"""
+        for action in ['login', 'login', 'update']:
+            UserActivity.objects.create(user=self.user, tenant=self.tenant, action=action, description='x')
+        
+        rollup_user_activity(batch_size=100, max_batches=1)
+        rollup_user_activity(batch_size=100, max_batches=1)
+        counts = dict(ActivityDailyRollup.objects.values_list('action', 'count'))
+        self.assertEqual(counts, {'login': 2, 'update': 1})
+    
+    @override_settings(CORE_SCHEDULER={'ACTIVITY_RETENTION_DAYS': 30})
+    def test_activity_rollup_crosses_long_gap(self):
+        """Test que el resumen avanza aunque haya más de ROLLUP_MAX_DAYS días sin actividad"""
+        old = UserActivity.objects.create(user=self.user, tenant=self.tenant, action='login', description='x')
+        UserActivity.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=ROLLUP_MAX_DAYS + 20))
+        rollup_user_activity(batch_size=100, max_batches=1)
+        
+        UserActivity.objects.create(user=self.user, tenant=self.tenant, action='update', description='x')
+        rollup_user_activity(batch_size=100, max_batches=1)
+        rollup_user_activity(batch_size=100, max_batches=1)
+        self.assertTrue(ActivityDailyRollup.objects.filter(day=timezone.localdate(), action='update').exists())
+        
+        self.assertEqual(purge_old_activity(batch_size=100, max_batches=1)['deleted'], 1)
+        self.assertFalse(UserActivity.objects.filter(pk=old.pk).exists())
+
+
+class CSVExportTest(APITestCase):
+    """Tests para las exportaciones CSV en streaming"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Studio", business_name="Test Business")
+        self.other_tenant = Tenant.objects.create(name="Otro Studio", business_name="Otro Business")
+        self.admin = User.objects.create_user(username="admin", password="adminpass123", tenant=self.tenant, role="admin")
+        self.employee = User.objects.create_user(username="empleado", password="pass123", tenant=self.tenant, first_name="=SUMA(A1)")
+        User.objects.create_user(username="ajeno", password="pass123", tenant=self.other_tenant)
+    
+    def read_csv(self, response):
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        return [line.split(',') for line in content.splitlines()]
+    
+    def test_users_export_is_tenant_scoped_and_escapes_formulas(self):
+        """Test que la exportación de usuarios respeta el tenant y neutraliza fórmulas"""
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('core:exports:users_csv'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('attachment; filename="usuarios_', response['Content-Disposition'])
+        rows = self.read_csv(response)
+        self.assertEqual(rows[0][:3], ['id', 'usuario', 'email'])
+        self.assertEqual(sorted(row[1] for row in rows[1:]), ['admin', 'empleado'])
+        self.assertIn("'=SUMA(A1)", [row[3] for row in rows[1:]])
+    
+    def test_role_permissions(self):
+        """Test que solo admin exporta usuarios y los demás solo su actividad"""
+        UserActivity.objects.create(user=self.admin, tenant=self.tenant, action='login', description='admin')
+        UserActivity.objects.create(user=self.employee, tenant=self.tenant, action='login', description='propia')
+        self.client.force_authenticate(self.employee)
+        
+        response = self.client.get(reverse('core:exports:users_csv'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        
+        rows = self.read_csv(self.client.get(reverse('core:exports:activity_csv')))
+        descriptions = [row[4] for row in rows[1:]]
+        self.assertIn('propia', descriptions)
+        self.assertNotIn('admin', descriptions)
+    
+    def test_csv_is_written_in_chunks(self):
+        """Test que el CSV se genera en bloques sin acumular las filas"""
+        chunks = list(iter_csv(['n'], ([i] for i in range(10)), chunk_size=4))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(b''.join(chunks).decode('utf-8-sig').split(), ['n'] + [str(i) for i in range(10)])
+
+
+class ExcelExportJobTest(APITestCase):
+    """Tests para las exportaciones Excel en segundo plano"""
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        
+        self.tenant = Tenant.objects.create(name="Test Studio", business_name="Test Business")
+        self.admin = User.objects.create_user(username="admin", password="adminpass123", tenant=self.tenant, role="admin")
+        self.employee = User.objects.create_user(username="empleado", password="pass123", tenant=self.tenant)
+    
+    def test_job_runs_and_file_downloads_until_expiry(self):
+        """Test del ciclo completo: encolar, consultar progreso, descargar y expirar"""
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(reverse('core:exports:jobs_create'), {'export_type': 'users'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'completed')
+        job_id = response.data['id']
+        
+        response = self.client.get(reverse('core:exports:job_view', kwargs={'job_id': job_id}))
+        self.assertEqual(response.data['progress'], 100)
+        self.assertEqual(response.data['total_rows'], 2)
+        
+        response = self.client.get(reverse('core:exports:job_download', kwargs={'job_id': job_id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        workbook = ZipFile(BytesIO(b''.join(response.streaming_content)))
+        self.assertIn('xl/worksheets/sheet1.xml', workbook.namelist())
+        
+        ExportJob.objects.filter(pk=job_id).update(expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(purge_expired_exports(batch_size=10, max_batches=1), {'expired': 1, 'pending': False})
+        response = self.client.get(reverse('core:exports:job_download', kwargs={'job_id': job_id}))
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+    
+    def test_permissions_and_ownership(self):
+        """Test que solo admin exporta usuarios y cada usuario ve sus trabajos"""
+        self.client.force_authenticate(self.employee)
+        response = self.client.post(reverse('core:exports:jobs_create'), {'export_type': 'users'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.post(reverse('core:exports:jobs_create'), {'export_type': 'activity'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('core:exports:job_view', kwargs={'job_id': response.data['id']}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_workbook_rolls_over_sheets_and_reports_progress(self):
+        """Test que el libro abre otra hoja al llenarse y reporta el progreso por bloques"""
+        path = f'{self.media_root}/test.xlsx'
+        progress = []
+        with mock.patch.object(excel, 'SHEET_MAX_ROWS', 4):
+            written = excel.write_workbook(path, 'Datos', ['n'], ([i] for i in range(7)), progress.append, chunk_size=3)
+        self.assertEqual(written, 7)
+        self.assertEqual(progress, [3, 6])
+        sheets = [name for name in ZipFile(path).namelist() if name.startswith('xl/worksheets/sheet')]
+        self.assertEqual(len(sheets), 3)
+
+
+class PDFDocumentTest(APITestCase):
+    """Tests para el servicio de documentos PDF"""
+    
+    def setUp(self):
+        cache.clear()
+        self.tenant = Tenant.objects.create(name="Test Studio", business_name="Test Business", business_ruc="20123456789")
+        self.admin = User.objects.create_user(username="admin", password="adminpass123", tenant=self.tenant, role="admin")
+        for role in ['admin', 'employee']:
+            RolePermission.objects.create(tenant=self.tenant, role=role, **RolePermission.get_default_permissions(role))
+    
+    def test_configuration_report_is_cached_and_revalidated(self):
+        """Test que el reporte se renderiza una vez y se revalida con ETag"""
+        self.client.force_authenticate(self.admin)
+        url = reverse('core:exports:configuration_pdf')
+        with mock.patch.object(pdf, 'render_template', wraps=pdf.render_template) as rendered:
+            first = self.client.get(url)
+            second = self.client.get(url)
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('20123456789', first.content.decode())
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(rendered.call_count, 1)
+        
+        self.tenant.business_name = "Nuevo Nombre"
+        self.tenant.save()
+        third = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(third.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(third['ETag'], first['ETag'])
+    
+    def test_render_documents_in_process_pool(self):
+        """Test del render en paralelo en el pool de procesos"""
+        requests = [('pdf/base.html', {'tenant': {'name': f'Estudio {i}'}}) for i in range(3)]
+        with override_settings(EXPORT_SETTINGS={'PDF': {'ENGINE': 'html', 'WORKERS': 2}}):
+            self.addCleanup(pdf.shutdown_pool)
+            documents = pdf.render_documents(requests)
+            cached = pdf.render_documents(requests[:1])
+        self.assertEqual([document.cached for document in documents], [False] * 3)
+        self.assertIn('Estudio 2', documents[2].content.decode())
+        self.assertTrue(cached[0].cached)
+
+
+@override_settings(EXPORT_SETTINGS={'BULKHEAD': {
+    'GLOBAL_SLOTS': 3,
+    'TIERS': {'lima': {'slots': 2, 'weight': 2}, 'provincia': {'slots': 1, 'weight': 1}},
+}})
+class ExportBulkheadTest(APITestCase):
+    """Tests para los slots de concurrencia de las exportaciones"""
+    
+    def setUp(self):
+        self.lima = Tenant.objects.create(name="Lima", business_name="Lima SAC", location_type='lima')
+        self.provincia = Tenant.objects.create(name="Provincia", business_name="Prov SAC", location_type='provincia')
+        self.otra = Tenant.objects.create(name="Otra", business_name="Otra SAC", location_type='provincia')
+        self.users = {
+            tenant.pk: User.objects.create_user(username=f"admin_{tenant.slug}", password="pass123", tenant=tenant, role="admin")
+            for tenant in (self.lima, self.provincia, self.otra)
+        }
+    
+    def queue(self, tenant, count):
+        return [
+            ExportJob.objects.create(tenant=tenant, user=self.users[tenant.pk], export_type='permissions')
+            for _ in range(count)
+        ]
+    
+    def test_dispatch_respects_slots_and_shares_fairly(self):
+        """Test que el despacho respeta los topes y reparte entre tenants"""
+        self.queue(self.lima, 5)
+        self.queue(self.provincia, 3)
+        with mock.patch('apps.core.tasks.run_export_job.delay') as delayed:
+            result = bulkhead.dispatch()
+        self.assertEqual(result['started'], 3)
+        self.assertEqual(delayed.call_count, 3)
+        running = dict(ExportJob.objects.filter(status='running').values_list('tenant_id').annotate(n=Count('id')))
+        self.assertEqual(running, {self.lima.pk: 2, self.provincia.pk: 1})
+        
+        # Un tenant nuevo entra por delante de la cola acumulada de los demás
+        late = self.queue(self.otra, 1)[0]
+        positions = bulkhead.queue_positions()
+        self.assertEqual(positions[late.pk], 1)
+        self.assertEqual(sorted(positions.values()), list(range(1, 7)))
+    
+    def test_job_api_reports_queue_position_and_metrics(self):
+        """Test de la posición en cola en la API y de las métricas de slots"""
+        ExportJob.objects.create(tenant=self.provincia, user=self.users[self.provincia.pk],
+                                 export_type='users', status='running', started_at=timezone.now())
+        self.client.force_authenticate(self.users[self.provincia.pk])
+        response = self.client.post(reverse('core:exports:jobs_create'), {'export_type': 'permissions'}, format='json')
+        self.assertEqual(response.data['status'], 'pending')
+        self.assertEqual(response.data['queue_position'], 1)
+        
+        super_admin = User.objects.create_user(username="root", password="pass123", role="super_admin")
+        self.client.force_authenticate(super_admin)
+        response = self.client.get(reverse('core:exports:jobs_metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['slots']['running'], 1)
+        self.assertEqual(response.data['tenants'][0]['pending'], 1)
+    
+    def test_create_enqueues_dispatch_instead_of_running_it(self):
+        """Test que crear la exportación encola el despachador sin ejecutarlo en la petición"""
+        self.client.force_authenticate(self.users[self.lima.pk])
+        with mock.patch.object(run_scheduled_job, 'delay') as delayed:
+            response = self.client.post(reverse('core:exports:jobs_create'), {'export_type': 'permissions'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        delayed.assert_called_once_with('dispatch_export_jobs')
+        self.assertEqual(response.data['status'], 'pending')
+
+
+class ConfigurationSnapshotTest(APITestCase):
+    """Tests para el snapshot de configuración del tenant"""
+    
+    def setUp(self):
+        self.source = Tenant.objects.create(name="Origen", business_name="Origen SAC", currency='USD')
+        self.target = Tenant.objects.create(name="Destino", business_name="Destino SAC")
+        for tenant in (self.source, self.target):
+            RolePermission.objects.create(tenant=tenant, role='admin', **RolePermission.get_default_permissions('admin'))
+        RolePermission.objects.filter(tenant=self.source, role='admin').update(access_gastos=False)
+        TenantConfiguration.objects.create(tenant=self.source, module='general', key='igv', value='18', data_type='integer')
+        TenantConfiguration.objects.create(tenant=self.target, module='general', key='igv', value='19', data_type='integer')
+        TenantConfiguration.objects.create(tenant=self.target, module='general', key='old', value='x')
+        self.admin = User.objects.create_user(username="admin_destino", password="pass123", tenant=self.target, role="admin")
+    
+    def test_round_trip_copies_configuration(self):
+        """Test que un snapshot copia negocio, permisos y parámetros a otro tenant"""
+        snapshot = build_snapshot(self.source)
+        self.assertEqual(get_tenant_setting(self.target.pk, 'general', 'igv'), 19)
+        
+        summary = apply_snapshot(self.target, snapshot, prune=True)
+        self.assertEqual(summary['pruned'], 1)
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.currency, 'USD')
+        self.assertEqual(self.target.business_name, 'Origen SAC')
+        self.assertFalse(RolePermission.objects.get(tenant=self.target, role='admin').access_gastos)
+        self.assertFalse(TenantConfiguration.objects.filter(tenant=self.target, key='old').exists())
+        # Las escrituras en bloque invalidan la cache del tenant
+        self.assertEqual(get_tenant_setting(self.target.pk, 'general', 'igv'), 18)
+    
+    def test_invalid_snapshot_is_rejected_without_changes(self):
+        """Test que un snapshot inválido no aplica nada"""
+        snapshot = build_snapshot(self.source)
+        snapshot['configuration']['rows'].append(['no_existe', 'clave', '1', 'string', '', True])
+        with self.assertRaises(SnapshotError):
+            apply_snapshot(self.target, snapshot)
+        with self.assertRaises(SnapshotError):
+            apply_snapshot(self.target, {**snapshot, 'version': 99})
+        self.assertEqual(TenantConfiguration.objects.get(tenant=self.target, key='igv').value, '19')
+    
+    def test_snapshot_rejects_unknown_roles(self):
+        """Test que el snapshot solo admite los roles definidos en el modelo"""
+        snapshot = build_snapshot(self.source)
+        snapshot['role_permissions']['rows'][0][0] = 'cajero'
+        with self.assertRaises(SnapshotError) as raised:
+            apply_snapshot(self.target, snapshot)
+        self.assertEqual(raised.exception.args[0]['role_permissions[0]'], {'role': ['Rol inválido']})
+        self.assertFalse(RolePermission.objects.filter(role='cajero').exists())
+    
+    def test_snapshot_endpoints(self):
+        """Test de los endpoints de exportación e importación"""
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('core:configuration:snapshot_export'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['source']['slug'], self.target.slug)
+        
+        response = self.client.post(reverse('core:configuration:snapshot_import'), build_snapshot(self.source), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['configuration'], 1)
+        self.assertTrue(TenantConfiguration.objects.filter(tenant=self.target, key='old').exists())
+        
+        response = self.client.post(reverse('core:configuration:snapshot_import'), {'format': 'otro'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TenantProvisioningTest(APITestCase):
+    """Tests para el alta de tenants por lotes"""
+    
+    def specs(self, count):
+        return [
+            {
+                'slug': f'estudio-{i}', 'name': f'Estudio {i}', 'business_name': f'Estudio {i} SAC',
+                'admin': {'username': f'admin-{i}', 'email': f'admin{i}@estudio.test', 'password': 'Clave-Segura-123'},
+            }
+            for i in range(count)
+        ]
+    
+    def test_provision_batch_is_bulk_and_idempotent(self):
+        """Test que el alta crea todo con pocas sentencias y se puede repetir"""
+        with mock.patch('apps.core.configuration.provisioning.make_password', return_value='hash') as hasher:
+            with self.assertNumQueries(12):
+                results = provision_tenants(self.specs(5))
+        self.assertEqual(hasher.call_count, 5)
+        self.assertTrue(all(result['created'] and result['admin_created'] for result in results))
+        self.assertTrue(all(result['invite'] is None for result in results))
+        self.assertEqual(RolePermission.objects.count(), 5 * len(DEFAULT_ROLES))
+        self.assertEqual(TenantConfiguration.objects.count(), 5 * len(DEFAULT_CONFIGS))
+        self.assertEqual(UserProfile.objects.filter(user__role='admin').count(), 5)
+        
+        # Repetir el lote completa lo que falte sin duplicar
+        RolePermission.objects.filter(tenant__slug='estudio-0').delete()
+        results = provision_tenants(self.specs(6))
+        self.assertEqual([result['created'] for result in results], [False] * 5 + [True])
+        self.assertEqual(RolePermission.objects.count(), 6 * len(DEFAULT_ROLES))
+        self.assertEqual(User.objects.count(), 6)
+    
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+    def test_admins_never_share_a_hash(self):
+        """Test que administradores con la misma contraseña tienen sal y hash distintos"""
+        provision_tenants(self.specs(3))
+        admins = User.objects.filter(username__startswith='admin-')
+        self.assertEqual(len({admin.password for admin in admins}), 3)
+        self.assertTrue(all(admin.check_password('Clave-Segura-123') for admin in admins))
+    
+    def test_admin_without_password_gets_invite(self):
+        """Test que el admin sin contraseña no se hashea y elige la suya con la invitación"""
+        specs = self.specs(2)
+        for spec in specs:
+            del spec['admin']['password']
+        with mock.patch('apps.core.configuration.provisioning.make_password', wraps=make_password) as hasher:
+            results = provision_tenants(specs)
+        self.assertTrue(all(call.args == (None,) for call in hasher.call_args_list))
+        admin = User.objects.get(username='admin-0')
+        self.assertFalse(admin.has_usable_password())
+        
+        url = reverse('core:authentication:set_password')
+        payload = {**results[0]['invite'], 'new_password': 'Nueva-Clave-456', 'confirm_password': 'Nueva-Clave-456'}
+        self.assertEqual(self.client.post(url, payload, format='json').status_code, status.HTTP_200_OK)
+        admin.refresh_from_db()
+        self.assertTrue(admin.check_password('Nueva-Clave-456'))
+        # La invitación no sirve dos veces ni para otro usuario
+        self.assertEqual(self.client.post(url, payload, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        other = {**payload, 'uid': results[1]['invite']['uid']}
+        self.assertEqual(self.client.post(url, other, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_admin_username_of_another_tenant_is_rejected(self):
+        """Test que no se reasigna un usuario de otro tenant"""
+        other = Tenant.objects.create(name="Otro", business_name="Otro SAC")
+        User.objects.create_user(username="admin-0", password="pass123", tenant=other, role="admin")
+        with self.assertRaises(ProvisioningError):
+            provision_tenants(self.specs(2))
+        self.assertFalse(Tenant.objects.filter(slug__startswith='estudio-').exists())
+    
+    def test_provision_endpoint(self):
+        """Test del endpoint de alta por lotes"""
+        super_admin = User.objects.create_user(username="root", password="pass123", role="super_admin")
+        self.client.force_authenticate(super_admin)
+        url = reverse('core:configuration:tenants_provision')
+        response = self.client.post(url, {'tenants': self.specs(3)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 3)
+        
+        response = self.client.post(url, {'tenants': self.specs(3)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['existing'], 3)
+        
+        specs = self.specs(1)
+        specs[0]['admin']['email'] = 'no-es-email'
+        response = self.client.post(url, {'tenants': specs}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        # Las contraseñas se hashean en la petición: las altas masivas van con invitación
+        response = self.client.post(url, {'tenants': self.specs(MAX_PASSWORDS + 1)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Tenant.objects.filter(slug=f'estudio-{MAX_PASSWORDS}').exists())
+
+
+class LargeTableAdminTest(TestCase):
+    """Tests para el modo de tablas grandes del admin"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Admin", business_name="Admin SAC")
+        self.root = User.objects.create_superuser(username="root", password="pass123", email="root@test.com",
+                                                  role="super_admin")
+        self.users = [
+            User.objects.create_user(username=f"user{i}", password="pass123", tenant=self.tenant)
+            for i in range(5)
+        ]
+        UserActivity.objects.bulk_create([
+            UserActivity(user=self.users[i % 5], tenant=self.tenant, action='login', description=f'Actividad {i}')
+            for i in range(60)
+        ])
+        old = UserActivity.objects.create(user=self.users[0], tenant=self.tenant, action='login', description='Antigua')
+        UserActivity.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=90))
+        self.client.force_login(self.root)
+    
+    def test_activity_changelist_is_bounded_and_without_n_plus_one(self):
+        """Test que el listado no hace N+1, no lista tenants y se acota por fecha"""
+        url = reverse('admin:core_useractivity_changelist')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(ctx.captured_queries), 10)
+        self.assertFalse(any('FROM "core_tenant"' in query['sql'] for query in ctx.captured_queries))
+        self.assertEqual(response.context['cl'].result_count, 60)
+        self.assertContains(response, 'data-ajax--url')
+        
+        response = self.client.get(url, {'created_at__gte': '2000-01-01'})
+        self.assertEqual(response.context['cl'].result_count, 61)
+        
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'core', 'model_name': 'useractivity', 'field_name': 'tenant', 'term': 'Adm'
+        })
+        self.assertEqual(response.json()['results'], [{'id': str(self.tenant.pk), 'text': 'Admin'}])
+    
+    def test_all_core_changelists_render(self):
+        """Test que todos los listados del admin del core funcionan con los mixins"""
+        for model in (Tenant, User, UserActivity, TenantConfiguration, RolePermission,
+                      ScheduledJob, ActivityDailyRollup, ExportJob):
+            response = self.client.get(reverse(f'admin:core_{model._meta.model_name}_changelist'))
+            self.assertEqual(response.status_code, 200, model.__name__)
+    
+    def test_estimated_count_paginator_caps_count(self):
+        """Test que el paginador no cuenta más allá del límite"""
+        paginator = EstimatedCountPaginator(UserActivity.objects.all(), 10)
+        paginator.count_limit = 20
+        self.assertEqual(paginator.count, 20)
+        self.assertEqual(paginator.num_pages, 2)
+        self.assertEqual(EstimatedCountPaginator(UserActivity.objects.filter(description='Antigua'), 10).count, 1)
+
+
+class UserSoftDeleteTest(APITestCase):
+    """Tests para el borrado lógico de usuarios y su purga por lotes"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Borrado", business_name="Borrado SAC")
+        self.admin = User.objects.create_user(username="admin_borrado", password="pass123", tenant=self.tenant, role="admin")
+        self.user = User.objects.create_user(username="empleado", password="pass123", tenant=self.tenant)
+        UserProfile.objects.create(user=self.user)
+        UserActivity.objects.bulk_create([
+            UserActivity(user=self.user, tenant=self.tenant, action='login', description='Inicio')
+            for _ in range(25)
+        ])
+    
+    def test_delete_endpoint_soft_deletes(self):
+        """Test que el endpoint marca el usuario como eliminado sin borrar sus datos"""
+        self.client.force_authenticate(self.admin)
+        response = self.client.delete(reverse('core:configuration:user_delete', kwargs={'user_id': self.user.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        deleted = User.all_objects.get(pk=self.user.pk)
+        self.assertTrue(deleted.is_deleted)
+        self.assertFalse(deleted.is_active)
+        self.assertEqual(UserActivity.objects.filter(user_id=self.user.pk).count(), 25)
+        # El username queda libre
+        User.objects.create_user(username="empleado", password="pass123", tenant=self.tenant)
+    
+    def test_purge_after_retention_in_batches(self):
+        """Test que la purga respeta la retención y borra por lotes"""
+        self.user.soft_delete()
+        self.assertEqual(purge_deleted_users(batch_size=10, max_batches=5)['users'], 0)
+        
+        User.all_objects.filter(pk=self.user.pk).update(deleted_at=timezone.now() - timedelta(days=31))
+        result = purge_deleted_users(batch_size=10, max_batches=2)
+        self.assertTrue(result['pending'])
+        self.assertEqual(UserActivity.objects.filter(user_id=self.user.pk).count(), 15)
+        
+        result = purge_deleted_users(batch_size=10, max_batches=5)
+        self.assertEqual(result['users'], 1)
+        self.assertFalse(User.all_objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(UserProfile.objects.filter(user_id=self.user.pk).exists())
+        self.assertTrue(User.objects.filter(pk=self.admin.pk).exists())
+        # El feed ya informó el borrado lógico: la purga no deja lápidas
+        self.assertFalse(Tombstone.objects.exists())
+
+
+class TenantOffboardingTest(APITestCase):
+    """Tests para la baja de tenants por lotes con punto de control"""
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        
+        self.tenant = Tenant.objects.create(name="Baja", business_name="Baja SAC")
+        self.other = Tenant.objects.create(name="Sigue", business_name="Sigue SAC")
+        self.users = [
+            User.objects.create_user(username=f"baja{i}", password="pass123", tenant=self.tenant)
+            for i in range(3)
+        ]
+        self.kept = User.objects.create_user(username="sigue", password="pass123", tenant=self.other)
+        UserProfile.objects.create(user=self.users[0])
+        UserActivity.objects.bulk_create([
+            UserActivity(user=user, tenant=self.tenant, action='login', description='Inicio')
+            for user in self.users for _ in range(4)
+        ] + [UserActivity(user=self.kept, tenant=self.other, action='login', description='Inicio')])
+        TenantConfiguration.objects.create(tenant=self.tenant, module='general', key='timezone', value='America/Lima')
+        self.superadmin = User.objects.create_user(username="root", password="pass123", role="super_admin")
+    
+    def test_offboarding_resumes_from_checkpoint(self):
+        """Test que la baja avanza por lotes, guarda su progreso y archiva los datos"""
+        with mock.patch.object(run_scheduled_job, 'delay'):
+            job = start_offboarding(self.tenant, archive=True)
+        self.tenant.refresh_from_db()
+        self.assertFalse(self.tenant.is_active)
+        self.assertFalse(User.objects.filter(tenant=self.tenant, is_active=True).exists())
+        self.assertEqual(start_offboarding(self.tenant).pk, job.pk)
+        
+        # El archivo también avanza por lotes con su punto de control
+        self.assertEqual(run_offboarding(job, batch_size=5, max_batches=2), 2)
+        job = TenantOffboarding.objects.get(pk=job.pk)
+        self.assertEqual(job.status, 'archiving')
+        self.assertEqual(len(job.archive_parts), 2)
+        self.assertEqual(job.deleted_rows, 0)
+        
+        while job.status == 'archiving':
+            run_offboarding(job, batch_size=5, max_batches=2)
+            job = TenantOffboarding.objects.get(pk=job.pk)
+        self.assertTrue(job.archive_file)
+        self.assertEqual(job.archive_parts, [])
+        
+        while job.status != 'completed':
+            run_offboarding(job, batch_size=5, max_batches=2)
+            job = TenantOffboarding.objects.get(pk=job.pk)
+        self.assertEqual(job.deleted_rows, job.total_rows)
+        self.assertEqual(job.progress, 100)
+        self.assertFalse(Tenant.objects.filter(pk=self.tenant.pk).exists())
+        self.assertFalse(User.all_objects.filter(tenant_id=self.tenant.pk).exists())
+        self.assertFalse(UserActivity.objects.filter(tenant_id=self.tenant.pk).exists())
+        self.assertEqual(UserActivity.objects.filter(tenant=self.other).count(), 1)
+        self.assertTrue(User.objects.filter(pk=self.kept.pk).exists())
+        self.assertFalse(Tombstone.objects.exists())
+        
+        with ZipFile(job.archive_file.open()) as archive:
+            manifest = json.loads(archive.read('manifest.json'))
+            self.assertEqual(manifest['tables']['core.useractivity'], 12)
+            users = [json.loads(line) for line in archive.read('core.user.jsonl').splitlines()]
+        self.assertEqual(len(users), 3)
+        self.assertFalse(any('password' in user for user in users))
+        # Los bloques se borran al unirlos en el ZIP
+        parts = os.path.join(self.media_root, 'offboarding', 'parts', f'tenant-{self.tenant.pk}')
+        self.assertEqual(os.listdir(parts) if os.path.isdir(parts) else [], [])
+    
+    def test_failed_offboarding_leaves_the_queue_until_resumed(self):
+        """Test que una baja que falla queda en 'failed' y no se reintenta hasta reanudarla"""
+        with mock.patch.object(run_scheduled_job, 'delay'):
+            job = start_offboarding(self.tenant)
+        with mock.patch('apps.core.configuration.offboarding.run_offboarding', side_effect=RuntimeError('disco')) as run:
+            with self.assertRaises(RuntimeError):
+                run_job('run_offboardings', force=True)
+            self.assertEqual(run_job('run_offboardings', force=True)['pending'], False)
+        self.assertEqual(run.call_count, 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('disco', job.error)
+        
+        resume_offboarding(job)
+        run_job('run_offboardings', force=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'completed')
+        self.assertFalse(Tenant.objects.filter(pk=self.tenant.pk).exists())
+    
+    def test_archive_extends_the_scheduler_lock(self):
+        """Test que unir el archivo renueva el lock del trabajo; fuera de una ejecución no hace nada"""
+        self.assertFalse(extend_lock())
+        renewed = []
+        with mock.patch.object(run_scheduled_job, 'delay'):
+            start_offboarding(self.tenant, archive=True)
+        with mock.patch('apps.core.scheduler.extend_lock', side_effect=lambda: renewed.append(extend_lock())):
+            run_job('run_offboardings', force=True)
+        self.assertTrue(renewed)
+        self.assertTrue(all(renewed))
+    
+    def test_offboard_endpoint(self):
+        """Test que solo el super admin inicia la baja y puede consultar su progreso"""
+        url = reverse('core:configuration:tenant_offboard', kwargs={'tenant_id': self.tenant.id})
+        self.client.force_authenticate(self.users[0])
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_403_FORBIDDEN)
+        
+        self.client.force_authenticate(self.superadmin)
+        response = self.client.post(url, {'archive': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        # En los tests la tarea se ejecuta en el momento
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertFalse(Tenant.objects.filter(pk=self.tenant.pk).exists())
+        
+        response = self.client.get(reverse('core:configuration:offboarding_view', kwargs={'job_id': response.data['id']}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['tenant_name'], 'Baja')
+
+
+class DataMigrationTest(TestCase):
+    """Tests para las migraciones de datos por lotes"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Backfill", business_name="Backfill SAC")
+        self.user = User.objects.create_user(username="backfill", password="pass123", tenant=self.tenant)
+        UserActivity.objects.bulk_create([
+            UserActivity(user=self.user, tenant=self.tenant, action=action, description='Antigua')
+            for action in ['login', 'export', 'update', 'logout'] * 5
+        ])
+    
+    def test_runs_in_batches_and_resumes(self):
+        """Test que la migración avanza por rangos de pk y se reanuda desde su punto de control"""
+        run = run_migration('activity_module', batch_size=4, sleep=0, max_batches=2)
+        self.assertEqual(run.status, 'paused')
+        self.assertEqual(run.batches, 2)
+        self.assertEqual(run.rows_updated, 6)
+        self.assertEqual(UserActivity.objects.filter(module_ref__isnull=False).count(), 6)
+        
+        run = run_migration('activity_module', batch_size=4, sleep=0)
+        self.assertEqual(run.status, 'completed')
+        self.assertEqual(run.batches, 5)
+        self.assertEqual(run.progress, 100)
+        self.assertEqual(UserActivity.objects.filter(module_ref__value='auth').count(), 10)
+        self.assertEqual(UserActivity.objects.filter(module_ref__value='exports').count(), 5)
+        self.assertEqual(UserActivity.objects.filter(module_ref__isnull=True).count(), 5)
+        # Completada: no se vuelve a ejecutar
+        self.assertIsNone(run_migration('activity_module'))
+    
+    def test_lock_and_dry_run(self):
+        """Test que el dry-run no cambia datos y que el lock impide ejecuciones simultáneas"""
+        result = estimate('activity_module', batch_size=4, sleep=1)
+        self.assertEqual(result['rows'], 20)
+        self.assertEqual(result['batches'], 5)
+        self.assertEqual(result['sample_changed'], 9)
+        self.assertGreaterEqual(result['estimated_seconds'], 4)
+        self.assertFalse(UserActivity.objects.filter(module_ref__isnull=False).exists())
+        
+        self.assertTrue(acquire_migration_lock('activity_module', 'otro-proceso'))
+        self.assertIsNone(run_migration('activity_module', batch_size=4, sleep=0))
+        self.assertEqual(DataMigrationRun.objects.get(name='activity_module').status, 'running')
+
+
+class ActivityDimensionsTest(APITestCase):
+    """Tests para la actividad en forma compacta (plantillas y tablas de dimensión)"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Compacta", business_name="Compacta SAC")
+        self.admin = User.objects.create_user(username="admin_compacta", password="pass123", tenant=self.tenant, role="admin")
+        self.employee = User.objects.create_user(username="juan", password="pass123", tenant=self.tenant)
+        self.client.force_authenticate(self.admin)
+    
+    def test_new_activity_is_stored_compact(self):
+        """Test que la actividad nueva guarda plantilla y parámetros y se lee ya renderizada"""
+        for _ in range(2):
+            self.client.put(reverse('core:configuration:user_edit', kwargs={'user_id': self.employee.id}),
+                            {'phone': '999888777'}, format='json')
+        
+        activities = UserActivity.objects.filter(user=self.admin)
+        self.assertEqual(activities.count(), 2)
+        self.assertEqual(set(activities.values_list('description', 'module')), {('', '')})
+        self.assertEqual(ActivityTemplate.objects.filter(value='Actualizó el usuario {username}').count(), 1)
+        self.assertEqual(activities.first().params, {'username': 'juan'})
+        
+        response = self.client.get(reverse('core:profile:activity'))
+        self.assertEqual(response.data[0]['description'], 'Actualizó el usuario juan')
+        self.assertEqual(response.data[0]['module'], 'users')
+        
+        response = self.client.get(reverse('core:exports:activity_csv'))
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        self.assertIn('users,Actualizó el usuario juan', content)
+    
+    def test_backfill_moves_legacy_rows(self):
+        """Test que activity_dimensions pasa las filas antiguas a la forma compacta sin cambiar su lectura"""
+        agent = 'Mozilla/5.0 (X11; Linux x86_64) Firefox/120.0'
+        UserActivity.objects.bulk_create([
+            UserActivity(user=self.admin, tenant=self.tenant, action='delete', module='users',
+                         description=f'Eliminó el usuario u{i}', user_agent=agent)
+            for i in range(5)
+        ] + [UserActivity(user=self.admin, tenant=self.tenant, action='update', module='profile',
+                          description='Texto libre {sin} plantilla')])
+        before = sorted((a.rendered_description, a.module_name, a.user_agent_text) for a in UserActivity.objects.all())
+        
+        run = run_migration('activity_dimensions', batch_size=4, sleep=0)
+        self.assertEqual(run.rows_updated, 6)
+        self.assertFalse(UserActivity.objects.exclude(description='', module='', user_agent='').exists())
+        self.assertEqual(UserAgent.objects.count(), 1)
+        self.assertEqual(ActivityTemplate.objects.count(), 2)
+        after = sorted((a.rendered_description, a.module_name, a.user_agent_text) for a in UserActivity.objects.all())
+        self.assertEqual(after, before)
+        
+        rollup_day(timezone.localdate())
+        self.assertEqual(
+            ActivityDailyRollup.objects.get(tenant=self.tenant, action='delete', module='users').count, 5
+        )
+    
+    def test_parse_description(self):
+        """Test que las descripciones antiguas se separan en plantilla y parámetros"""
+        self.assertEqual(parse_description('Activado el usuario ana'),
+                         ('{verb} el usuario {username}', {'verb': 'Activado', 'username': 'ana'}))
+        self.assertEqual(parse_description('Cambió su email de a@x.pe a b@x.pe'),
+                         ('Cambió su email de {old_email} a {email}', {'old_email': 'a@x.pe', 'email': 'b@x.pe'}))
+        self.assertEqual(parse_description('Cerró sesión en el sistema'), ('Cerró sesión en el sistema', None))
+
+
+@override_settings(CORE_SYNC={'PAGE_SIZE': 500, 'MAX_PAGE_SIZE': 2000, 'OVERLAP': 0})
+class SyncChangesTest(APITestCase):
+    """Tests para la sincronización incremental con lápidas"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Sync", business_name="Sync SAC")
+        self.other = Tenant.objects.create(name="Otro", business_name="Otro SAC")
+        self.admin = User.objects.create_user(username="admin_sync", password="pass123", tenant=self.tenant, role="admin")
+        self.users = [
+            User.objects.create_user(username=f"sync{i}", password="pass123", tenant=self.tenant)
+            for i in range(4)
+        ]
+        User.objects.create_user(username="ajeno", password="pass123", tenant=self.other)
+        self.config = TenantConfiguration.objects.create(
+            tenant=self.tenant, module='general', key='timezone', value='America/Lima'
+        )
+        self.client.force_authenticate(self.admin)
+    
+    def sync(self, resource, **params):
+        return self.client.get(reverse('core:configuration:sync_changes', kwargs={'resource': resource}), params)
+    
+    def test_incremental_changes_and_deletes(self):
+        """Test que tras la carga completa solo llegan los cambios y los borrados"""
+        response = self.sync('users')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['full'])
+        self.assertEqual({row['username'] for row in response.data['changed']}, {f"sync{i}" for i in range(4)})
+        users_cursor = response.data['cursor']
+        config_cursor = self.sync('configuration').data['cursor']
+        
+        self.users[0].first_name = "Renombrado"
+        self.users[0].save()
+        self.users[1].soft_delete()
+        self.config.delete()
+        
+        response = self.sync('users', since=users_cursor)
+        self.assertFalse(response.data['full'])
+        self.assertEqual([row['first_name'] for row in response.data['changed']], ["Renombrado"])
+        self.assertEqual(response.data['deleted'], [{'id': self.users[1].pk}])
+        self.assertEqual(self.sync('users', since=response.data['cursor']).data['changed'], [])
+        
+        response = self.sync('configuration', since=config_cursor)
+        self.assertEqual(response.data['changed'], [])
+        self.assertEqual(response.data['deleted'], [{'module': 'general', 'key': 'timezone'}])
+    
+    def test_pages_rows_with_same_timestamp(self):
+        """Test que las páginas no pierden ni repiten filas con el mismo updated_at"""
+        cursor = self.sync('users').data['cursor']
+        User.all_objects.filter(tenant=self.tenant).update(updated_at=timezone.now())
+        
+        seen = []
+        while True:
+            response = self.sync('users', since=cursor, limit=3)
+            seen += [row['id'] for row in response.data['changed']]
+            cursor = response.data['cursor']
+            if not response.data['has_more']:
+                break
+        self.assertEqual(sorted(seen), sorted(user.pk for user in self.users))
+    
+    def test_invalid_expired_and_forbidden(self):
+        """Test de cursor inválido o expirado, recurso desconocido y rol sin permisos"""
+        self.assertEqual(self.sync('users', since='abc').status_code, status.HTTP_400_BAD_REQUEST)
+        old = encode_cursor(timezone.now() - timedelta(days=31), 0)
+        self.assertEqual(self.sync('users', since=old).status_code, status.HTTP_410_GONE)
+        self.assertEqual(self.sync('tenants').status_code, status.HTTP_404_NOT_FOUND)
+        
+        self.client.force_authenticate(self.users[0])
+        self.assertEqual(self.sync('permissions').status_code, status.HTTP_403_FORBIDDEN)
+        
+        self.config.delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=31))
+        self.assertEqual(purge_tombstones(batch_size=10, max_batches=1)['deleted'], 1)
+
+
+class BatchRequestsTest(APITestCase):
+    """Tests para el endpoint de peticiones en lote"""
+    
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Lote", business_name="Lote SAC")
+        self.user = User.objects.create_user(
+            username="lote", password="pass123", tenant=self.tenant, role="admin", first_name="Lia"
+        )
+        UserProfile.objects.create(user=self.user)
+        UserActivity.objects.create(user=self.user, tenant=self.tenant, action='login', description='Inició sesión')
+        # Actividad nueva (plantilla + parámetros), la que resuelven las tablas de dimensión
+        log_activity(self.user, 'update', 'Actualizó el usuario {username}', 'users', username='maria')
+        token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    
+    def batch(self, requests):
+        return self.client.post(reverse('core:batch'), {'requests': requests}, format='json')
+    
+    def test_profile_screen_in_one_request(self):
+        """Test que el lote devuelve lo mismo que cada endpoint por separado"""
+        paths = ['profile/view/', 'profile/statistics/', 'profile/completion/', 'profile/activity/']
+        _interned_values.clear()
+        response = self.batch([{'id': path, 'path': path} for path in paths])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        results = response.json()['responses']
+        self.assertEqual([result['id'] for result in results], paths)
+        for result in results:
+            self.assertEqual(result['status'], status.HTTP_200_OK)
+            self.assertEqual(result['body'], self.client.get(f'/api/core/{result["path"]}').json())
+    
+    def test_authenticates_once(self):
+        """Test que el token se valida una sola vez para todo el lote"""
+        original = TenantJWTAuthentication.get_validated_token
+        with mock.patch.object(
+            TenantJWTAuthentication, 'get_validated_token', autospec=True, side_effect=original
+        ) as validate:
+            response = self.batch(['profile/view/', 'profile/statistics/', 'config/business/view/'])
+        self.assertTrue(all(result['status'] == 200 for result in response.json()['responses']))
+        self.assertEqual(validate.call_count, 1)
+        
+        self.client.credentials()
+        self.assertEqual(self.batch(['profile/view/']).status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_get_not_allowed(self):
+        """Test que el lote solo admite POST"""
+        self.assertEqual(self.client.get(reverse('core:batch')).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+    
+    def test_per_item_errors(self):
+        """Test que cada petición tiene su propio status y los lotes inválidos se rechazan"""
+        response = self.batch([
+            'profile/completion/', 'no/existe/', 'async/events/', 'batch/',
+            {'path': 'config/permissions/admin/view/', 'params': {'fields': 'role'}},
+        ])
+        statuses = [result['status'] for result in response.json()['responses']]
+        self.assertEqual(statuses, [200, 404, 400, 400, 404])
+        
+        self.assertEqual(self.batch([]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.batch([{'path': 'profile/edit/', 'method': 'PUT'}]).status_code, 400)
+        self.assertEqual(self.batch(['profile/view/'] * 21).status_code, status.HTTP_400_BAD_REQUEST)
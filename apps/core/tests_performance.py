@@ -0,0 +1,384 @@
+"""
+Tests de rendimiento del Core App - Arte Ideas
+Presupuesto de queries y de tiempo por endpoint
+
+Cada endpoint declarado en ENDPOINTS se ejecuta con dos volúmenes de datos.
+El número de queries debe ser el mismo en ambos (sin N+1) y no superar la
+línea base guardada en performance_baselines.json.
+
+El presupuesto en milisegundos depende de la máquina, así que solo se
+comprueba a pedido (en un entorno de medición estable):
+    PERF_CHECK_LATENCY=1 python manage.py test apps.core.tests_performance
+
+Para regenerar la línea base después de un cambio intencional:
+    PERF_UPDATE_BASELINES=1 python manage.py test apps.core.tests_performance
+"""
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .configuration.provisioning import make_invite
+from .configuration.snapshot import build_snapshot
+from .models import Tenant, UserProfile, UserActivity, RolePermission, TenantConfiguration, ExportJob, TenantOffboarding
+
+User = get_user_model()
+
+BASELINES_PATH = Path(__file__).resolve().parent / 'performance_baselines.json'
+UPDATE_BASELINES = os.environ.get('PERF_UPDATE_BASELINES') == '1'
+CHECK_LATENCY = os.environ.get('PERF_CHECK_LATENCY') == '1'
+
+# Volúmenes de datos: (tenants, usuarios por tenant, actividades por usuario)
+SMALL_VOLUME = (2, 3, 5)
+LARGE_VOLUME = (12, 40, 25)
+
+# Repeticiones por endpoint (se toma la mediana del tiempo)
+REPEATS = 3
+
+# Holgura aplicada al regenerar presupuestos de tiempo
+BUDGET_FACTOR = 5
+MIN_BUDGET_MS = 100
+
+PASSWORD = 'Perf-pass-123'
+
+# Endpoints cubiertos: nombre -> (método, actor, kwargs de URL, payload)
+# Los kwargs y payloads pueden ser callables que reciben el test
+ENDPOINTS = {
+    'core:api-root': ('get', 'admin', {}, None),
+    'core:health_check': ('get', 'anon', {}, None),
+    # Pantalla Mi Perfil en una sola petición
+    'core:batch': ('post', 'admin', {}, {'requests': [
+        'profile/view/', 'profile/statistics/', 'profile/completion/', 'profile/activity/',
+    ]}),
+    'core:authentication:login': (
+        'post', 'anon', {}, lambda t: {'username': t.admin.username, 'password': PASSWORD}
+    ),
+    'core:authentication:refresh': (
+        'post', 'anon', {}, lambda t: {'refresh': str(RefreshToken.for_user(t.admin))}
+    ),
+    'core:authentication:logout': (
+        'post', 'admin', {}, lambda t: {'refresh_token': str(RefreshToken.for_user(t.admin))}
+    ),
+    'core:authentication:set_password': ('post', 'anon', {}, lambda t: {
+        **make_invite(t.staff), 'new_password': 'Perf-pass-789', 'confirm_password': 'Perf-pass-789',
+    }),
+    'core:profile:profile_view': ('get', 'admin', {}, None),
+    'core:profile:profile_edit': ('put', 'admin', {}, {'bio': 'Fotógrafo de estudio'}),
+    'core:profile:statistics': ('get', 'admin', {}, None),
+    'core:profile:activity': ('get', 'admin', {}, None),
+    'core:profile:completion': ('get', 'admin', {}, None),
+    'core:profile:change_password': ('post', 'admin', {}, {
+        'current_password': PASSWORD,
+        'new_password': 'Perf-pass-456',
+        'confirm_password': 'Perf-pass-456',
+    }),
+    'core:profile:change_email': ('post', 'admin', {}, {
+        'new_email': 'nuevo-admin@perf.test', 'password': PASSWORD
+    }),
+    'core:configuration:business_view': ('get', 'admin', {}, None),
+    'core:configuration:business_edit': ('put', 'admin', {}, {'business_name': 'Estudio Editado'}),
+    'core:configuration:users_list': ('get', 'admin', {}, None),
+    'core:configuration:users_create': ('post', 'admin', {}, lambda t: {
+        'username': 'perf_nuevo',
+        'email': 'perf_nuevo@perf.test',
+        'first_name': 'Perf',
+        'last_name': 'Nuevo',
+        'role': t.staff_role,
+        'password': PASSWORD,
+        'confirm_password': PASSWORD,
+    }),
+    'core:configuration:user_view': ('get', 'admin', lambda t: {'user_id': t.staff.id}, None),
+    'core:configuration:user_edit': ('put', 'admin', lambda t: {'user_id': t.staff.id}, {'phone': '999888777'}),
+    'core:configuration:user_toggle': ('patch', 'admin', lambda t: {'user_id': t.staff.id}, None),
+    'core:configuration:user_delete': ('delete', 'admin', lambda t: {'user_id': t.staff.id}, None),
+    'core:configuration:roles_list': ('get', 'admin', {}, None),
+    'core:configuration:permissions_view': ('get', 'admin', {'role': 'admin'}, None),
+    'core:configuration:permissions_edit': ('put', 'admin', {'role': 'admin'}, {'access_gastos': False}),
+    'core:configuration:permissions_reset': ('post', 'admin', {'role': 'admin'}, None),
+    'core:configuration:tenants_list': ('get', 'super_admin', {}, None),
+    'core:configuration:tenants_create': ('post', 'super_admin', {}, {
+        'name': 'Estudio Perf',
+        'business_name': 'Estudio Perf SAC',
+        'business_address': 'Av. Perf 123',
+        'business_phone': '987000111',
+        'business_email': 'perf@estudio.test',
+        'business_ruc': '20999999999',
+    }),
+    'core:configuration:tenants_provision': ('post', 'super_admin', {}, {'tenants': [
+        {
+            'slug': f'estudio-lote-{i}', 'name': f'Estudio Lote {i}', 'business_name': f'Estudio Lote {i} SAC',
+            'admin': {'username': f'admin-lote-{i}', 'email': f'admin{i}@lote.test', 'password': 'Clave-Lote-123'},
+        }
+        for i in range(5)
+    ]}),
+    'core:configuration:tenant_users': (
+        'get', 'super_admin', lambda t: {'tenant_id': t.tenant.id}, None
+    ),
+    # Tenant propio: la baja se ejecuta en el momento y no depende del volumen
+    'core:configuration:tenant_offboard': (
+        'post', 'super_admin', lambda t: {'tenant_id': t.closing_tenant.id}, {'archive': False}
+    ),
+    'core:configuration:offboarding_view': (
+        'get', 'super_admin', lambda t: {'job_id': t.offboarding.id}, None
+    ),
+    'core:configuration:snapshot_export': ('get', 'admin', {}, None),
+    'core:configuration:sync_changes': ('get', 'admin', {'resource': 'users'}, None),
+    'core:configuration:snapshot_import': ('post', 'admin', {}, lambda t: build_snapshot(t.tenant)),
+    'core:exports:users_csv': ('get', 'admin', {}, None),
+    'core:exports:activity_csv': ('get', 'admin', {}, None),
+    'core:exports:configuration_csv': ('get', 'admin', {}, None),
+    'core:exports:permissions_csv': ('get', 'admin', {}, None),
+    'core:exports:configuration_pdf': ('get', 'admin', {}, None),
+    'core:exports:jobs_list': ('get', 'admin', {}, None),
+    'core:exports:jobs_create': ('post', 'admin', {}, {'export_type': 'permissions'}),
+    'core:exports:jobs_metrics': ('get', 'super_admin', {}, None),
+    'core:exports:job_view': ('get', 'admin', lambda t: {'job_id': t.export_job.id}, None),
+    'core:exports:job_download': ('get', 'admin', lambda t: {'job_id': t.export_job.id}, None),
+    'core:async_api:profile_view': ('get', 'admin', {}, None),
+    'core:async_api:activity': ('get', 'admin', {}, None),
+    'core:async_api:completion': ('get', 'admin', {}, None),
+    'core:async_api:business_view': ('get', 'admin', {}, None),
+    'core:async_api:roles_list': ('get', 'admin', {}, None),
+    'core:async_api:permissions_view': ('get', 'admin', {'role': 'admin'}, None),
+    'core:async_api:events': ('get', 'admin', {}, None),
+}
+
+
+def iter_url_names(patterns, prefix):
+    """Recorrer recursivamente los patrones de URL devolviendo nombres completos"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            namespace = f'{prefix}{pattern.namespace}:' if pattern.namespace else prefix
+            yield from iter_url_names(pattern.url_patterns, namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield f'{prefix}{pattern.name}'
+
+
+def load_baselines():
+    if not BASELINES_PATH.exists():
+        return {}
+    with open(BASELINES_PATH, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def seed_volume(tenants, users_per_tenant, activities_per_user, offset=0):
+    """Sembrar tenants, usuarios, perfiles, permisos y actividad en bloque"""
+    roles = [code for code, _ in User.ROLE_CHOICES if code != 'super_admin']
+
+    new_tenants = Tenant.objects.bulk_create([
+        Tenant(
+            name=f'Estudio {offset + i}',
+            slug=f'estudio-perf-{offset + i}',
+            business_name=f'Estudio {offset + i} SAC',
+            business_address='Av. Principal 100',
+            business_phone='987654321',
+            business_email=f'estudio{offset + i}@perf.test',
+            business_ruc='20123456789',
+        )
+        for i in range(tenants)
+    ])
+    tenant_ids = list(
+        Tenant.objects.filter(slug__in=[t.slug for t in new_tenants]).values_list('id', flat=True)
+    )
+
+    RolePermission.objects.bulk_create([
+        RolePermission(tenant_id=tenant_id, role=role, **RolePermission.get_default_permissions(role))
+        for tenant_id in tenant_ids
+        for role in roles
+    ])
+    TenantConfiguration.objects.bulk_create([
+        TenantConfiguration(tenant_id=tenant_id, module='general', key='timezone', value='America/Lima')
+        for tenant_id in tenant_ids
+    ])
+
+    unusable_password = make_password(None)
+    User.objects.bulk_create([
+        User(
+            username=f'perf_{offset + i}_{j}',
+            email=f'perf_{offset + i}_{j}@perf.test',
+            password=unusable_password,
+            first_name='Usuario',
+            last_name=f'{j}',
+            tenant_id=tenant_id,
+            role=roles[j % len(roles)],
+        )
+        for i, tenant_id in enumerate(tenant_ids)
+        for j in range(users_per_tenant)
+    ])
+    users = list(User.objects.filter(tenant_id__in=tenant_ids).values_list('id', 'tenant_id'))
+
+    UserProfile.objects.bulk_create([UserProfile(user_id=user_id) for user_id, _ in users])
+    UserActivity.objects.bulk_create([
+        UserActivity(
+            user_id=user_id,
+            tenant_id=tenant_id,
+            action='update',
+            description=f'Actualizó el registro {k}',
+            module='profile',
+        )
+        for user_id, tenant_id in users
+        for k in range(activities_per_user)
+    ], batch_size=1000)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class EndpointPerformanceBudgetTest(TestCase):
+    """Presupuesto de queries y tiempo para cada endpoint del Core App"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Los archivos de exportación van a un directorio temporal
+        cls.media_root = tempfile.mkdtemp(prefix='perf-media-')
+        cls.media_settings = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media_settings.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(
+            name='Estudio Base',
+            business_name='Estudio Base SAC',
+            business_address='Av. Base 1',
+            business_phone='987654321',
+            business_email='base@perf.test',
+            business_ruc='20111111111',
+        )
+        self.staff_role = [code for code, _ in User.ROLE_CHOICES if code not in ('super_admin', 'admin')][0]
+        self.admin = User.objects.create_user(
+            username='perf_admin', email='admin@perf.test', password=PASSWORD,
+            tenant=self.tenant, role='admin'
+        )
+        self.staff = User.objects.create_user(
+            username='perf_staff', email='staff@perf.test', password=PASSWORD,
+            tenant=self.tenant, role=self.staff_role
+        )
+        self.super_admin = User.objects.create_user(
+            username='perf_super', email='super@perf.test', password=PASSWORD,
+            role='super_admin'
+        )
+        for user in (self.admin, self.staff, self.super_admin):
+            UserProfile.objects.create(user=user)
+        for code, _ in RolePermission.ROLE_CHOICES:
+            RolePermission.objects.create(
+                tenant=self.tenant, role=code, **RolePermission.get_default_permissions(code)
+            )
+        self.export_job = ExportJob.objects.create(
+            tenant=self.tenant, user=self.admin, export_type='users', status='completed'
+        )
+        self.export_job.file.save('usuarios_perf.xlsx', ContentFile(b'xlsx'))
+        self.closing_tenant = Tenant.objects.create(name='Estudio Baja', business_name='Estudio Baja SAC')
+        self.offboarding = TenantOffboarding.objects.create(
+            tenant_ref=0, tenant_name='Estudio Cerrado', status='completed'
+        )
+        self.clients = {'anon': APIClient()}
+        for actor in ('admin', 'super_admin'):
+            client = APIClient()
+            token = RefreshToken.for_user(getattr(self, actor)).access_token
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            self.clients[actor] = client
+
+    def _grow(self, tenants, users_per_tenant, activities_per_user, offset):
+        """Crecer el volumen de datos incluyendo los del tenant base"""
+        seed_volume(tenants, users_per_tenant, activities_per_user, offset=offset)
+        UserActivity.objects.bulk_create([
+            UserActivity(user=user, tenant=self.tenant, action='login', description='Inició sesión', module='auth')
+            for user in (self.admin, self.staff)
+            for _ in range(activities_per_user)
+        ])
+        User.objects.bulk_create([
+            User(username=f'perf_base_{offset}_{j}', tenant=self.tenant, role=self.staff_role)
+            for j in range(users_per_tenant)
+        ])
+
+    def _resolve(self, value):
+        return value(self) if callable(value) else value
+
+    def _call(self, name):
+        """Ejecutar un endpoint dentro de un savepoint revertido y medirlo"""
+        method, actor, kwargs, payload = ENDPOINTS[name]
+        url = reverse(name, kwargs=self._resolve(kwargs))
+        client = self.clients[actor]
+        timings = []
+        queries = None
+        for _ in range(REPEATS):
+            with transaction.atomic():
+                data = self._resolve(payload)
+                with CaptureQueriesContext(connection) as ctx:
+                    start = time.perf_counter()
+                    response = getattr(client, method)(url, data, format='json')
+                    timings.append((time.perf_counter() - start) * 1000)
+                transaction.set_rollback(True)
+            body = b'' if response.streaming else response.content[:200]
+            self.assertLess(response.status_code, 400, f'{name}: {response.status_code} {body}')
+            queries = len(ctx.captured_queries)
+        return queries, statistics.median(timings)
+
+    def _measure_all(self):
+        return {name: self._call(name) for name in ENDPOINTS}
+
+    def test_every_core_url_has_budget(self):
+        """Todo endpoint del Core App debe declarar su presupuesto"""
+        names = set(iter_url_names(get_resolver('apps.core.urls').url_patterns, 'core:'))
+        self.assertEqual(names - set(ENDPOINTS), set(), 'Endpoints sin presupuesto de rendimiento')
+        if not UPDATE_BASELINES:
+            self.assertEqual(set(ENDPOINTS) - set(load_baselines()), set(), 'Endpoints sin línea base')
+
+    def test_query_count_is_constant_and_within_budget(self):
+        """Las queries no crecen con el volumen y se mantienen dentro del presupuesto"""
+        self._grow(*SMALL_VOLUME, offset=0)
+        small = self._measure_all()
+        self._grow(*LARGE_VOLUME, offset=1000)
+        large = self._measure_all()
+
+        baselines = load_baselines()
+        for name in ENDPOINTS:
+            small_queries, _ = small[name]
+            large_queries, elapsed_ms = large[name]
+            with self.subTest(endpoint=name):
+                self.assertEqual(
+                    small_queries, large_queries,
+                    f'{name}: las queries crecen con el volumen ({small_queries} -> {large_queries})'
+                )
+                if UPDATE_BASELINES:
+                    continue
+                baseline = baselines[name]
+                self.assertLessEqual(
+                    large_queries, baseline['max_queries'],
+                    f'{name}: {large_queries} queries, presupuesto {baseline["max_queries"]}'
+                )
+                if CHECK_LATENCY:
+                    self.assertLessEqual(
+                        elapsed_ms, baseline['max_ms'],
+                        f'{name}: {elapsed_ms:.1f} ms, presupuesto {baseline["max_ms"]} ms'
+                    )
+
+        if UPDATE_BASELINES:
+            new_baselines = {
+                name: {
+                    'method': ENDPOINTS[name][0].upper(),
+                    'max_queries': large[name][0],
+                    'max_ms': max(MIN_BUDGET_MS, int(large[name][1] * BUDGET_FACTOR)),
+                }
+                for name in sorted(ENDPOINTS)
+            }
+            with open(BASELINES_PATH, 'w', encoding='utf-8') as fh:
+                json.dump(new_baselines, fh, indent=2, ensure_ascii=False)
+                fh.write('\n')
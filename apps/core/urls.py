@@ -4,7 +4,7 @@ Estructura modular organizada por subcarpetas
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CoreHealthCheckView
+from .views import BatchView, CoreHealthCheckView
 
 app_name = 'core'
 
@@ -18,6 +18,9 @@ urlpatterns = [
     # Health Check
     path('health/', CoreHealthCheckView.as_view(), name='health_check'),
     
+    # Varias peticiones GET en una sola ida y vuelta
+    path('batch/', BatchView.as_view(), name='batch'),
+    
     # Módulo Autenticación
     path('auth/', include('apps.core.authentication.urls')),
     
@@ -26,4 +29,10 @@ urlpatterns = [
     
     # Módulo Configuración
     path('config/', include('apps.core.configuration.urls')),
+    
+    # Exportaciones CSV en streaming
+    path('exports/', include('apps.core.exports.urls')),
+    
+    # Variantes async (ASGI) de los endpoints de lectura
+    path('async/', include('apps.core.async_api.urls')),
 ]
\ No newline at end of file
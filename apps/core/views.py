@@ -4,7 +4,11 @@ Solo contiene vistas compartidas entre módulos
 """
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import permissions
+from rest_framework import permissions, status
+
+from .async_api.views import AsyncAPIView, json_response
+from .batch import BatchError, execute_batch, parse_batch
+from .renderers import loads
 
 
 class CoreHealthCheckView(APIView):
@@ -20,4 +24,29 @@ class CoreHealthCheckView(APIView):
                 'profile': 'Mi Perfil - Gestión personal del usuario',
                 'configuration': 'Configuración - Gestión de usuarios, negocio y permisos'
             }
-        })
\ No newline at end of file
+        })
+
+
+class BatchView(AsyncAPIView):
+    """Varias peticiones GET del Core en una sola ida y vuelta (ver apps/core/batch.py)"""
+    http_method_names = ['post', 'options']
+    batchable = False
+    
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Como las vistas de DRF: se autentica con JWT, no con la cookie de sesión
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+    
+    async def post(self, request):
+        """Ejecutar el lote y devolver una respuesta por petición"""
+        try:
+            data = loads(request.body or b'null')
+        except ValueError:
+            return json_response({'error': 'JSON inválido'}, status.HTTP_400_BAD_REQUEST)
+        try:
+            items = parse_batch(data)
+        except BatchError as exc:
+            return json_response({'error': exc.args[0]}, status.HTTP_400_BAD_REQUEST)
+        return json_response({'responses': await execute_batch(request, items)})
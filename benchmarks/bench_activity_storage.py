@@ -0,0 +1,127 @@
+"""
+Benchmark del tamaño de UserActivity - Arte Ideas
+
+Llena la tabla con actividad en el formato antiguo (descripción ya
+formateada, módulo y user agent como texto en cada fila), mide los bytes
+por fila, la pasa a la forma compacta con la migración de datos
+activity_dimensions y vuelve a medir, contando también lo que ocupan las
+tablas de dimensión repartido entre las filas.
+
+En PostgreSQL se mide el tamaño real de la fila (pg_column_size); en SQLite
+la suma de la longitud de cada columna (aproximado, sin cabeceras).
+
+    python benchmarks/bench_activity_storage.py
+    python benchmarks/bench_activity_storage.py --rows 200000 --batch-size 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from faker import Faker  # noqa: E402
+
+from apps.core.backfills import LEGACY_TEMPLATES  # noqa: E402
+from apps.core.data_migrations import run_migration  # noqa: E402
+from apps.core.factories import TenantFactory, UserFactory  # noqa: E402
+from apps.core.models import ActivityModule, ActivityTemplate, UserActivity, UserAgent  # noqa: E402
+
+MODULES = ['auth', 'profile', 'security', 'users', 'permissions', 'configuration', 'exports', 'tenants']
+FIXED_DESCRIPTIONS = ['Cerró sesión en el sistema', 'Actualizó su perfil personal', 'Cambió su contraseña']
+PARAMS = {
+    'old_email': lambda rng: f'usuario{rng.randrange(5000)}@estudio.pe',
+    'email': lambda rng: f'usuario{rng.randrange(5000)}@estudio.pe',
+    'name': lambda rng: rng.choice(['usuarios', 'actividad', 'permisos']),
+    'export_type': lambda rng: rng.choice(['users', 'activity', 'permissions']),
+    'username': lambda rng: f'usuario{rng.randrange(5000)}',
+    'verb': lambda rng: rng.choice(['Activado', 'Desactivado']),
+    'role': lambda rng: rng.choice(['admin', 'manager', 'employee']),
+    'created': lambda rng: rng.randrange(1, 50),
+    'tenant': lambda rng: f'Estudio {rng.randrange(500)}',
+}
+
+
+def legacy_rows(user, rows, seed):
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+    agents = [fake.user_agent() for _ in range(30)]
+    for _ in range(rows):
+        template = rng.choice(LEGACY_TEMPLATES + FIXED_DESCRIPTIONS)
+        params = {name: generate(rng) for name, generate in PARAMS.items() if f'{{{name}}}' in template}
+        yield UserActivity(
+            user=user, tenant_id=user.tenant_id, action='update',
+            description=template.format(**params), module=rng.choice(MODULES),
+            ip_address=f'10.0.{rng.randrange(256)}.{rng.randrange(256)}', user_agent=rng.choice(agents),
+        )
+
+
+def table_bytes(model):
+    """(filas, bytes totales) de la tabla del modelo"""
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'SELECT count(*), coalesce(sum(pg_column_size(t.*)), 0) FROM {table} t')
+        else:
+            columns = ' + '.join(
+                f'coalesce(length(CAST({connection.ops.quote_name(field.column)} AS BLOB)), 0)'
+                for field in model._meta.concrete_fields
+            )
+            cursor.execute(f'SELECT count(*), coalesce(sum({columns}), 0) FROM {table}')
+        return cursor.fetchone()
+
+
+def report(label):
+    rows, activity_bytes = table_bytes(UserActivity)
+    dimension_bytes = sum(table_bytes(model)[1] for model in (ActivityModule, ActivityTemplate, UserAgent))
+    print(
+        f'{label:<10} {rows:>10,} {activity_bytes / rows:>12.1f} '
+        f'{(activity_bytes + dimension_bytes) / rows:>14.1f} {(activity_bytes + dimension_bytes) / 2**20:>9.1f}'
+    )
+    return activity_bytes + dimension_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--batch-size', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        tenant = TenantFactory()
+        user = UserFactory(tenant=tenant)
+        rows = legacy_rows(user, args.rows, args.seed)
+        while True:
+            chunk = [row for _, row in zip(range(args.batch_size), rows)]
+            if not chunk:
+                break
+            UserActivity.objects.bulk_create(chunk)
+
+        print(f"{'formato':<10} {'filas':>10} {'bytes/fila':>12} {'con dimensiones':>14} {'MB':>9}")
+        before = report('antiguo')
+        start = time.perf_counter()
+        run_migration('activity_dimensions', batch_size=args.batch_size, sleep=0)
+        elapsed = time.perf_counter() - start
+        after = report('compacto')
+        print(f'\nReducción: {(1 - after / before) * 100:.0f}% '
+              f'(backfill en {elapsed:.1f} s, {args.rows / elapsed:,.0f} filas/s)')
+        print(f'Dimensiones: {ActivityTemplate.objects.count()} plantillas, '
+              f'{ActivityModule.objects.count()} módulos, {UserAgent.objects.count()} user agents')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
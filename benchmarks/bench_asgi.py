@@ -0,0 +1,176 @@
+"""
+Benchmark ASGI vs WSGI - Arte Ideas
+
+Mide cuántas peticiones concurrentes atiende un único worker:
+
+- WSGI: WSGIHandler sobre la vista DRF síncrona, con un pool de `--threads`
+  hilos (equivalente a gunicorn gthread con un worker).
+- ASGI: la aplicación de config.asgi en un solo event loop sobre la vista
+  async equivalente (rutas /api/core/async/...).
+
+--db-latency-ms añade una espera a cada query para simular una base de
+datos remota. Con el ORM async de Django 4.2 las queries se ejecutan en un
+único hilo (sync_to_async thread-sensitive), así que la ganancia de ASGI
+viene de no ocupar hilos durante la autenticación, la cache y la
+serialización, no de paralelizar las queries.
+
+    python benchmarks/bench_asgi.py
+    python benchmarks/bench_asgi.py --concurrency 10 50 200 --requests 400 --db-latency-ms 2
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from apps.core.loadtest import ASGITransport  # noqa: E402
+from apps.core.metrics import percentile  # noqa: E402
+from apps.core.models import RolePermission, Tenant, User, UserActivity, UserProfile  # noqa: E402
+
+ENDPOINTS = {
+    'perfil': ('/api/core/profile/view/', '/api/core/async/profile/view/'),
+    'actividad': ('/api/core/profile/activity/', '/api/core/async/profile/activity/'),
+    'negocio': ('/api/core/config/business/view/', '/api/core/async/config/business/view/'),
+    'permisos': ('/api/core/config/permissions/admin/view/', '/api/core/async/config/permissions/admin/view/'),
+}
+
+
+def seed():
+    tenant = Tenant.objects.create(name='Benchmark', business_name='Benchmark SAC')
+    user = User.objects.create_user(username='bench_admin', password='bench', tenant=tenant, role='admin')
+    UserProfile.objects.create(user=user)
+    RolePermission.objects.create(tenant=tenant, role='admin', **RolePermission.get_default_permissions('admin'))
+    UserActivity.objects.bulk_create(
+        UserActivity(user=user, tenant=tenant, action='login', description='Inició sesión', module='auth')
+        for _ in range(50)
+    )
+    return str(RefreshToken.for_user(user).access_token)
+
+
+def install_db_latency(milliseconds):
+    """Añadir una espera a cada query en todas las conexiones (también las nuevas)"""
+    if not milliseconds:
+        return
+
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(milliseconds / 1000)
+        return execute(sql, params, many, context)
+
+    def on_connection(sender, connection, **kwargs):
+        connection.execute_wrappers.append(wrapper)
+
+    connection_created.connect(on_connection, weak=False)
+    connection.ensure_connection()
+    connection.execute_wrappers.append(wrapper)
+
+
+def split(total, clients):
+    """Repartir `total` peticiones entre clientes que las envían una tras otra"""
+    return [total // clients + (1 if i < total % clients else 0) for i in range(clients)]
+
+
+def run_wsgi(path, token, concurrency, total, threads):
+    handler = WSGIHandler()
+    # Un worker gthread atiende como mucho `threads` peticiones a la vez
+    slots = threading.Semaphore(threads)
+
+    def call():
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+            'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost', 'HTTP_AUTHORIZATION': f'Bearer {token}',
+            'wsgi.input': io.BytesIO(b''), 'wsgi.url_scheme': 'http', 'wsgi.errors': sys.stderr,
+        }
+        statuses = []
+        start = time.perf_counter()
+        with slots:
+            b''.join(handler(environ, lambda status, headers: statuses.append(status)))
+        return statuses[0].startswith('200'), (time.perf_counter() - start) * 1000
+
+    def client(count):
+        return [call() for _ in range(count)]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        batches = list(pool.map(client, split(total, concurrency)))
+        wall = time.perf_counter() - start
+    return [result for batch in batches for result in batch], wall
+
+
+def run_asgi(path, token, concurrency, total):
+    transport = ASGITransport()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    async def call():
+        start = time.perf_counter()
+        status, _ = await transport.request('GET', path, None, headers)
+        return status == 200, (time.perf_counter() - start) * 1000
+
+    async def client(count):
+        return [await call() for _ in range(count)]
+
+    async def main():
+        start = time.perf_counter()
+        batches = await asyncio.gather(*(client(count) for count in split(total, concurrency)))
+        return [result for batch in batches for result in batch], time.perf_counter() - start
+
+    return asyncio.run(main())
+
+
+def summarize(results, wall):
+    latencies = [elapsed for _, elapsed in results]
+    errors = sum(1 for ok, _ in results if not ok)
+    return len(results) / wall, percentile(latencies, 95), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--requests', type=int, default=200, help='Peticiones por medición')
+    parser.add_argument('--threads', type=int, default=4, help='Hilos del worker WSGI')
+    parser.add_argument('--db-latency-ms', type=float, default=0.0)
+    parser.add_argument('--endpoints', nargs='+', choices=sorted(ENDPOINTS), default=sorted(ENDPOINTS))
+    args = parser.parse_args()
+
+    settings.DEBUG = False
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        token = seed()
+        install_db_latency(args.db_latency_ms)
+        print(f"{'endpoint':<10} {'conc':>5} {'wsgi req/s':>11} {'wsgi p95':>9} "
+              f"{'asgi req/s':>11} {'asgi p95':>9} {'errores':>8}")
+        for name in args.endpoints:
+            sync_path, async_path = ENDPOINTS[name]
+            for concurrency in args.concurrency:
+                wsgi_rps, wsgi_p95, wsgi_errors = summarize(
+                    *run_wsgi(sync_path, token, concurrency, args.requests, args.threads)
+                )
+                asgi_rps, asgi_p95, asgi_errors = summarize(
+                    *run_asgi(async_path, token, concurrency, args.requests)
+                )
+                print(f'{name:<10} {concurrency:>5} {wsgi_rps:>11.1f} {wsgi_p95:>9.1f} '
+                      f'{asgi_rps:>11.1f} {asgi_p95:>9.1f} {wsgi_errors + asgi_errors:>8}')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
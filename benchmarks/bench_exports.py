@@ -0,0 +1,104 @@
+"""
+Benchmark de exportación CSV - Arte Ideas
+
+Mide el pico de memoria y las filas por segundo de la exportación de
+actividad en streaming (apps.core.exports) frente a construir el CSV
+completo en memoria, para volúmenes crecientes. El pico del streaming
+debe mantenerse plano al crecer el número de filas.
+
+    python benchmarks/bench_exports.py
+    python benchmarks/bench_exports.py --sizes 10000 100000 1000000
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from apps.core.exports.streaming import ActivityExport  # noqa: E402
+from apps.core.models import Tenant, User, UserActivity  # noqa: E402
+
+BATCH = 10000
+
+
+def seed(tenant, user, rows):
+    """Completar la actividad del tenant hasta `rows` filas"""
+    missing = rows - UserActivity.objects.filter(tenant=tenant).count()
+    while missing > 0:
+        size = min(BATCH, missing)
+        UserActivity.objects.bulk_create(
+            UserActivity(user=user, tenant=tenant, action='login', module='auth',
+                         description='Inició sesión en el sistema', ip_address='10.0.0.1')
+            for _ in range(size)
+        )
+        missing -= size
+
+
+def export_streaming(tenant, admin):
+    total = 0
+    for chunk in ActivityExport(admin, tenant).response().streaming_content:
+        total += len(chunk)
+    return total
+
+
+def export_in_memory(tenant, admin):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    activities = list(UserActivity.objects.filter(tenant=tenant).select_related('user'))
+    for activity in activities:
+        writer.writerow([activity.id, activity.user.username, activity.get_action_display(), activity.module,
+                         activity.description, activity.ip_address, activity.created_at.isoformat()])
+    return len(buffer.getvalue().encode('utf-8'))
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--skip-memory-baseline', action='store_true',
+                        help='No ejecutar la variante que carga todo en memoria')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        tenant = Tenant.objects.create(name='Benchmark', slug='benchmark', business_name='Benchmark')
+        admin = User.objects.create(username='bench_admin', password=make_password(None),
+                                    tenant=tenant, role='admin')
+        print(f"{'filas':>10} {'variante':<10} {'MB csv':>8} {'pico MB':>9} {'filas/s':>12}")
+        for rows in sorted(args.sizes):
+            seed(tenant, admin, rows)
+            variants = [('streaming', export_streaming)]
+            if not args.skip_memory_baseline:
+                variants.append(('memoria', export_in_memory))
+            for name, func in variants:
+                size, elapsed, peak = measure(func, tenant, admin)
+                print(f'{rows:>10,} {name:<10} {size / 2**20:>8.1f} {peak / 2**20:>9.1f} {rows / elapsed:>12,.0f}')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark del servicio de documentos PDF - Arte Ideas
+
+Compara el render de N documentos en línea, en el pool de procesos y
+cuando ya están en cache (re-descarga de un documento sin cambios). Usa el
+motor configurado ('weasyprint' si está instalado, si no 'html').
+
+    python benchmarks/bench_pdf.py
+    python benchmarks/bench_pdf.py --documents 40 --rows 500 --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import caches  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from apps.core.exports import pdf  # noqa: E402
+from apps.core.fast_serializers import MODULE_FIELDS, SENSITIVE_ACTION_FIELDS  # noqa: E402
+
+TEMPLATE = 'pdf/configuration_report.html'
+
+
+def make_context(index, rows):
+    """Contexto con la forma del reporte de configuración"""
+    fields = MODULE_FIELDS + SENSITIVE_ACTION_FIELDS
+    return {
+        'tenant': {
+            'name': f'Estudio {index}', 'business_name': f'Estudio {index} SAC', 'business_ruc': '20123456789',
+            'business_address': 'Av. Principal 123', 'business_email': 'estudio@example.com',
+            'business_phone': '987654321', 'currency_display': 'Soles', 'location_display': 'Local',
+            'max_users': 10,
+        },
+        'updated_at': '2024-01-01T12:00:00-05:00',
+        'columns': [{'field': field, 'label': field} for field in fields],
+        'permissions': [
+            {'role_display': f'Rol {i}', **{field: bool((i + j) % 2) for j, field in enumerate(fields)}}
+            for i in range(rows)
+        ],
+        'configuration': [],
+    }
+
+
+def run(label, requests, workers, repeat=1):
+    with override_settings(EXPORT_SETTINGS={'PDF': {'WORKERS': workers}}):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            documents = pdf.render_documents(requests)
+        elapsed = (time.perf_counter() - start) / repeat
+    cached = sum(document.cached for document in documents)
+    print(f'{label:<22} {elapsed * 1000:>10.1f} ms {len(requests) / elapsed:>10.1f} docs/s  ({cached} de cache)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--documents', type=int, default=20)
+    parser.add_argument('--rows', type=int, default=200, help='Filas de la tabla de cada documento')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    cache = caches[pdf.get_pdf_settings()['CACHE_ALIAS']]
+    print(f"motor: {pdf.get_pdf_settings()['ENGINE']}, documentos: {args.documents}, filas: {args.rows}")
+    requests = [(TEMPLATE, make_context(i, args.rows)) for i in range(args.documents)]
+
+    cache.clear()
+    run('en línea (frío)', requests, workers=0)
+    cache.clear()
+    # Arrancar el pool fuera de la medición
+    with override_settings(EXPORT_SETTINGS={'PDF': {'WORKERS': args.workers}}):
+        pdf.get_pool(args.workers).submit(int).result()
+    run(f'pool x{args.workers} (frío)', requests, workers=args.workers)
+    cache.clear()
+    run(f'pool x{args.workers} (compilado)', requests, workers=args.workers)
+    run('cache (sin cambios)', requests, workers=args.workers, repeat=5)
+    pdf.shutdown_pool()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark del alta de tenants por lotes - Arte Ideas
+
+Compara provision_tenants (un bulk_create por tabla) con el alta uno a uno:
+Tenant.save, get_or_create por rol y configuración, y create_user.
+
+Por defecto los administradores van sin contraseña (invitación), que es como
+se hacen las altas masivas. Con --passwords cada uno lleva contraseña y el
+tiempo pasa a depender del hasher (PBKDF2, ~0.2 s por administrador).
+
+    python benchmarks/bench_provisioning.py
+    python benchmarks/bench_provisioning.py --sizes 100 500 --skip-one-by-one
+    python benchmarks/bench_provisioning.py --sizes 10 20 --passwords
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment  # noqa: E402
+
+from apps.core.configuration.provisioning import (  # noqa: E402
+    DEFAULT_CONFIGS, DEFAULT_ROLES, provision_tenants
+)
+from apps.core.models import RolePermission, Tenant, TenantConfiguration, User, UserProfile  # noqa: E402
+
+PASSWORD = 'Clave-Segura-123'
+
+
+def specs(prefix, count, password=None):
+    return [
+        {
+            'slug': f'{prefix}-{i}', 'name': f'Estudio {i}', 'business_name': f'Estudio {i} SAC',
+            'admin': {
+                'username': f'{prefix}-admin-{i}', 'email': f'admin{i}@estudio.test',
+                **({'password': password} if password else {}),
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def one_by_one(items):
+    with transaction.atomic():
+        for spec in items:
+            tenant = Tenant.objects.create(slug=spec['slug'], name=spec['name'], business_name=spec['business_name'])
+            for role in DEFAULT_ROLES:
+                RolePermission.objects.get_or_create(
+                    tenant=tenant, role=role, defaults=RolePermission.get_default_permissions(role)
+                )
+            for module, key, value, data_type, description in DEFAULT_CONFIGS:
+                TenantConfiguration.objects.get_or_create(
+                    tenant=tenant, module=module, key=key,
+                    defaults={'value': value, 'data_type': data_type, 'description': description}
+                )
+            admin = User.objects.create_user(
+                username=spec['admin']['username'], email=spec['admin']['email'],
+                password=spec['admin'].get('password'), tenant=tenant, role='admin'
+            )
+            UserProfile.objects.get_or_create(user=admin)
+
+
+def measure(func, items):
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        func(items)
+        elapsed = time.perf_counter() - start
+    return elapsed, len(ctx.captured_queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--skip-one-by-one', action='store_true', help='No ejecutar el alta uno a uno')
+    parser.add_argument('--passwords', action='store_true', help='Administradores con contraseña (sin invitación)')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f"{'tenants':>8} {'variante':<10} {'segundos':>9} {'queries':>8} {'tenants/s':>10}")
+        for index, size in enumerate(sorted(args.sizes)):
+            variants = [('lote', provision_tenants)]
+            if not args.skip_one_by_one:
+                variants.append(('uno-a-uno', one_by_one))
+            for name, func in variants:
+                elapsed, queries = measure(func, specs(f'{name}{index}', size, PASSWORD if args.passwords else None))
+                print(f'{size:>8,} {name:<10} {elapsed:>9.2f} {queries:>8,} {size / elapsed:>10,.0f}')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
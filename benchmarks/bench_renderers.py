@@ -0,0 +1,106 @@
+"""
+Benchmark de renderers JSON - Arte Ideas
+
+Compara JSONRenderer de DRF, ORJSONRenderer y el modo streaming
+(iter_json_array) en tiempo de render y pico de memoria para listas de
+usuarios sintéticas de distintos tamaños.
+
+    python benchmarks/bench_renderers.py
+    python benchmarks/bench_renderers.py --sizes 1000 10000 100000 --repeat 5
+"""
+import argparse
+import datetime
+import decimal
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.core.renderers import ORJSONRenderer, iter_json_array  # noqa: E402
+
+
+def make_rows(size):
+    """Filas con la forma de UserManagementSerializer más tipos no triviales"""
+    now = datetime.datetime(2024, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)
+    return [
+        {
+            'id': i,
+            'username': f'usuario_{i}',
+            'email': f'usuario_{i}@example.com',
+            'first_name': 'Nombre',
+            'last_name': 'Apellido',
+            'role': 'employee',
+            'role_display': 'Empleado',
+            'is_active_employee': True,
+            'date_joined': now - datetime.timedelta(minutes=i),
+            'last_login': now,
+            'token': uuid.UUID(int=i),
+            'balance': decimal.Decimal('1234.50'),
+        }
+        for i in range(size)
+    ]
+
+
+def render_drf(rows):
+    return JSONRenderer().render(rows)
+
+
+def render_orjson(rows):
+    return ORJSONRenderer().render(rows)
+
+
+def render_stream(rows):
+    # Consumir el generador sin unir los bloques, como haría el servidor
+    total = 0
+    for chunk in iter_json_array(iter(rows), 500):
+        total += len(chunk)
+    return total
+
+
+STRATEGIES = [
+    ('drf-json', render_drf),
+    ('orjson', render_orjson),
+    ('orjson-stream', render_stream),
+]
+
+
+def measure(func, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    func(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'filas':>8} {'renderer':<15} {'mediana ms':>11} {'pico KiB':>10}")
+    for size in args.sizes:
+        rows = make_rows(size)
+        for name, func in STRATEGIES:
+            elapsed, peak = measure(func, rows, args.repeat)
+            print(f'{size:>8} {name:<15} {elapsed:>11.2f} {peak:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark de serializers de lectura - Arte Ideas
+
+Compara filas por segundo de los ModelSerializer de referencia frente a
+los serializers rápidos (apps.core.fast_serializers) sobre una base de
+datos de test temporal.
+
+    python benchmarks/bench_serializers.py
+    python benchmarks/bench_serializers.py --rows 20000 --repeat 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from apps.core.configuration.serializers import RolePermissionSerializer, UserManagementSerializer  # noqa: E402
+from apps.core.fast_serializers import (  # noqa: E402
+    FastRolePermissionSerializer, FastUserActivitySerializer, FastUserManagementSerializer
+)
+from apps.core.models import RolePermission, Tenant, User, UserActivity  # noqa: E402
+from apps.core.profile.serializers import UserActivitySerializer  # noqa: E402
+
+
+def seed(rows):
+    tenant = Tenant.objects.create(name='Benchmark', slug='benchmark', business_name='Benchmark')
+    password = make_password(None)
+    User.objects.bulk_create(
+        User(username=f'bench_{i}', password=password, tenant=tenant, role='employee',
+             is_active=bool(i % 3))
+        for i in range(rows)
+    )
+    user = User.objects.filter(tenant=tenant).first()
+    UserActivity.objects.bulk_create(
+        UserActivity(user=user, tenant=tenant, action='login', description='Inició sesión', module='auth')
+        for _ in range(rows)
+    )
+    roles = [code for code, _ in User.ROLE_CHOICES]
+    for role in roles:
+        RolePermission.objects.create(tenant=tenant, role=role, **RolePermission.get_default_permissions(role))
+    return tenant
+
+
+def rows_per_second(serializer_class, source_factory, repeat):
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(serializer_class(source_factory(), many=True).data)
+        timings.append(time.perf_counter() - start)
+    return count / statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        tenant = seed(args.rows)
+        permissions = list(RolePermission.objects.filter(tenant=tenant)) * max(1, args.rows // 10)
+        cases = [
+            ('usuarios', UserManagementSerializer, FastUserManagementSerializer,
+             lambda: User.objects.filter(tenant=tenant)),
+            ('actividad', UserActivitySerializer, FastUserActivitySerializer,
+             lambda: UserActivity.objects.filter(tenant=tenant)),
+            ('permisos', RolePermissionSerializer, FastRolePermissionSerializer,
+             lambda: permissions),
+        ]
+        print(f"{'endpoint':<12} {'referencia filas/s':>20} {'rápido filas/s':>16} {'factor':>8}")
+        for name, reference, fast, source in cases:
+            before = rows_per_second(reference, source, args.repeat)
+            after = rows_per_second(fast, source, args.repeat)
+            print(f'{name:<12} {before:>20,.0f} {after:>16,.0f} {after / before:>7.1f}x')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+# Celery es opcional: sin él las tareas usan el backend local de apps/core/background.py
+try:
+    from .celery import app as celery_app
+except ImportError:  # pragma: no cover
+    celery_app = None
+
+__all__ = ('celery_app',)
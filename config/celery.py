@@ -0,0 +1,31 @@
+"""
+Celery config for arte_ideas_backend project.
+Solo se usa cuando CELERY_BROKER_URL está definido (ver apps/core/background.py)
+
+    celery -A config worker -Q default,activity -c 4
+    celery -A config worker -Q exports -c 1
+    celery -A config beat
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('arte_ideas')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
+
+
+@app.on_after_finalize.connect
+def register_core_tasks(sender, **kwargs):
+    """
+    Registrar en Celery las tareas declaradas con apps.core.background.task
+    y programar en beat los trabajos periódicos de apps/core/jobs.py
+    """
+    import apps.core.jobs  # noqa: F401
+    from apps.core.background import register_celery_tasks
+    from apps.core.scheduler import beat_schedule
+
+    register_celery_tasks()
+    sender.conf.beat_schedule = {**beat_schedule(), **(sender.conf.beat_schedule or {})}
@@ -5,6 +5,7 @@ Sistema multi-tenant para estudios fotográficos
 
 from pathlib import Path
 import os
+import sys
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -16,6 +17,9 @@ SECRET_KEY = 'django-insecure-change-this-in-production'
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# Ejecución de la suite de tests (manage.py test)
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
 ALLOWED_HOSTS = ['localhost', '127.0.0.1', '.localhost']
 
 DJANGO_APPS = [
@@ -43,6 +47,11 @@ LOCAL_APPS = [
     'apps.analytics',
 ]
 
+# Tareas en segundo plano: Celery si CELERY_BROKER_URL está definido
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
+if CELERY_BROKER_URL:
+    THIRD_PARTY_APPS += ['django_celery_results']
+
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
@@ -106,7 +115,7 @@ AUTH_USER_MODEL = 'core.User'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.core.authentication.backends.TenantJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -114,10 +123,48 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.core.renderers.ORJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
 }
 
+# Tamaño de bloque para las respuestas JSON en streaming (?stream=true)
+STREAMING_JSON_CHUNK_SIZE = 500
+
+# Exportaciones (apps/core/exports)
+EXPORT_SETTINGS = {
+    'CSV': {
+        'ENCODING': 'utf-8',
+        'DELIMITER': ',',
+        'CHUNK_SIZE': 2000,   # Filas leídas y escritas por bloque
+        'MAX_ROWS': None,     # Sin límite: la memoria no depende del tamaño
+    },
+    'EXCEL': {
+        'CHUNK_SIZE': 2000,   # Filas entre actualizaciones de progreso
+        'MAX_ROWS': None,     # constant_memory: pasadas las 1.048.576 filas se abre otra hoja
+    },
+    'PDF': {
+        'ENGINE': None,       # None: 'weasyprint' si está instalado, si no 'html' (imprimible)
+        'WORKERS': 0 if TESTING else None,   # Procesos de render; None: 2 con weasyprint, 0 con html
+        'CACHE_TIMEOUT': 60 * 60 * 24,    # Documentos renderizados en cache
+    },
+    'BULKHEAD': {
+        'GLOBAL_SLOTS': 4,    # Exportaciones simultáneas en todo el sistema
+        'TIERS': {            # Por Tenant.location_type: slots del tenant y peso en el reparto
+            'lima': {'slots': 2, 'weight': 2},
+            'provincia': {'slots': 1, 'weight': 1},
+        },
+        'STALE_AFTER': 3600,  # Segundos tras los que un trabajo en ejecución se da por perdido
+    },
+    'STORAGE': {
+        'RETENTION_DAYS': 7,  # Días que el archivo queda disponible para descargar
+    },
+}
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=8),
@@ -159,5 +206,93 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cache - Redis si REDIS_URL está definido, si no archivos (CACHE_DIR) o memoria local
+REDIS_URL = os.environ.get('REDIS_URL')
+CACHE_DIR = os.environ.get('CACHE_DIR')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'arte_ideas',
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+        }
+    }
+elif CACHE_DIR:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_DIR,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'arte-ideas',
+        }
+    }
+
+# Cache de dos niveles del Core (apps/core/cache.py)
+CORE_CACHE = {
+    'ALIAS': 'default',
+    'LOCAL_MAX_ENTRIES': 1000,   # Entradas del LRU en proceso
+    'LOCAL_TTL': 30,             # Segundos máximos en el nivel local
+    'GENERATION_TTL': 2,         # Segundos que se memoriza la generación de un namespace
+    'DEFAULT_TIMEOUT': 300,      # Segundos en la cache compartida
+    'LOCK_TIMEOUT': 10,          # Segundos del lock de recomputación
+    'XFETCH_BETA': 1.0,          # Agresividad de la expiración anticipada
+}
+
+# Eventos en tiempo real (apps/core/events.py); con REDIS_URL se usa pub/sub de Redis
+CORE_EVENTS = {
+    'QUEUE_SIZE': 100,       # Eventos pendientes por conexión
+    'MAX_DROPPED': 50,       # Descartes seguidos antes de cerrar una conexión lenta
+    'HEARTBEAT': 15,         # Segundos entre keep-alive
+    'IDLE_TIMEOUT': 300,     # Segundos sin eventos antes de cerrar la conexión
+}
+
+# Tareas en segundo plano (apps/core/background.py)
+CORE_TASKS = {
+    'BACKEND': 'eager' if TESTING else None,   # None: 'celery' con broker, si no 'local'
+    'QUEUES': {                                 # Concurrencia por cola del backend local
+        'default': 4,
+        'activity': 2,
+        'exports': 1,
+    },
+    'RESULT_TTL': 3600,
+}
+CELERY_RESULT_BACKEND = 'django-db'
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_RESULT_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+CELERY_TIMEZONE = TIME_ZONE
+
+# Trabajos periódicos (apps/core/scheduler.py): celery beat o manage.py run_scheduler
+CORE_SCHEDULER = {
+    'LOCK_TTL': 600,                 # Segundos antes de considerar abandonado un lock
+    'BATCH_SIZE': 1000,              # Filas por lote
+    'MAX_BATCHES': 50,               # Lotes por ejecución
+    'TICK': 30,                      # Segundos entre revisiones de run_scheduler
+    'ACTIVITY_RETENTION_DAYS': 365,  # None para conservar toda la actividad
+}
+
+# Sincronización incremental (apps/core/configuration/sync.py)
+CORE_SYNC = {
+    'PAGE_SIZE': 500,        # Filas por página si no se indica ?limit=
+    'MAX_PAGE_SIZE': 2000,   # Máximo de ?limit=
+    'OVERLAP': 5,            # Segundos que retrocede el cursor de la última página
+}
+
+# Migraciones de datos por lotes (apps/core/data_migrations.py): manage.py run_data_migration
+CORE_DATA_MIGRATIONS = {
+    'BATCH_SIZE': 1000,     # Filas por lote
+    'SLEEP': 0.1,           # Segundos de pausa entre lotes
+    'LOCK_TTL': 600,        # Segundos sin avanzar antes de considerar abandonado el lock
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file